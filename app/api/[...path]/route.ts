@@ -4,7 +4,7 @@ const PY_BASE = process.env.NEXT_PUBLIC_PYTHON_SERVER_URL ?? "http://localhost:8
 
 const passHeaders = (req: NextRequest) => {
 	const headers = new Headers();
-	headers.set("Accept", "application/json");
+	headers.set("Accept", req.headers.get("accept") ?? "application/json");
 	const ct = req.headers.get("content-type");
 	if (ct) headers.set("Content-Type", ct);
 	return headers;
@@ -12,11 +12,25 @@ const passHeaders = (req: NextRequest) => {
 
 async function forward(req: NextRequest, method: string, path: string[]) {
 	const url = `${PY_BASE}/${path.join("/")}${req.nextUrl.search ?? ""}`;
-	const init: RequestInit = { method, headers: passHeaders(req) };
+	// 클라이언트 연결이 끊기면 백엔드 요청(특히 SSE 스트림)도 함께 종료
+	const init: RequestInit = { method, headers: passHeaders(req), signal: req.signal };
 	if (method !== "GET" && method !== "HEAD") init.body = await req.text();
 
 	try {
 		const res = await fetch(url, init);
+
+		// SSE(/stream)는 버퍼링 없이 그대로 전달
+		if (res.headers.get("Content-Type")?.startsWith("text/event-stream")) {
+			return new Response(res.body, {
+				status: res.status,
+				headers: {
+					"Content-Type": "text/event-stream",
+					"Cache-Control": "no-cache, no-transform",
+					Connection: "keep-alive",
+				},
+			});
+		}
+
 		const text = await res.text();
 
 		const nres = new NextResponse(text, { status: res.status });
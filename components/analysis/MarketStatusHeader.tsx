@@ -45,14 +45,24 @@ export default function MarketStatusHeader() {
 		}
 	};
 
-	// 컴포넌트 마운트 시 및 5분마다 데이터 갱신
+	// 컴포넌트 마운트 시 한 번 조회한 뒤, 서버 스트림(SSE)으로 변경분만 수신
+	// (EventSource를 쓸 수 없으면 5분마다 갱신)
 	useEffect(() => {
 		fetchMarketData();
 
-		// 5분마다 갱신
-		const interval = setInterval(fetchMarketData, 5 * 60 * 1000);
+		if (typeof EventSource === "undefined") {
+			const interval = setInterval(fetchMarketData, 5 * 60 * 1000);
+			return () => clearInterval(interval);
+		}
+
+		const source = new EventSource("/api/stream");
+		source.addEventListener("market", (event) => {
+			const data: MarketStatusResponse = JSON.parse((event as MessageEvent).data);
+			setMarketData(data.market_data);
+			setLastUpdated(data.last_updated);
+		});
 
-		return () => clearInterval(interval);
+		return () => source.close();
 	}, []);
 
 	const formatPrice = (price: number) => {
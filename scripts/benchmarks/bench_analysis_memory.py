@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Memory/CPU benchmark: per-analysis copies vs. frozen shared bundle arrays.
+
+The legacy path copied five bundle arrays with `np.copy` on every cache miss
+and stored `.tolist()` versions in the cache; the current path keeps
+read-only references to the bundle and converts to JSON only when a
+response is built. Both are replayed here on a synthetic bundle of the same
+shape as `irt_assets/*/evaluation_results.json`.
+
+    python benchmarks/bench_analysis_memory.py --steps 1004 --tickers 30 --analyses 100
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+
+def make_bundle(steps: int, tickers: int) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.01, steps)
+    weights = rng.dirichlet(np.ones(tickers), size=steps)
+    bundle = {
+        "portfolio_values": 1e6 * np.cumprod(1.0 + returns),
+        "portfolio_returns": np.cumprod(1.0 + returns) - 1.0,
+        "exec_returns": returns,
+        "weights_history": weights,
+        "cash_series": rng.uniform(0.0, 0.1, steps),
+        "spy": np.cumsum(rng.normal(0.0, 0.01, steps)),
+        "qqq": np.cumsum(rng.normal(0.0, 0.01, steps)),
+    }
+    for array in bundle.values():
+        array.setflags(write=False)
+    return bundle
+
+
+def legacy_analysis(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    copies = {
+        key: np.copy(bundle[key])
+        for key in ("portfolio_values", "portfolio_returns", "weights_history", "cash_series", "exec_returns")
+    }
+    return {
+        "portfolio_returns": copies["portfolio_returns"].tolist(),
+        "portfolio_values": copies["portfolio_values"].tolist(),
+        "cash_series": copies["cash_series"].tolist(),
+        "exec_returns": copies["exec_returns"].tolist(),
+        "benchmarks": {"spy": bundle["spy"].tolist(), "qqq": bundle["qqq"].tolist()},
+    }
+
+
+def shared_analysis(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "portfolio_returns": bundle["portfolio_returns"],
+        "portfolio_values": bundle["portfolio_values"],
+        "cash_series": bundle["cash_series"],
+        "exec_returns": bundle["exec_returns"],
+        "benchmarks": {"spy": bundle["spy"], "qqq": bundle["qqq"]},
+    }
+
+
+def serve(analysis: Dict[str, Any]) -> List[float]:
+    # Response boundary: both paths end up with Python floats here.
+    values = analysis["portfolio_returns"]
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def measure(label: str, build: Callable[[Dict[str, Any]], Dict[str, Any]], bundle: Dict[str, Any], count: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    cache = [build(bundle) for _ in range(count)]
+    build_ms = (time.perf_counter() - started) * 1000
+    retained, peak = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    for analysis in cache:
+        serve(analysis)
+    serve_ms = (time.perf_counter() - started) * 1000
+    tracemalloc.stop()
+    print(
+        f"{label:<8} analyses={count:<5} build={build_ms:8.1f} ms  serve={serve_ms:7.1f} ms  "
+        f"retained={retained / 1e6:8.2f} MB  peak={peak / 1e6:8.2f} MB  "
+        f"per-analysis={retained / count / 1e3:8.1f} kB"
+    )
+    del cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=1004)
+    parser.add_argument("--tickers", type=int, default=30)
+    parser.add_argument("--analyses", type=int, default=100)
+    args = parser.parse_args()
+
+    bundle = make_bundle(args.steps, args.tickers)
+    measure("legacy", legacy_analysis, bundle, args.analyses)
+    measure("shared", shared_analysis, bundle, args.analyses)
+
+
+if __name__ == "__main__":
+    main()
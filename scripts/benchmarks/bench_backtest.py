@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Latency of the vectorised allocation backtest used by /historical-performance.
+
+Runs `finflow.backtest.backtest` on a synthetic close matrix (default 30
+assets × 1004 trading days, the size of the IRT test period) for each
+rebalancing schedule and checks the curve against a day-by-day reference
+loop that trades share counts explicitly.
+
+    python benchmarks/bench_backtest.py --steps 1004 --assets 30 --repeat 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finflow.backtest import REBALANCE_PERIODS, backtest  # noqa: E402
+
+COST_RATE = 0.0005 + 0.001  # env_meta weight_transaction_cost + weight_slippage
+BUDGET_MS = 50.0
+
+
+def reference(prices: np.ndarray, weights: np.ndarray, cash: float, period: int, cost_rate: float) -> np.ndarray:
+    value = 1.0 - cost_rate * weights.sum()
+    shares = weights * value / prices[0]
+    held_cash = cash * value
+    values = np.empty(prices.shape[0])
+    for day in range(prices.shape[0]):
+        if period and day and day % period == 0:
+            value = shares @ prices[day] + held_cash
+            drifted = shares * prices[day] / value
+            value *= 1.0 - cost_rate * np.abs(drifted - weights).sum()
+            shares = weights * value / prices[day]
+            held_cash = cash * value
+        values[day] = shares @ prices[day] + held_cash
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=1004)
+    parser.add_argument("--assets", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    prices = 100.0 * np.cumprod(1.0 + rng.normal(0.0004, 0.015, (args.steps, args.assets)), axis=0)
+    weights = rng.dirichlet(np.ones(args.assets)) * 0.9
+    cash = 0.1
+
+    worst = 0.0
+    for name, period in REBALANCE_PERIODS.items():
+        result = backtest(prices, weights, cash, period, COST_RATE)
+        error = float(np.abs(result["values"] - reference(prices, weights, cash, period, COST_RATE)).max())
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            backtest(prices, weights, cash, period, COST_RATE)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+        worst = max(worst, elapsed_ms)
+        print(
+            f"{name:<13} {elapsed_ms:7.3f} ms  final={result['returns'][-1]:+.4f}  "
+            f"turnover={result['turnover'].sum():7.3f}  max|err|={error:.2e}"
+        )
+
+    status = "OK" if worst < BUDGET_MS else "SLOW"
+    print(f"{status}: slowest schedule {worst:.3f} ms (budget {BUDGET_MS:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
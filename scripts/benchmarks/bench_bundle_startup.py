@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: `evaluation_results.json` vs. the memory-mapped binary bundle.
+
+Writes a synthetic evaluation bundle of the requested size to a temporary
+directory, converts it with `finflow.bundle.convert_bundle`, then times
+loading (and touching) every array through both paths, reporting wall time
+and peak traced memory.
+
+    python benchmarks/bench_bundle_startup.py --steps 1004 --tickers 30
+    python benchmarks/bench_bundle_startup.py --steps 5000 --tickers 100
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finflow.bundle import ARRAY_FIELDS, convert_bundle, load_bundle, read_json_bundle  # noqa: E402
+
+
+def write_synthetic_json(path: Path, steps: int, tickers: int) -> None:
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0005, 0.01, steps)
+    weights = rng.dirichlet(np.ones(tickers), size=steps)
+    payload = {
+        "results": {
+            "metrics": {"sharpe_ratio": 0.9, "max_drawdown": -0.18},
+            "series": {
+                "portfolio_values": (1e6 * np.cumprod(1.0 + returns)).tolist(),
+                "value_returns": returns.tolist(),
+                "per_step_returns": returns.tolist(),
+                "cash_ratio": rng.uniform(0.0, 0.1, steps).tolist(),
+                "dates": pd.bdate_range("2021-01-04", periods=steps).strftime("%Y-%m-%d").tolist(),
+            },
+            "irt": {
+                "symbols": [f"T{pos:03d}" for pos in range(tickers)],
+                "actual_weights": weights.tolist(),
+                "crisis_levels": rng.uniform(0.0, 1.0, steps).tolist(),
+            },
+            "test_period": {"start": "2021-01-01", "end": "2024-12-31"},
+        }
+    }
+    with path.open("w", encoding="utf-8") as fp:
+        json.dump(payload, fp)
+
+
+def measure(label: str, load: Callable[[], Dict[str, Any]], repeats: int) -> None:
+    timings = []
+    peak = 0
+    for _ in range(repeats):
+        tracemalloc.start()
+        started = time.perf_counter()
+        raw = load()
+        # Touch every array as the server does when it derives cumulative returns.
+        checksum = sum(float(np.asarray(raw[name], dtype=np.float64).sum()) for name in ARRAY_FIELDS if name != "dates")
+        timings.append((time.perf_counter() - started) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del raw
+    print(
+        f"{label:<6} best={min(timings):8.1f} ms  median={float(np.median(timings)):8.1f} ms  "
+        f"peak={peak / 1e6:8.2f} MB  (checksum {checksum:.3f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=1004)
+    parser.add_argument("--tickers", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "evaluation_results.json"
+        write_synthetic_json(json_path, args.steps, args.tickers)
+        bundle_dir = convert_bundle(json_path)
+        json_mb = json_path.stat().st_size / 1e6
+        bundle_mb = sum(item.stat().st_size for item in bundle_dir.iterdir()) / 1e6
+        print(f"steps={args.steps} tickers={args.tickers} json={json_mb:.1f} MB binary={bundle_mb:.1f} MB")
+
+        measure("json", lambda: read_json_bundle(json_path), args.repeats)
+        measure("mmap", lambda: load_bundle(bundle_dir, source=json_path), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Latency of the Monte Carlo wealth projection used by /monte-carlo.
+
+Simulates `--paths` paths of `--steps` trading days with each return model
+(i.i.d. bootstrap, block bootstrap, fitted multivariate normal) on one core
+and, with `--workers`, again across a spawn process pool, checking that the
+same seed gives identical percentile bands either way.
+
+    python benchmarks/bench_montecarlo.py --paths 10000 --steps 252 --workers 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finflow.montecarlo import BootstrapModel, GaussianModel, process_pool, simulate, summarize  # noqa: E402
+
+BUDGET_MS = 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=252)
+    parser.add_argument("--assets", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    asset_returns = rng.normal(0.0004, 0.015, (1004, args.assets)) + rng.normal(0.0, 0.008, (1004, 1))
+    weights = rng.dirichlet(np.ones(args.assets)) * 0.9
+    history = asset_returns @ weights
+    models = {
+        "bootstrap": BootstrapModel(history),
+        "block bootstrap": BootstrapModel(history, block=5),
+        "multivariate": GaussianModel.fit(asset_returns, weights),
+    }
+
+    pool = process_pool(args.workers) if args.workers > 1 else None
+    worst = 0.0
+    try:
+        for name, model in models.items():
+            simulate(model, 100, args.steps, seed=0)  # warm-up
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                growth, _ = simulate(model, args.paths, args.steps, seed=42)
+            elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+            worst = max(worst, elapsed_ms)
+            terminal = summarize(growth, 1.0)["terminal"]
+            line = (
+                f"{name:<16} {elapsed_ms:8.1f} ms  p5={terminal[0]:.3f} p50={terminal[2]:.3f} "
+                f"p95={terminal[-1]:.3f}"
+            )
+            if pool is not None:
+                simulate(model, args.paths, args.steps, seed=0, executor=pool)  # start the workers
+                started = time.perf_counter()
+                pooled, _ = simulate(model, args.paths, args.steps, seed=42, executor=pool)
+                pooled_ms = (time.perf_counter() - started) * 1000
+                same = np.array_equal(pooled, growth)
+                line += f"  pool({args.workers}) {pooled_ms:8.1f} ms {'identical' if same else 'MISMATCH'}"
+            print(line)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    status = "OK" if worst < BUDGET_MS else "SLOW"
+    print(f"{status}: slowest model {worst:.1f} ms on one core (budget {BUDGET_MS:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for live policy inference on CPU torch.
+
+Measures rows/s of a single forward pass for batch sizes 1..256, then the
+end-to-end rate of `MicroBatcher` when `--requests` concurrent callers each
+submit one observation. By default a TorchScript MLP with the IRT actor's
+input/output shape (obs_dim 304 -> 30 assets + cash) stands in for the
+policy; pass `--checkpoint irt_assets/<bundle>/irt_final.zip` to time the
+real export instead.
+
+    python benchmarks/bench_policy_batching.py
+    python benchmarks/bench_policy_batching.py --checkpoint irt_assets/20251016_192706/irt_final.zip --threads 4
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finflow.batcher import MicroBatcher  # noqa: E402
+from finflow.policy import PolicyUnavailable, TorchPolicy  # noqa: E402
+
+BATCH_SIZES = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def synthetic_checkpoint(directory: Path, obs_dim: int, action_dim: int) -> Path:
+    import torch
+
+    model = torch.nn.Sequential(
+        torch.nn.Linear(obs_dim, 256),
+        torch.nn.ReLU(),
+        torch.nn.Linear(256, 256),
+        torch.nn.ReLU(),
+        torch.nn.Linear(256, action_dim),
+        torch.nn.Softmax(dim=-1),
+    )
+    path = directory / "irt_final.zip"
+    torch.jit.save(torch.jit.script(model.eval()), str(path))
+    return path
+
+
+def bench_forward(policy: TorchPolicy, obs_dim: int, repeats: int) -> None:
+    rng = np.random.default_rng(0)
+    print("direct forward")
+    for size in BATCH_SIZES:
+        batch = rng.normal(size=(size, obs_dim)).astype(np.float32)
+        policy(batch)  # warm-up
+        started = time.perf_counter()
+        for _ in range(repeats):
+            policy(batch)
+        elapsed = time.perf_counter() - started
+        print(
+            f"  batch={size:<4} latency={elapsed / repeats * 1000:8.3f} ms  "
+            f"throughput={size * repeats / elapsed:10.0f} rows/s"
+        )
+
+
+def bench_batcher(policy: TorchPolicy, obs_dim: int, requests: int, max_wait_ms: float) -> None:
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    async def runner(fn, batch):
+        return await asyncio.wrap_future(pool.submit(fn, batch))
+
+    rows = np.random.default_rng(1).normal(size=(requests, obs_dim)).astype(np.float32)
+    print(f"micro-batched ({requests} concurrent requests, max_wait={max_wait_ms} ms)")
+    for size in BATCH_SIZES:
+        batcher = MicroBatcher(policy, max_batch=size, max_wait_ms=max_wait_ms, runner=runner)
+
+        async def run() -> float:
+            await batcher.submit(rows[0])  # warm-up, starts the worker
+            started = time.perf_counter()
+            await asyncio.gather(*(batcher.submit(row) for row in rows))
+            elapsed = time.perf_counter() - started
+            batcher.close()
+            return elapsed
+
+        elapsed = asyncio.run(run())
+        stats = batcher.stats()
+        print(
+            f"  max_batch={size:<4} total={elapsed * 1000:8.1f} ms  "
+            f"throughput={requests / elapsed:10.0f} req/s  mean_batch={stats['mean_batch']:6.1f}"
+        )
+    pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--obs-dim", type=int, default=304)
+    parser.add_argument("--action-dim", type=int, default=31)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            path = args.checkpoint or synthetic_checkpoint(Path(tmp), args.obs_dim, args.action_dim)
+            policy = TorchPolicy(path, num_threads=args.threads)
+        except (ImportError, PolicyUnavailable) as exc:
+            print(f"벤치마크를 실행할 수 없습니다: {exc}")
+            sys.exit(1)
+        print(f"policy={path} threads={policy.stats()['threads']}")
+        bench_forward(policy, args.obs_dim, args.repeats)
+        bench_batcher(policy, args.obs_dim, args.requests, args.max_wait_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Verify `finflow.indicators` against the `scripts/data/portfolio_data_*.pkl` fixtures.
+
+For every fixture (dates × tickers × [OHLCV, MACD, RSI14, MA14, MA21, MA100]):
+- MACD and the 14/21/100-day SMAs must match the fixture's own columns
+  (after the EMA warm-up / once the SMA window is full);
+- `indicator_matrices` must match an independent per-ticker pandas reference
+  for all env_meta indicators;
+- `IncrementalIndicators`, fed one day at a time, must match the batch result.
+The fixture's RSI column uses simple moving averages rather than stockstats'
+SMMA, so it is not compared. Timings for each path are printed as well.
+
+    python benchmarks/verify_indicators.py
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from finflow.indicators import TECH_INDICATORS, IncrementalIndicators, indicator_matrices  # noqa: E402
+
+MACD_WARMUP = 250
+FIXTURE_COLUMNS = {"macd": 5, "close_14_sma": 7, "close_21_sma": 8, "close_100_sma": 9}
+TOLERANCE = 1e-6
+
+
+def reference_indicators(close: pd.Series, high: pd.Series, low: pd.Series) -> Dict[str, np.ndarray]:
+    """Straightforward single-ticker stockstats formulas, kept independent of the module."""
+
+    def smma(series: pd.Series, window: int) -> pd.Series:
+        return series.ewm(alpha=1.0 / window, adjust=True).mean()
+
+    out = {}
+    out["macd"] = close.ewm(span=12, adjust=True).mean() - close.ewm(span=26, adjust=True).mean()
+    mid, std = close.rolling(20, min_periods=1).mean(), close.rolling(20, min_periods=1).std()
+    out["boll_ub"], out["boll_lb"] = mid + 2.0 * std, mid - 2.0 * std
+    delta = close.diff()
+    out["rsi_30"] = 100.0 - 100.0 / (1.0 + smma(delta.clip(lower=0.0), 30) / smma((-delta).clip(lower=0.0), 30))
+    typical = (high + low + close) / 3.0
+    center = typical.rolling(30, min_periods=1).mean()
+    mad = typical.rolling(30, min_periods=1).apply(lambda v: np.abs(v - v.mean()).mean(), raw=True)
+    mad = mad.where(mad > 1e-12 * center.abs())
+    out["cci_30"] = (typical - center) / (0.015 * mad)
+    prev = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev).abs(), (low - prev).abs()], axis=1).max(axis=1)
+    up, down = high.diff(), -low.diff()
+    plus_dm = up.where((up > down) & (up > 0), 0.0)
+    minus_dm = down.where((down > up) & (down > 0), 0.0)
+    atr = smma(true_range, 30)
+    plus_di, minus_di = 100.0 * smma(plus_dm, 30) / atr, 100.0 * smma(minus_dm, 30) / atr
+    out["dx_30"] = 100.0 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    out["close_30_sma"] = close.rolling(30, min_periods=1).mean()
+    out["close_60_sma"] = close.rolling(60, min_periods=1).mean()
+    return {
+        name: series.replace([np.inf, -np.inf], np.nan).ffill().fillna(0.0).to_numpy()
+        for name, series in out.items()
+    }
+
+
+def max_rel(a: np.ndarray, b: np.ndarray) -> float:
+    return float((np.abs(a - b) / np.maximum(np.abs(b), 1.0)).max()) if a.size else 0.0
+
+
+def verify(path: Path) -> bool:
+    values, _ = pd.read_pickle(path)
+    values = np.asarray(values, dtype=np.float64)
+    high, low, close = values[:, :, 1], values[:, :, 2], values[:, :, 3]
+    steps, n_assets = close.shape
+    print(f"{path.name}: {steps} days × {n_assets} tickers")
+    ok = True
+
+    def report(label: str, error: float, limit: float = TOLERANCE) -> None:
+        nonlocal ok
+        passed = error <= limit
+        ok &= passed
+        print(f"  {'ok  ' if passed else 'FAIL'} {label:<34} max rel err {error:.2e}")
+
+    extra = ["close_14_sma", "close_21_sma", "close_100_sma"]
+    started = time.perf_counter()
+    batch = indicator_matrices(close, high, low, list(TECH_INDICATORS) + extra)
+    batch_ms = (time.perf_counter() - started) * 1000
+
+    for name, column in FIXTURE_COLUMNS.items():
+        first = MACD_WARMUP if name == "macd" else int(name.split("_")[1]) - 1
+        error = max_rel(batch[name][first:], values[first:, :, column])
+        report(f"{name} vs fixture[{column}]", error, 1e-4 if name == "macd" else TOLERANCE)
+
+    started = time.perf_counter()
+    reference = [
+        reference_indicators(pd.Series(close[:, pos]), pd.Series(high[:, pos]), pd.Series(low[:, pos]))
+        for pos in range(n_assets)
+    ]
+    reference_ms = (time.perf_counter() - started) * 1000
+    for name in TECH_INDICATORS:
+        expected = np.column_stack([ref[name] for ref in reference])
+        report(f"{name} vs per-ticker reference", max_rel(batch[name], expected))
+
+    state = IncrementalIndicators(n_assets)
+    started = time.perf_counter()
+    rows = np.stack([state.update(close[t], high[t], low[t]) for t in range(steps)])
+    append_us = (time.perf_counter() - started) / steps * 1e6
+    for pos, name in enumerate(TECH_INDICATORS):
+        report(f"{name} incremental vs batch", max_rel(rows[:, pos, :], batch[name]))
+
+    print(
+        f"  batch {batch_ms:.1f} ms | per-ticker reference {reference_ms:.1f} ms | "
+        f"incremental append {append_us:.0f} µs/day"
+    )
+    return ok
+
+
+def main() -> None:
+    fixtures = sorted((SCRIPT_DIR / "data").glob("portfolio_data_*.pkl"))
+    if not fixtures:
+        print("portfolio_data_*.pkl 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+    results = [verify(path) for path in fixtures]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
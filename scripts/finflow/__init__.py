@@ -0,0 +1,3 @@
+"""
+Support modules for the FinFlow IRT inference server (`rl_inference_server.py`).
+"""
@@ -0,0 +1,108 @@
+"""
+Nearest-neighbour lookup from a submitted allocation to the analysis that produced it.
+
+Each indexed allocation is stored as one row of a fixed-size matrix, in the
+bundle's ticker order with cash in the last column, normalised to sum to one.
+A query is compared against every row at once by L1 distance, so weights
+that drifted through JSON round trips or client-side rounding still find
+their analysis. When the index is full the oldest row is overwritten.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+CASH_SYMBOL = "현금"
+
+
+class AllocationIndex:
+    def __init__(self, symbols: Sequence[str], tolerance: float = 1e-3, max_entries: int = 256) -> None:
+        self.symbols = list(symbols)
+        self.columns = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self.cash_column = len(self.symbols)
+        self.tolerance = float(tolerance)
+        self.max_entries = max(int(max_entries), 1)
+        self._vectors = np.zeros((self.max_entries, len(self.symbols) + 1), dtype=np.float64)
+        self._stamps = np.full(self.max_entries, -1, dtype=np.int64)
+        self._keys: List[Optional[Hashable]] = [None] * self.max_entries
+        self._rows: Dict[Hashable, int] = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def vector(self, allocation: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Normalised weight row for `allocation`, plus the weight on symbols the
+        index does not know (returned as the extra last element), or None if
+        the allocation carries no weight.
+        """
+        row = np.zeros(len(self.symbols) + 2, dtype=np.float64)
+        for item in allocation:
+            symbol = item.get("symbol")
+            if not symbol:
+                continue
+            weight = max(float(item.get("weight", 0.0)), 0.0)
+            column = self.cash_column if symbol == CASH_SYMBOL else self.columns.get(symbol, -1)
+            row[column] += weight
+        total = row.sum()
+        if total <= 0:
+            return None
+        return row / total
+
+    def add(self, allocation: List[Dict[str, Any]], key: Hashable) -> None:
+        row = self.vector(allocation)
+        if row is None:
+            return
+        with self._lock:
+            slot = self._rows.get(key)
+            if slot is None:
+                slot = int(np.argmin(self._stamps))
+                previous = self._keys[slot]
+                if previous is not None:
+                    del self._rows[previous]
+                self._keys[slot] = key
+                self._rows[key] = slot
+            self._vectors[slot] = row[:-1]
+            self._clock += 1
+            self._stamps[slot] = self._clock
+
+    def lookup(self, allocation: List[Dict[str, Any]]) -> Optional[Hashable]:
+        """Key of the closest indexed allocation within `tolerance` (L1), else None."""
+        row = self.vector(allocation)
+        with self._lock:
+            if row is None or not self._rows:
+                self.misses += 1
+                return None
+            distances = np.abs(self._vectors - row[:-1]).sum(axis=1) + row[-1]
+            distances[self._stamps < 0] = np.inf
+            slot = int(np.argmin(distances))
+            if distances[slot] > self.tolerance:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._keys[slot]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors[:] = 0.0
+            self._stamps[:] = -1
+            self._keys = [None] * self.max_entries
+            self._rows.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "max_entries": self.max_entries,
+                "tolerance": self.tolerance,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,132 @@
+"""
+Precompiled allocation table for every (risk profile, horizon) pair.
+
+The allocation served by `/predict` is a deterministic function of the
+precomputed bundle: pick `weights_history[horizon * 21]` and apply the risk
+tilt. `AnalysisTable.build` does that for all risk levels and horizons
+0..max_horizon in one broadcasted pass, and the result is cached on disk
+(`analysis_table.npz`) next to `evaluation_results.json`, tagged with a
+fingerprint of its inputs so stale tables are rebuilt.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from finflow.risk_profile import RISK_CODES, RISK_LEVELS, RiskProfileEngine
+
+TABLE_VERSION = 1
+TRADING_DAYS_PER_MONTH = 21
+
+
+def horizon_indices(horizons: np.ndarray, steps: int) -> np.ndarray:
+    """Row of `weights_history` used for each horizon (in months)."""
+    return np.minimum(np.maximum(np.asarray(horizons, dtype=np.int64) * TRADING_DAYS_PER_MONTH, 0), steps - 1)
+
+
+def table_fingerprint(
+    source: Path,
+    tickers: Sequence[str],
+    defensive: Sequence[str],
+    growth: Sequence[str],
+    max_horizon: int,
+) -> str:
+    stat = source.stat()
+    digest = hashlib.sha1()
+    digest.update(
+        json.dumps(
+            [TABLE_VERSION, stat.st_size, stat.st_mtime_ns, list(tickers), list(defensive), list(growth), max_horizon]
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+class AnalysisTable:
+    def __init__(
+        self,
+        weights: np.ndarray,
+        cash: np.ndarray,
+        metrics: Dict[str, float],
+        fingerprint: str,
+    ) -> None:
+        # weights: (risk levels, horizons, assets); cash: (risk levels, horizons)
+        self.weights = weights
+        self.cash = cash
+        self.metrics = metrics
+        self.fingerprint = fingerprint
+        self.weights.setflags(write=False)
+        self.cash.setflags(write=False)
+
+    @property
+    def max_horizon(self) -> int:
+        return int(self.weights.shape[1]) - 1
+
+    @classmethod
+    def build(
+        cls,
+        weights_history: np.ndarray,
+        cash_series: np.ndarray,
+        engine: RiskProfileEngine,
+        metrics: Dict[str, float],
+        max_horizon: int,
+        fingerprint: str,
+    ) -> "AnalysisTable":
+        steps = weights_history.shape[0]
+        horizons = np.arange(max_horizon + 1)
+        rows = horizon_indices(horizons, steps)
+        base_weights = weights_history[rows]
+        base_cash = cash_series[rows] if cash_series.size else np.zeros(rows.size)
+
+        n_risks, n_horizons = len(RISK_LEVELS), horizons.size
+        weights, cash = engine.apply(
+            np.broadcast_to(base_weights, (n_risks, n_horizons, base_weights.shape[1])).reshape(
+                n_risks * n_horizons, -1
+            ),
+            np.tile(base_cash, n_risks),
+            np.repeat(np.arange(n_risks), n_horizons),
+            np.tile(horizons, n_risks),
+        )
+        return cls(
+            weights.reshape(n_risks, n_horizons, -1),
+            cash.reshape(n_risks, n_horizons),
+            dict(metrics),
+            fingerprint,
+        )
+
+    def lookup(self, risk: str, horizon: int) -> Optional[Tuple[np.ndarray, float]]:
+        code = RISK_CODES.get(risk)
+        horizon = int(horizon)
+        if code is None or horizon < 0 or horizon > self.max_horizon:
+            return None
+        return self.weights[code, horizon], float(self.cash[code, horizon])
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with tmp_path.open("wb") as fp:
+            np.savez(
+                fp,
+                weights=self.weights,
+                cash=self.cash,
+                metrics=np.array(json.dumps(self.metrics)),
+                fingerprint=np.array(self.fingerprint),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Optional["AnalysisTable"]:
+        """Load a saved table, or return None if missing or built from other inputs."""
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["fingerprint"]) != fingerprint:
+                    return None
+                metrics: Dict[str, Any] = json.loads(str(data["metrics"]))
+                return cls(data["weights"].copy(), data["cash"].copy(), metrics, fingerprint)
+        except Exception as exc:
+            print(f"분석 테이블을 읽을 수 없습니다: {path} ({exc})")
+            return None
@@ -0,0 +1,103 @@
+"""
+Vectorised backtest of a fixed target allocation over a close-price matrix.
+
+`backtest` splits the (dates × assets) matrix into rebalance segments. Within
+a segment the holdings only drift with prices, so the portfolio growth since
+the segment start is one `(P_t / P_start) @ weights` product for every day.
+At each rebalance the drifted weights are traded back to the target and the
+turnover is charged at `cost_rate` (`weight_transaction_cost +
+weight_slippage` in `env_meta.json`). Segment start values are a single
+cumulative product, so the whole curve costs O(dates × assets) numpy work and
+no Python loop over days.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Trading days between rebalances; 0 keeps the initial holdings (buy and hold).
+REBALANCE_PERIODS = {
+    "buy_and_hold": 0,
+    "daily": 1,
+    "weekly": 5,
+    "monthly": 21,
+    "quarterly": 63,
+}
+
+
+def rebalance_period(name: Optional[str]) -> int:
+    key = (name or "buy_and_hold").lower().replace("-", "_")
+    if key not in REBALANCE_PERIODS:
+        raise ValueError(f"지원하지 않는 리밸런싱 주기입니다: {name}")
+    return REBALANCE_PERIODS[key]
+
+
+def cost_rate_from_env_meta(env_meta: Dict[str, float]) -> float:
+    """Proportional cost per unit of traded weight, as the training env charged it."""
+    return float(env_meta.get("weight_transaction_cost", 0.0) or 0.0) + float(
+        env_meta.get("weight_slippage", 0.0) or 0.0
+    )
+
+
+def backtest(
+    prices: np.ndarray,
+    weights: np.ndarray,
+    cash: Optional[float] = None,
+    rebalance_every: int = 0,
+    cost_rate: float = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Equity curve of `weights` (plus `cash`) held over `prices`.
+
+    Assets whose column is not strictly positive and finite on every date are
+    held as cash instead. `cash` defaults to whatever the weights leave
+    unallocated; weights and cash are normalised to sum to one. The initial
+    purchase is charged like a rebalance from all-cash.
+
+    Returns `values` (starting from 1.0 before costs), cumulative `returns`,
+    and the `turnover` traded at inception and at each rebalance.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim != 2:
+        raise ValueError("가격 행렬은 (날짜, 자산) 2차원이어야 합니다.")
+    steps, n_assets = prices.shape
+    weights = np.clip(np.asarray(weights, dtype=np.float64).reshape(-1), 0.0, None)
+    if weights.size != n_assets:
+        raise ValueError(f"비중 개수가 자산 수와 다릅니다: {weights.size} != {n_assets}")
+    if steps == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return {"values": empty, "returns": empty, "turnover": empty}
+
+    cash = max(1.0 - weights.sum(), 0.0) if cash is None else max(float(cash), 0.0)
+    valid = np.isfinite(prices).all(axis=0) & (prices > 0).all(axis=0)
+    cash += float(weights[~valid].sum())
+    weights = np.where(valid, weights, 0.0)
+    total = weights.sum() + cash
+    if total <= 0:
+        weights, cash, total = np.zeros(n_assets), 1.0, 1.0
+    weights = weights / total
+    cash = cash / total
+    # Invalid columns carry zero weight; give them a harmless price of one.
+    prices = np.where(valid, prices, 1.0)
+
+    period = int(rebalance_every) if rebalance_every and rebalance_every > 0 else steps
+    starts = np.arange(0, steps, period)
+    segment = np.arange(steps) // period
+
+    # Growth since the segment start for every day.
+    growth = (prices / prices[starts][segment]) @ weights + cash
+
+    turnover = np.empty(starts.size, dtype=np.float64)
+    turnover[0] = weights.sum()
+    if starts.size > 1:
+        relative = prices[starts[1:]] / prices[starts[:-1]]
+        segment_growth = relative @ weights + cash
+        drifted = relative * weights / segment_growth[:, None]
+        turnover[1:] = np.abs(drifted - weights).sum(axis=1)
+        carried = np.concatenate(([1.0], segment_growth))
+    else:
+        carried = np.ones(1, dtype=np.float64)
+
+    start_values = np.cumprod(carried * (1.0 - cost_rate * turnover))
+    values = start_values[segment] * growth
+    return {"values": values, "returns": values - 1.0, "turnover": turnover}
@@ -0,0 +1,130 @@
+"""
+Asyncio micro-batcher for policy forward passes.
+
+Concurrent handlers `submit` one observation each. A single worker task
+collects them until `max_batch` rows are queued or `max_wait_ms` has passed
+since the first one arrived, stacks them, and runs one forward pass through
+`runner` (normally the CPU pool of `BlockingExecutor`). Each caller gets its
+own output row back.
+
+`close` may be called from any thread: the worker drains what is already
+queued and exits, and later submits run unbatched on `runner`.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_STOP = object()
+
+Runner = Callable[[Callable[[np.ndarray], np.ndarray], np.ndarray], Awaitable[np.ndarray]]
+
+
+async def _run_inline(fn: Callable[[np.ndarray], np.ndarray], batch: np.ndarray) -> np.ndarray:
+    return fn(batch)
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        fn: Callable[[np.ndarray], np.ndarray],
+        max_batch: int = 256,
+        max_wait_ms: float = 5.0,
+        runner: Optional[Runner] = None,
+    ) -> None:
+        self.fn = fn
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+        self.runner = runner or _run_inline
+        self._queue: Optional["asyncio.Queue[Tuple[np.ndarray, asyncio.Future]]"] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stopping = False
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+
+    async def submit(self, row: np.ndarray) -> np.ndarray:
+        if self._closed:
+            return (await self.runner(self.fn, row[None]))[0]
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future: asyncio.Future = loop.create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        item = await self._queue.get()
+        deadline = loop.time() + self.max_wait
+        while True:
+            if item is _STOP:
+                self._stopping = True
+                break
+            pending.append(item)
+            if len(pending) >= self.max_batch:
+                break
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+        # Callers that gave up (request timeout) are dropped from the batch.
+        return [(row, future) for row, future in pending if not future.done()]
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            pending = await self._collect()
+            if not pending:
+                continue
+            batch = np.stack([row for row, _ in pending])
+            try:
+                outputs = await self.runner(self.fn, batch)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(pending)
+            self.largest_batch = max(self.largest_batch, len(pending))
+            for (_, future), output in zip(pending, outputs):
+                if not future.done():
+                    future.set_result(output)
+
+    def close(self) -> None:
+        self._closed = True
+        worker, queue = self._worker, self._queue
+        if worker is None or worker.done() or queue is None:
+            return
+        loop = worker.get_loop()
+        if loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            queue.put_nowait(_STOP)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, _STOP)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch": (self.rows / self.batches) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
@@ -0,0 +1,151 @@
+"""
+Binary layout for `irt_assets/*/evaluation_results.json`.
+
+`convert_bundle` writes every series the server reads into an
+`evaluation_bundle/` directory next to the JSON file: one `.npy` per array
+plus a small `header.json` with the scalar fields and a fingerprint of the
+source JSON. `load_bundle` memory-maps those arrays, so booting no longer
+parses the nested JSON lists (and briefly holds them twice in memory).
+
+    python -m finflow.bundle irt_assets/20251016_192706
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_DIRNAME = "evaluation_bundle"
+HEADER_NAME = "header.json"
+
+# name -> (section of `results`, key inside that section, dtype)
+ARRAY_FIELDS = {
+    "portfolio_values": ("series", "portfolio_values", np.float64),
+    "value_returns": ("series", "value_returns", np.float64),
+    "exec_returns": ("series", "per_step_returns", np.float64),
+    "cash_series": ("series", "cash_ratio", np.float64),
+    "dates": ("series", "dates", np.str_),
+    "weights_history": ("irt", "actual_weights", np.float64),
+    "crisis_levels": ("irt", "crisis_levels", np.float64),
+}
+
+
+def source_fingerprint(path: Path) -> Dict[str, int]:
+    stat = Path(path).stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_json_bundle(path: Path) -> Dict[str, Any]:
+    """Parse `evaluation_results.json` into the raw fields `load_bundle` returns."""
+    with Path(path).open("r", encoding="utf-8") as fp:
+        payload = json.load(fp)
+
+    results = payload.get("results", {})
+    irt = results.get("irt", {})
+    raw: Dict[str, Any] = {
+        "metrics": dict(results.get("metrics", {})),
+        "test_period": dict(results.get("test_period", {})),
+        "symbols": list(irt.get("symbols") or []),
+    }
+    for name, (section, key, dtype) in ARRAY_FIELDS.items():
+        raw[name] = np.asarray(results.get(section, {}).get(key, []), dtype=dtype)
+    return raw
+
+
+def convert_bundle(json_path: Path, out_dir: Optional[Path] = None) -> Path:
+    """Write the binary bundle for `json_path`; returns the bundle directory."""
+    json_path = Path(json_path)
+    out_dir = Path(out_dir) if out_dir is not None else json_path.parent / BUNDLE_DIRNAME
+    raw = read_json_bundle(json_path)
+
+    tmp_dir = out_dir.with_name(f".{out_dir.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    arrays: Dict[str, Dict[str, Any]] = {}
+    for name in ARRAY_FIELDS:
+        array = np.ascontiguousarray(raw[name])
+        np.save(tmp_dir / f"{name}.npy", array, allow_pickle=False)
+        arrays[name] = {"file": f"{name}.npy", "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    header = {
+        "version": BUNDLE_FORMAT_VERSION,
+        "source": {"name": json_path.name, **source_fingerprint(json_path)},
+        "metrics": raw["metrics"],
+        "test_period": raw["test_period"],
+        "symbols": raw["symbols"],
+        "arrays": arrays,
+    }
+    with (tmp_dir / HEADER_NAME).open("w", encoding="utf-8") as fp:
+        json.dump(header, fp, ensure_ascii=False, indent=2)
+
+    # Swap the whole directory so readers never see a half-written bundle.
+    old_dir = out_dir.with_name(f".{out_dir.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if out_dir.exists():
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return out_dir
+
+
+def load_bundle(
+    bundle_dir: Path,
+    source: Optional[Path] = None,
+    mmap: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Open a converted bundle, or return None if it is missing, from another
+    format version, or older than `source` (when that file exists).
+    """
+    bundle_dir = Path(bundle_dir)
+    header_path = bundle_dir / HEADER_NAME
+    if not header_path.exists():
+        return None
+    try:
+        with header_path.open("r", encoding="utf-8") as fp:
+            header = json.load(fp)
+        if header.get("version") != BUNDLE_FORMAT_VERSION:
+            return None
+        if source is not None and Path(source).exists():
+            recorded = header.get("source", {})
+            current = source_fingerprint(Path(source))
+            if any(recorded.get(key) != value for key, value in current.items()):
+                return None
+
+        raw: Dict[str, Any] = {
+            "metrics": dict(header.get("metrics", {})),
+            "test_period": dict(header.get("test_period", {})),
+            "symbols": list(header.get("symbols", [])),
+        }
+        mmap_mode = "r" if mmap else None
+        for name in ARRAY_FIELDS:
+            spec = header["arrays"][name]
+            raw[name] = np.load(bundle_dir / spec["file"], mmap_mode=mmap_mode, allow_pickle=False)
+        return raw
+    except Exception as exc:
+        print(f"바이너리 평가 번들을 읽을 수 없습니다: {bundle_dir} ({exc})")
+        return None
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("사용법: python -m finflow.bundle <번들 디렉터리 또는 evaluation_results.json> ...")
+        return 2
+    for arg in args:
+        path = Path(arg)
+        json_path = path / "evaluation_results.json" if path.is_dir() else path
+        out_dir = convert_bundle(json_path)
+        size_mb = sum(item.stat().st_size for item in out_dir.iterdir()) / (1024 * 1024)
+        print(f"바이너리 평가 번들 생성: {out_dir} ({size_mb:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
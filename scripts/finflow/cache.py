@@ -0,0 +1,199 @@
+"""
+Bounded, TTL-aware caches for the inference server.
+
+A `CacheManager` owns named `CacheNamespace`s. Each namespace is an LRU map
+bounded by entry count and, optionally, by an estimated byte size, with its
+own time-to-live. Hits, misses, evictions and expirations are counted per
+namespace so they can be reported from `/health`. `get_or_create` is
+single-flight: concurrent misses on one key run the factory once.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+_MISSING = object()
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Rough deep size in bytes, counting NumPy buffers and containers once."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        # Views and frozen arrays are charged too: the entry may be the only
+        # thing keeping their buffer alive (e.g. `np.frombuffer` results).
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, _seen) for item in value)
+    return sys.getsizeof(value)
+
+
+class CacheNamespace:
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizer: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        self.name = name
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                if count:
+                    self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizer(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self._bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        count = True
+        while True:
+            with self._lock:
+                value = self.get(key, _MISSING, count=count)
+                if value is not _MISSING:
+                    return value
+                pending = self._pending.get(key)
+                owner = pending is None
+                if owner:
+                    pending = self._pending[key] = threading.Event()
+            if not owner:
+                # Another caller is building this key; if it fails, try ourselves.
+                pending.wait()
+                count = False
+                continue
+            try:
+                value = factory()
+                self.set(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+                pending.set()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key][0]
+            self._remove(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes if self.max_bytes is not None else None,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class CacheManager:
+    def __init__(self) -> None:
+        self._namespaces: Dict[str, CacheNamespace] = {}
+        self._lock = threading.Lock()
+
+    def namespace(
+        self,
+        name: str,
+        max_entries: int = 128,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> CacheNamespace:
+        """Return the namespace `name`, creating it with this config on first use."""
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is None:
+                namespace = CacheNamespace(
+                    name, max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes
+                )
+                self._namespaces[name] = namespace
+            return namespace
+
+    def __getitem__(self, name: str) -> CacheNamespace:
+        return self._namespaces[name]
+
+    def clear(self) -> None:
+        for namespace in list(self._namespaces.values()):
+            namespace.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: ns.stats() for name, ns in list(self._namespaces.items())}
@@ -0,0 +1,260 @@
+"""
+Incrementally maintained return correlations for `/correlation-analysis`.
+
+`RunningCorrelation` keeps, for a sliding window of daily returns over a
+universe of tickers, the pairwise sums Σx, Σx², Σxy and the pairwise row
+counts (a missing return contributes to none of them). The correlation of
+any pair is then pairwise-complete, exactly as `DataFrame.corr()` computes
+it. Adding or dropping one trading day is a rank-one update, O(n²), so a
+refresh only touches the days that entered or left the window.
+
+`CorrelationEngine` keeps an LRU of at most `max_windows` windows keyed by
+(period, tickers). Requests within the model's universe share one window per
+period, which tracks only the tickers asked for so far: a ticker it does not
+hold yet is fetched on its own and added as a column. Any other ticker set
+gets a window of its own. A stale window fetches only the days from its last
+held one on and slides its start to where a fresh load over the period would
+begin. Each window is loaded under its own lock, so concurrent requests for
+one key trigger a single fetch while other keys proceed.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finflow.pairs import rank_pairs
+from finflow.prices import period_to_start
+
+# (tickers, period, start) -> close frame with one column per ticker, over the
+# whole period when `start` is None, else from `start` (inclusive) on.
+CloseLoader = Callable[[List[str], str, Optional[pd.Timestamp]], pd.DataFrame]
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.today().normalize()
+
+
+def returns_frame(close: pd.DataFrame) -> pd.DataFrame:
+    """Daily simple returns per column; a gap leaves NaN instead of bridging it."""
+    return close.sort_index().pct_change(fill_method=None).iloc[1:]
+
+
+class RunningCorrelation:
+    def __init__(self, tickers: Sequence[str]) -> None:
+        self._reset(tickers)
+
+    def _reset(self, tickers: Sequence[str]) -> None:
+        self.tickers = list(tickers)
+        self.index = {ticker: idx for idx, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self._rows: Deque[Tuple[pd.Timestamp, np.ndarray, np.ndarray]] = deque()
+        # sums[i, j] = Σ x_i over rows where j is present; squares likewise with x_i².
+        self._count = np.zeros((n, n), dtype=np.float64)
+        self._sums = np.zeros((n, n), dtype=np.float64)
+        self._squares = np.zeros((n, n), dtype=np.float64)
+        self._products = np.zeros((n, n), dtype=np.float64)
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def dates(self) -> List[pd.Timestamp]:
+        return [row[0] for row in self._rows]
+
+    def _frame_arrays(self, returns: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        values = returns.reindex(columns=self.tickers).to_numpy(dtype=np.float64)
+        present = np.isfinite(values)
+        return np.where(present, values, 0.0), present.astype(np.float64)
+
+    def _apply(self, values: np.ndarray, present: np.ndarray, sign: float) -> None:
+        self._count += sign * (present.T @ present)
+        self._sums += sign * (values.T @ present)
+        self._squares += sign * ((values * values).T @ present)
+        self._products += sign * (values.T @ values)
+        self._matrix = None
+
+    def rebuild(self, returns: pd.DataFrame) -> None:
+        values, present = self._frame_arrays(returns)
+        for array in (self._count, self._sums, self._squares, self._products):
+            array[:] = 0.0
+        self._apply(values, present, 1.0)
+        self._rows = deque(zip(returns.index, values, present))
+
+    def advance(self, returns: pd.DataFrame) -> int:
+        """
+        Add `returns`, the days from the last held one on.
+
+        Held days at or after its first date are replaced first (the last bar
+        may have changed intraday). Returns the number of days added or removed.
+        """
+        if returns.empty:
+            return 0
+        changed = 0
+        while self._rows and self._rows[-1][0] >= returns.index[0]:
+            _, values, present = self._rows.pop()
+            self._apply(values[None, :], present[None, :], -1.0)
+            changed += 1
+        values, present = self._frame_arrays(returns)
+        self._apply(values, present, 1.0)
+        self._rows.extend(zip(returns.index, values, present))
+        return changed + len(returns)
+
+    def drop_through(self, date: pd.Timestamp) -> int:
+        """Remove the held days up to and including `date`; returns how many."""
+        dropped = 0
+        while self._rows and self._rows[0][0] <= date:
+            _, values, present = self._rows.popleft()
+            self._apply(values[None, :], present[None, :], -1.0)
+            dropped += 1
+        return dropped
+
+    def add_columns(self, returns: pd.DataFrame) -> None:
+        """Track the new columns of `returns`, aligned to the held days, without refetching the rest."""
+        added = [ticker for ticker in returns.columns if ticker not in self.index]
+        if not added:
+            return
+        dates = pd.DatetimeIndex(self.dates)
+        shape = (len(dates), len(self.tickers))
+        values = np.array([row[1] for row in self._rows]).reshape(shape)
+        present = np.array([row[2] for row in self._rows], dtype=bool).reshape(shape)
+        held = pd.DataFrame(np.where(present, values, np.nan), index=dates, columns=self.tickers)
+        combined = held.join(returns.reindex(index=dates, columns=added))
+        self._reset(self.tickers + added)
+        self.rebuild(combined)
+
+    def matrix(self) -> np.ndarray:
+        """Pairwise-complete Pearson correlation (NaN where undefined)."""
+        if self._matrix is None:
+            count = self._count
+            covariance = count * self._products - self._sums * self._sums.T
+            variance = count * self._squares - self._sums * self._sums
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = covariance / np.sqrt(variance * variance.T)
+            matrix[(count < 2) | ~(variance * variance.T > 0)] = np.nan
+            np.clip(matrix, -1.0, 1.0, out=matrix)
+            np.fill_diagonal(matrix, np.where(np.isnan(np.diag(matrix)), np.nan, 1.0))
+            matrix.setflags(write=False)
+            self._matrix = matrix
+        return self._matrix
+
+    def submatrix(self, tickers: Sequence[str]) -> np.ndarray:
+        positions = [self.index[ticker] for ticker in tickers]
+        return self.matrix()[np.ix_(positions, positions)]
+
+
+class _Slot:
+    """A window and the lock its loads run under."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.window: Optional[RunningCorrelation] = None
+        # Date of the close the window's first return is measured from.
+        self.base: Optional[pd.Timestamp] = None
+        self.refreshed = 0.0
+
+
+class CorrelationEngine:
+    def __init__(
+        self,
+        loader: CloseLoader,
+        universe: Sequence[str] = (),
+        max_age: float = 1800.0,
+        max_windows: int = 8,
+    ) -> None:
+        self.loader = loader
+        self.universe = tuple(dict.fromkeys(universe))
+        self._known = set(self.universe)
+        self.max_age = float(max_age)
+        self.max_windows = max(int(max_windows), 1)
+        self._slots: "OrderedDict[Tuple[str, Tuple[str, ...]], _Slot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+        self.refreshes = 0
+
+    def _key(self, tickers: Sequence[str], period: str) -> Tuple[str, Tuple[str, ...]]:
+        if self._known.issuperset(tickers):
+            return period, self.universe
+        return period, tuple(sorted(tickers))
+
+    def _slot(self, key: Tuple[str, Tuple[str, ...]]) -> _Slot:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot()
+            self._slots.move_to_end(key)
+            while len(self._slots) > self.max_windows:
+                # A request still holding an evicted slot finishes on it.
+                self._slots.popitem(last=False)
+            return slot
+
+    def pairs(self, tickers: Sequence[str], period: str) -> List[Tuple[str, str, float]]:
+        tickers = list(dict.fromkeys(tickers))
+        slot = self._slot(self._key(tickers, period))
+        with slot.lock:
+            if slot.window is None:
+                self._rebuild(slot, tickers, period)
+            elif time.monotonic() - slot.refreshed > self.max_age:
+                self._refresh(slot, period)
+            missing = [ticker for ticker in tickers if ticker not in slot.window.index]
+            if missing:
+                # Start at the window's base close so the new columns line up with the held days.
+                close = self.loader(missing, period, slot.base)
+                slot.window.add_columns(returns_frame(close))
+            matrix = slot.window.submatrix(tickers)
+        return rank_pairs(matrix, tickers)
+
+    def _rebuild(self, slot: _Slot, tickers: List[str], period: str) -> None:
+        close = self.loader(tickers, period, None)
+        window = RunningCorrelation(tickers)
+        window.rebuild(returns_frame(close))
+        slot.window, slot.refreshed = window, time.monotonic()
+        slot.base = close.index.min() if len(close.index) else None
+        with self._lock:
+            self.rebuilds += 1
+
+    def _refresh(self, slot: _Slot, period: str) -> None:
+        window = slot.window
+        dates = window.dates
+        if slot.base is None or not dates:
+            self._rebuild(slot, window.tickers, period)
+            return
+        # Refetch from the close before the last held day, which is replaced.
+        since = dates[-2] if len(dates) > 1 else slot.base
+        fresh = returns_frame(self.loader(window.tickers, period, since))
+        window.advance(fresh.loc[fresh.index > since])
+
+        lower = period_to_start(period, _today())
+        if lower is not None:
+            start = lower.normalize() + ONE_DAY
+            base = next((date for date in [slot.base] + window.dates if date >= start), None)
+            if base is None:
+                self._rebuild(slot, window.tickers, period)
+                return
+            # A fresh load over the period measures its first return from `base`.
+            window.drop_through(base)
+            slot.base = base
+        slot.refreshed = time.monotonic()
+        with self._lock:
+            self.refreshes += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            slots = list(self._slots.items())
+            rebuilds, refreshes = self.rebuilds, self.refreshes
+        return {
+            "universe": len(self.universe),
+            "max_windows": self.max_windows,
+            "windows": [
+                {"period": period, "tickers": len(slot.window.tickers), "days": len(slot.window)}
+                for (period, _), slot in slots
+                if slot.window is not None
+            ],
+            "rebuilds": rebuilds,
+            "refreshes": refreshes,
+        }
@@ -0,0 +1,159 @@
+"""
+Covariance and correlation estimates for large ticker universes.
+
+Returns are held as a float32 (days × tickers) matrix, so every estimator is
+a single SGEMM over the universe:
+
+- "sample": plain sample covariance;
+- "ledoit_wolf": the (1/n) maximum-likelihood covariance, which is what the
+  Ledoit-Wolf intensity (scikit-learn's `ledoit_wolf_shrinkage`) is derived
+  for, shrunk towards a scaled identity; it equals
+  `sklearn.covariance.ledoit_wolf` and keeps the matrix well conditioned when
+  tickers outnumber days;
+- "ewma": exponentially weighted covariance with a `halflife` in days.
+
+`window` keeps only the trailing `window` days. Tickers covering fewer than
+`min_coverage` of the days are excluded; the remaining gaps are filled with
+the ticker's mean return, i.e. contribute nothing to the co-moments.
+Covariances are annualised with `TRADING_DAYS`.
+"""
+
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.covariance import ledoit_wolf_shrinkage
+
+from finflow.pairs import rank_pairs
+
+METHODS = ("sample", "ledoit_wolf", "ewma")
+TRADING_DAYS = 252
+DEFAULT_HALFLIFE = 30.0
+MIN_COVERAGE = 0.8
+
+
+def prepare_returns(
+    returns: pd.DataFrame,
+    window: Optional[int] = None,
+    min_coverage: float = MIN_COVERAGE,
+) -> Tuple[np.ndarray, List[str], List[str]]:
+    """(days × kept) float32 returns, kept tickers and excluded tickers."""
+    if window is not None and window > 0:
+        returns = returns.iloc[-int(window) :]
+    values = returns.to_numpy(dtype=np.float32)
+    present = np.isfinite(values)
+    kept = present.mean(axis=0) >= min_coverage if values.shape[0] else np.zeros(values.shape[1], bool)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        means = np.nanmean(values, axis=0)
+        # Constant series have no defined correlation.
+        kept &= np.nan_to_num(np.nanstd(values, axis=0)) > 0
+
+    tickers = [ticker for ticker, keep in zip(returns.columns, kept) if keep]
+    excluded = [ticker for ticker, keep in zip(returns.columns, kept) if not keep]
+    filled = np.where(present, values, means)[:, kept]
+    return np.ascontiguousarray(filled, dtype=np.float32), tickers, excluded
+
+
+def estimate_covariance(
+    returns: np.ndarray, method: str = "ledoit_wolf", halflife: float = DEFAULT_HALFLIFE
+) -> Tuple[np.ndarray, Optional[float]]:
+    """Daily covariance (float32) of `returns` and the shrinkage applied, if any."""
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 공분산 추정 방식입니다: {method}")
+    days = returns.shape[0]
+    if days < 2:
+        raise ValueError("공분산을 계산하기에 관측치가 부족합니다.")
+
+    if method == "ewma":
+        decay = 0.5 ** (1.0 / max(float(halflife), 1e-6))
+        weights = (decay ** np.arange(days - 1, -1, -1)).astype(np.float32)
+        weights /= weights.sum()
+        centered = returns - weights @ returns
+        return (centered * weights[:, None]).T @ centered, None
+
+    centered = returns - returns.mean(axis=0, dtype=np.float32)
+    gram = centered.T @ centered
+    if method == "sample":
+        return gram / np.float32(days - 1), None
+
+    # Shrink the estimator the intensity was computed against, not the 1/(n-1) one.
+    covariance = gram / np.float32(days)
+    shrinkage = float(ledoit_wolf_shrinkage(centered, assume_centered=True))
+    target = np.float32(np.trace(covariance) / covariance.shape[0])
+    covariance *= np.float32(1.0 - shrinkage)
+    covariance[np.diag_indices_from(covariance)] += np.float32(shrinkage) * target
+    return covariance, shrinkage
+
+
+def correlation_from_covariance(covariance: np.ndarray) -> np.ndarray:
+    scale = np.sqrt(np.clip(np.diag(covariance), 0.0, None)).astype(np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(scale, scale)
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+
+class CovarianceEstimate:
+    """Annualised covariance and correlation over one universe, shared read-only."""
+
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        covariance: np.ndarray,
+        observations: int,
+        method: str,
+        shrinkage: Optional[float] = None,
+        excluded: Sequence[str] = (),
+    ) -> None:
+        self.tickers = list(tickers)
+        self.index = {ticker: idx for idx, ticker in enumerate(self.tickers)}
+        self.covariance = covariance * np.float32(TRADING_DAYS)
+        self.correlation = correlation_from_covariance(covariance)
+        for array in (self.covariance, self.correlation):
+            array.setflags(write=False)
+        self.observations = int(observations)
+        self.method = method
+        self.shrinkage = shrinkage
+        self.excluded = list(excluded)
+
+    @classmethod
+    def from_returns(
+        cls,
+        returns: pd.DataFrame,
+        method: str = "ledoit_wolf",
+        window: Optional[int] = None,
+        halflife: float = DEFAULT_HALFLIFE,
+        min_coverage: float = MIN_COVERAGE,
+    ) -> "CovarianceEstimate":
+        values, tickers, excluded = prepare_returns(returns, window, min_coverage)
+        if len(tickers) < 2:
+            raise ValueError("공분산을 계산할 수 있는 종목이 2개 미만입니다.")
+        covariance, shrinkage = estimate_covariance(values, method, halflife)
+        return cls(tickers, covariance, values.shape[0], method, shrinkage, excluded)
+
+    def subset(self, tickers: Sequence[str], kind: str = "correlation") -> Tuple[List[str], np.ndarray]:
+        """Requested tickers that survived filtering, in request order, and their block."""
+        kept = [ticker for ticker in dict.fromkeys(tickers) if ticker in self.index]
+        positions = [self.index[ticker] for ticker in kept]
+        source = self.covariance if kind == "covariance" else self.correlation
+        return kept, source[np.ix_(positions, positions)]
+
+    def top_pairs(self, tickers: Sequence[str], top_k: int) -> List[Dict[str, float]]:
+        """Strongest pairs by |correlation| with both statistics attached."""
+        kept, correlation = self.subset(tickers)
+        positions = {ticker: self.index[ticker] for ticker in kept}
+        return [
+            {
+                "stock1": stock1,
+                "stock2": stock2,
+                "correlation": value,
+                "covariance": float(self.covariance[positions[stock1], positions[stock2]]),
+            }
+            for stock1, stock2, value in rank_pairs(correlation, kept, top_k)
+        ]
+
+    def volatilities(self, tickers: Sequence[str]) -> List[float]:
+        return [float(np.sqrt(max(self.covariance[self.index[t], self.index[t]], 0.0))) for t in tickers]
@@ -0,0 +1,49 @@
+"""
+Trading-date index helpers.
+
+Bundle dates are parsed once into a `DatetimeIndex` plus a read-only
+datetime64 array; range queries are then binary searches over that array
+rather than string parsing per row.
+"""
+
+from datetime import datetime
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+DateLike = Union[str, datetime, pd.Timestamp, np.datetime64, None]
+
+
+def freeze_dates(dates: Sequence[str]) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """Parse `dates` once; returns the index and a read-only datetime64 view of it."""
+    index = pd.DatetimeIndex(pd.to_datetime(list(dates)))
+    values = index.values.view()
+    values.setflags(write=False)
+    return index, values
+
+
+def to_datetime64(value: DateLike) -> Optional[np.datetime64]:
+    """None for an absent bound (None or ""); raises ValueError when `value` is not a date."""
+    if value is None or value == "":
+        return None
+    try:
+        stamp = pd.Timestamp(value)
+    except (TypeError, ValueError, OverflowError):
+        stamp = pd.NaT
+    if stamp is pd.NaT:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}")
+    return stamp.to_datetime64()
+
+
+def date_slice(values: np.ndarray, start: DateLike = None, end: DateLike = None) -> slice:
+    """Positions of sorted `values` inside the inclusive range [start, end]; see `to_datetime64`."""
+    start_value = to_datetime64(start)
+    end_value = to_datetime64(end)
+    lo = int(np.searchsorted(values, start_value, side="left")) if start_value is not None else 0
+    hi = (
+        int(np.searchsorted(values, end_value, side="right"))
+        if end_value is not None
+        else len(values)
+    )
+    return slice(lo, max(lo, hi))
@@ -0,0 +1,76 @@
+"""
+Dedicated thread pools for the blocking parts of the request handlers.
+
+FastAPI routes are `async def`, so any synchronous yfinance/pandas call made
+inline stalls the event loop for every other request. `BlockingExecutor`
+keeps two bounded pools, one for network-bound work and one for CPU-bound
+work, and awaits their futures with a per-call timeout.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorTimeout(TimeoutError):
+    """Raised when a blocking call does not finish within its timeout."""
+
+
+class BlockingExecutor:
+    IO = "io"
+    CPU = "cpu"
+
+    def __init__(self, io_workers: int, cpu_workers: int) -> None:
+        self.sizes = {self.IO: max(int(io_workers), 1), self.CPU: max(int(cpu_workers), 1)}
+        self._pools = {
+            kind: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{kind}-pool")
+            for kind, size in self.sizes.items()
+        }
+        self._lock = threading.Lock()
+        self._pending = {self.IO: 0, self.CPU: 0}
+        self._timeouts = {self.IO: 0, self.CPU: 0}
+        self._cancelled = {self.IO: 0, self.CPU: 0}
+
+    def _track(self, kind: str, delta: int) -> None:
+        with self._lock:
+            self._pending[kind] += delta
+
+    async def run(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        pool = self._pools[kind]
+        self._track(kind, 1)
+        future = pool.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda _: self._track(kind, -1))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            # A queued job is dropped before it starts; a running one finishes in
+            # the background and its result is discarded.
+            with self._lock:
+                self._timeouts[kind] += 1
+                if future.cancel():
+                    self._cancelled[kind] += 1
+            raise ExecutorTimeout(f"{getattr(func, '__name__', 'call')} timed out after {timeout}s")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                kind: {
+                    "workers": self.sizes[kind],
+                    "pending": self._pending[kind],
+                    "timeouts": self._timeouts[kind],
+                    "cancelled": self._cancelled[kind],
+                }
+                for kind in self.sizes
+            }
+
+    def shutdown(self) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,309 @@
+"""
+Technical indicators used by the IRT training environment.
+
+The names and definitions follow stockstats, which FinRL's FeatureEngineer
+used to produce the `tech_indicators` listed in `env_meta.json`.
+
+`indicator_matrices` computes every indicator for all tickers at once on
+(dates × tickers) price matrices. `IncrementalIndicators` keeps the running
+state (EMA numerators/denominators, rolling sums and short ring buffers) so a
+new trading day is appended without touching the rest of the history.
+"""
+
+import re
+import warnings
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+TECH_INDICATORS = (
+    "macd",
+    "boll_ub",
+    "boll_lb",
+    "rsi_30",
+    "cci_30",
+    "dx_30",
+    "close_30_sma",
+    "close_60_sma",
+)
+
+MACD_FAST = 12
+MACD_SLOW = 26
+BOLL_WINDOW = 20
+BOLL_WIDTH = 2.0
+CCI_CONSTANT = 0.015
+
+_WINDOWED = re.compile(r"^(rsi|cci|dx)_(\d+)$")
+_SMA = re.compile(r"^close_(\d+)_sma$")
+
+
+def parse_indicator(name: str) -> Tuple[str, int]:
+    """("macd" | "boll_ub" | "boll_lb" | "rsi" | "cci" | "dx" | "sma", window)."""
+    if name == "macd":
+        return "macd", MACD_SLOW
+    if name in ("boll_ub", "boll_lb"):
+        return name, BOLL_WINDOW
+    match = _WINDOWED.match(name)
+    if match:
+        return match.group(1), int(match.group(2))
+    match = _SMA.match(name)
+    if match:
+        return "sma", int(match.group(1))
+    raise ValueError(f"지원하지 않는 기술 지표입니다: {name}")
+
+
+def _finalize(values: np.ndarray) -> np.ndarray:
+    """inf -> NaN, forward-fill down each column, then 0 (FinRL's cleaning)."""
+    frame = pd.DataFrame(np.where(np.isfinite(values), values, np.nan))
+    return frame.ffill().fillna(0.0).to_numpy()
+
+
+def _cci(typical: np.ndarray, center: np.ndarray, mad: np.ndarray) -> np.ndarray:
+    # A flat window has a deviation of a few ulps; treat it as undefined.
+    mad = np.where(mad > 1e-12 * np.abs(center), mad, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (typical - center) / (CCI_CONSTANT * mad)
+
+
+def _rolling_mean_mad(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and mean absolute deviation over `window` rows (min_periods=1)."""
+    padded = np.vstack([np.full((window - 1, values.shape[1]), np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        center = np.nanmean(windows, axis=-1)
+        return center, np.nanmean(np.abs(windows - center[..., None]), axis=-1)
+
+
+def indicator_matrices(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    indicators: Sequence[str] = TECH_INDICATORS,
+) -> Dict[str, np.ndarray]:
+    """
+    Indicators for (dates × tickers) price matrices, one (dates × tickers)
+    array per name. Leading NaNs (a ticker not yet listed) are skipped.
+    """
+    close_df = pd.DataFrame(np.asarray(close, dtype=np.float64))
+    high_df = pd.DataFrame(np.asarray(high, dtype=np.float64))
+    low_df = pd.DataFrame(np.asarray(low, dtype=np.float64))
+    prev_close = close_df.shift(1)
+    out: Dict[str, np.ndarray] = {}
+
+    for name in indicators:
+        kind, window = parse_indicator(name)
+        if kind == "macd":
+            fast = close_df.ewm(span=MACD_FAST, adjust=True).mean()
+            slow = close_df.ewm(span=MACD_SLOW, adjust=True).mean()
+            values = (fast - slow).to_numpy()
+        elif kind in ("boll_ub", "boll_lb"):
+            rolling = close_df.rolling(window, min_periods=1)
+            sign = 1.0 if kind == "boll_ub" else -1.0
+            values = (rolling.mean() + sign * BOLL_WIDTH * rolling.std()).to_numpy()
+        elif kind == "rsi":
+            delta = close_df - prev_close
+            up = delta.clip(lower=0.0).ewm(alpha=1.0 / window, adjust=True).mean()
+            down = (-delta).clip(lower=0.0).ewm(alpha=1.0 / window, adjust=True).mean()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = (100.0 - 100.0 / (1.0 + up / down)).to_numpy()
+        elif kind == "cci":
+            typical = ((high_df + low_df + close_df) / 3.0).to_numpy()
+            values = _cci(typical, *_rolling_mean_mad(typical, window))
+        elif kind == "dx":
+            true_range = np.fmax.reduce(
+                [
+                    (high_df - low_df).to_numpy(),
+                    (high_df - prev_close).abs().to_numpy(),
+                    (low_df - prev_close).abs().to_numpy(),
+                ]
+            )
+            up_move = high_df.diff().to_numpy()
+            down_move = -low_df.diff().to_numpy()
+            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+            plus_dm = np.where(np.isnan(close_df.to_numpy()), np.nan, plus_dm)
+            minus_dm = np.where(np.isnan(close_df.to_numpy()), np.nan, minus_dm)
+            alpha = 1.0 / window
+            atr = pd.DataFrame(true_range).ewm(alpha=alpha, adjust=True).mean()
+            plus_di = 100.0 * pd.DataFrame(plus_dm).ewm(alpha=alpha, adjust=True).mean() / atr
+            minus_di = 100.0 * pd.DataFrame(minus_dm).ewm(alpha=alpha, adjust=True).mean() / atr
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = (100.0 * (plus_di - minus_di).abs() / (plus_di + minus_di)).to_numpy()
+        else:
+            values = close_df.rolling(window, min_periods=1).mean().to_numpy()
+        out[name] = _finalize(values)
+    return out
+
+
+class _Ewm:
+    """adjust=True EWM state: y = num / den, both decayed by (1 - alpha) per row."""
+
+    def __init__(self, alpha: float, n_assets: int) -> None:
+        self.decay = 1.0 - alpha
+        self.num = np.zeros(n_assets)
+        self.den = np.zeros(n_assets)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        # Decaying on NaN rows too matches pandas' ignore_na=False.
+        valid = ~np.isnan(x)
+        self.num *= self.decay
+        self.den *= self.decay
+        self.num[valid] += x[valid]
+        self.den[valid] += 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.den > 0, self.num / self.den, np.nan)
+
+
+class _Window:
+    """Ring buffer of the last `size` rows with NaN-aware running sums."""
+
+    def __init__(self, size: int, n_assets: int) -> None:
+        self.size = size
+        self.buffer = np.full((size, n_assets), np.nan)
+        self.pos = 0
+        self.sum = np.zeros(n_assets)
+        self.sumsq = np.zeros(n_assets)
+        self.count = np.zeros(n_assets)
+
+    def update(self, x: np.ndarray) -> None:
+        old = self.buffer[self.pos]
+        old_valid = ~np.isnan(old)
+        new_valid = ~np.isnan(x)
+        self.sum += np.where(new_valid, x, 0.0) - np.where(old_valid, old, 0.0)
+        self.sumsq += np.where(new_valid, x * x, 0.0) - np.where(old_valid, old * old, 0.0)
+        self.count += new_valid.astype(np.float64) - old_valid.astype(np.float64)
+        self.buffer[self.pos] = x
+        self.pos = (self.pos + 1) % self.size
+
+    def mean(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, self.sum / self.count, np.nan)
+
+    def std(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+            return np.where(self.count > 1, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+    def mean_mad(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact mean and mean absolute deviation from the buffer (O(size × assets))."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            center = np.nanmean(self.buffer, axis=0)
+            return center, np.nanmean(np.abs(self.buffer - center), axis=0)
+
+
+class IncrementalIndicators:
+    """
+    Running indicator state for `n_assets` tickers.
+
+    `update` appends one trading day and returns that day's values as a
+    (len(indicators), n_assets) array. EMA/SMMA and rolling-sum indicators
+    cost O(tickers) per day; CCI's mean absolute deviation is O(window ×
+    tickers) because it needs the whole window.
+    """
+
+    def __init__(self, n_assets: int, indicators: Sequence[str] = TECH_INDICATORS) -> None:
+        self.n_assets = int(n_assets)
+        self.indicators = list(indicators)
+        self.kinds = [parse_indicator(name) for name in self.indicators]
+        self.rows = 0
+        self.prev_close = np.full(self.n_assets, np.nan)
+        self.prev_high = np.full(self.n_assets, np.nan)
+        self.prev_low = np.full(self.n_assets, np.nan)
+        self.last = np.zeros((len(self.indicators), self.n_assets))
+
+        n = self.n_assets
+        self._ewm: Dict[str, _Ewm] = {}
+        self._windows: Dict[str, _Window] = {}
+        for kind, window in self.kinds:
+            if kind == "macd":
+                self._ewm.setdefault("macd_fast", _Ewm(2.0 / (MACD_FAST + 1), n))
+                self._ewm.setdefault("macd_slow", _Ewm(2.0 / (MACD_SLOW + 1), n))
+            elif kind in ("boll_ub", "boll_lb"):
+                self._windows.setdefault(f"close_{window}", _Window(window, n))
+            elif kind == "rsi":
+                self._ewm.setdefault(f"rsi_up_{window}", _Ewm(1.0 / window, n))
+                self._ewm.setdefault(f"rsi_down_{window}", _Ewm(1.0 / window, n))
+            elif kind == "cci":
+                self._windows.setdefault(f"typical_{window}", _Window(window, n))
+            elif kind == "dx":
+                for part in ("tr", "plus", "minus"):
+                    self._ewm.setdefault(f"dx_{part}_{window}", _Ewm(1.0 / window, n))
+            else:
+                self._windows.setdefault(f"close_{window}", _Window(window, n))
+
+    @classmethod
+    def from_history(
+        cls,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        indicators: Sequence[str] = TECH_INDICATORS,
+    ) -> "IncrementalIndicators":
+        """State after replaying (dates × tickers) history row by row."""
+        close = np.asarray(close, dtype=np.float64)
+        state = cls(close.shape[1], indicators)
+        for close_row, high_row, low_row in zip(close, np.asarray(high), np.asarray(low)):
+            state.update(close_row, high_row, low_row)
+        return state
+
+    def update(self, close: np.ndarray, high: np.ndarray, low: np.ndarray) -> np.ndarray:
+        close = np.asarray(close, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+
+        # Shared per-row inputs, computed once for every indicator that needs them.
+        delta = close - self.prev_close
+        for key, window in self._windows.items():
+            window.update((high + low + close) / 3.0 if key.startswith("typical_") else close)
+        dx_inputs: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+        values = np.empty((len(self.indicators), self.n_assets))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for row, (kind, window) in enumerate(self.kinds):
+                if kind == "macd":
+                    values[row] = self._ewm["macd_fast"].update(close) - self._ewm["macd_slow"].update(close)
+                elif kind in ("boll_ub", "boll_lb"):
+                    closes = self._windows[f"close_{window}"]
+                    sign = 1.0 if kind == "boll_ub" else -1.0
+                    values[row] = closes.mean() + sign * BOLL_WIDTH * closes.std()
+                elif kind == "rsi":
+                    gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+                    loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+                    up = self._ewm[f"rsi_up_{window}"].update(gain)
+                    down = self._ewm[f"rsi_down_{window}"].update(loss)
+                    values[row] = 100.0 - 100.0 / (1.0 + up / down)
+                elif kind == "cci":
+                    typical = self._windows[f"typical_{window}"]
+                    values[row] = _cci((high + low + close) / 3.0, *typical.mean_mad())
+                elif kind == "dx":
+                    if dx_inputs is None:
+                        true_range = np.fmax.reduce(
+                            [high - low, np.abs(high - self.prev_close), np.abs(low - self.prev_close)]
+                        )
+                        up_move = high - self.prev_high
+                        down_move = self.prev_low - low
+                        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+                        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+                        missing = np.isnan(close)
+                        dx_inputs = (
+                            true_range,
+                            np.where(missing, np.nan, plus_dm),
+                            np.where(missing, np.nan, minus_dm),
+                        )
+                    true_range, plus_dm, minus_dm = dx_inputs
+                    atr = self._ewm[f"dx_tr_{window}"].update(true_range)
+                    plus_di = 100.0 * self._ewm[f"dx_plus_{window}"].update(plus_dm) / atr
+                    minus_di = 100.0 * self._ewm[f"dx_minus_{window}"].update(minus_dm) / atr
+                    values[row] = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+                else:
+                    values[row] = self._windows[f"close_{window}"].mean()
+
+        # Same cleaning as `_finalize`: carry the last finite value, else 0.
+        values = np.where(np.isfinite(values), values, self.last)
+        self.last = values
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        self.rows += 1
+        return values
@@ -0,0 +1,281 @@
+"""
+Background market snapshot for `/market-status`.
+
+`MarketSnapshotRefresher` fetches every market symbol concurrently on a fixed
+cadence from a daemon thread and keeps the latest quotes in memory. Readers
+get the current snapshot immediately together with its age; when it is
+older than `stale_after` (upstream slow or down) they still get it, and a
+revalidation is started in the background if none is running. A symbol
+whose fetch fails keeps its last good quote. Only the very first read, before
+any snapshot exists, waits for a fetch (bounded by `fetch_timeout`).
+Extra symbols (e.g. the holdings of streamed portfolios) can be `track`ed, up
+to `max_tracked` distinct ones, and are fetched in the same round; `quotes`
+reads them back. Revalidations wake the refresher thread instead of starting
+threads of their own, so a burst of them costs one extra round.
+
+`StubPriceProvider` serves deterministic local bars so the endpoint can be
+exercised without network access.
+"""
+
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from finflow.prices import PriceProvider, normalize_ohlcv
+
+MARKET_SYMBOLS = {
+    "^GSPC": "S&P 500",
+    "^IXIC": "NASDAQ",
+    "^VIX": "VIX 변동성 지수",
+    "KRW=X": "USD/KRW 환율",
+}
+# Enough sessions to still have a previous close across weekends and holidays.
+QUOTE_PERIOD = "5d"
+
+
+class TrackingFull(RuntimeError):
+    """Raised when tracking more symbols would exceed `max_tracked`."""
+
+
+class StubPriceProvider(PriceProvider):
+    """Local random-walk bars; every call moves the last close a little."""
+
+    name = "stub"
+    BASE_PRICES = {"^GSPC": 5000.0, "^IXIC": 16000.0, "^VIX": 15.0, "KRW=X": 1350.0}
+
+    def __init__(self, latency: float = 0.0, seed: int = 0) -> None:
+        self.latency = float(latency)
+        self.seed = int(seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def history(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            step = self.calls
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode("utf-8")), step])
+        base = self.BASE_PRICES.get(ticker, 100.0)
+        closes = base * np.cumprod(1.0 + rng.normal(0.0, 0.01, 2))
+        index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=2)
+        return normalize_ohlcv(pd.DataFrame({"Close": closes, "Volume": 0.0}, index=index))
+
+
+def quote_from_history(symbol: str, name: str, history: pd.DataFrame, fetched_at: str) -> Optional[Dict[str, Any]]:
+    if history is None or history.empty or "Close" not in history:
+        return None
+    closes = history["Close"].dropna().tolist()
+    if not closes:
+        return None
+    price = float(closes[-1])
+    prev = float(closes[-2]) if len(closes) > 1 else price
+    change = price - prev
+    return {
+        "symbol": symbol,
+        "name": name,
+        "price": price,
+        "change": change,
+        "change_percent": (change / prev * 100) if prev else 0.0,
+        "last_updated": fetched_at,
+    }
+
+
+class MarketSnapshotRefresher:
+    def __init__(
+        self,
+        provider: PriceProvider,
+        symbols: Optional[Dict[str, str]] = None,
+        interval: float = 60.0,
+        stale_after: Optional[float] = None,
+        fetch_timeout: float = 10.0,
+        max_workers: int = 8,
+        max_tracked: int = 200,
+    ) -> None:
+        self.provider = provider
+        self.symbols = dict(symbols or MARKET_SYMBOLS)
+        self.interval = max(float(interval), 1.0)
+        self.stale_after = float(stale_after) if stale_after is not None else 2 * self.interval
+        self.fetch_timeout = float(fetch_timeout)
+        self.max_tracked = max(int(max_tracked), 0)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(len(self.symbols), int(max_workers), 1), thread_name_prefix="market"
+        )
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._tracked: Dict[str, int] = {}
+        self._updated_at: Optional[str] = None
+        self._updated_mono: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._inflight: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._oneshot: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.revalidations = 0
+
+    # ------------------------------------------------------------- lifecycle
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="market-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.fetch_timeout)
+        self._thread = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            # Cleared before the round, so a wake-up during it asks for one more.
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(self.interval)
+
+    # --------------------------------------------------------------- tracking
+    def track(self, symbols: Sequence[str]) -> None:
+        """Fetch `symbols` on every refresh until `untrack`ed; new ones are fetched right away."""
+        with self._lock:
+            added = [symbol for symbol in symbols if symbol not in self._tracked and symbol not in self._quotes]
+            new = {symbol for symbol in symbols if symbol not in self._tracked}
+            if len(self._tracked) + len(new) > self.max_tracked:
+                raise TrackingFull(f"추적 중인 종목 수가 한도({self.max_tracked})에 도달했습니다.")
+            for symbol in symbols:
+                self._tracked[symbol] = self._tracked.get(symbol, 0) + 1
+        if added:
+            self._revalidate()
+
+    def untrack(self, symbols: Sequence[str]) -> None:
+        with self._lock:
+            for symbol in symbols:
+                count = self._tracked.get(symbol, 0) - 1
+                if count > 0:
+                    self._tracked[symbol] = count
+                    continue
+                self._tracked.pop(symbol, None)
+                if symbol not in self.symbols:
+                    self._quotes.pop(symbol, None)
+
+    def quotes(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {symbol: dict(self._quotes[symbol]) for symbol in symbols if symbol in self._quotes}
+
+    # --------------------------------------------------------------- fetching
+    def refresh(self) -> int:
+        """Fetch every symbol concurrently; returns how many quotes were updated."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+        try:
+            fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with self._lock:
+                names = {**{symbol: symbol for symbol in self._tracked}, **self.symbols}
+            # A symbol still hanging from the previous round is not requested again.
+            futures = {
+                symbol: self._inflight.get(symbol)
+                or self._pool.submit(self.provider.history, symbol, period=QUOTE_PERIOD)
+                for symbol in names
+            }
+            done, _ = wait(list(futures.values()), timeout=self.fetch_timeout)
+            quotes: Dict[str, Dict[str, Any]] = {}
+            self._inflight = {}
+            for symbol, future in futures.items():
+                if future not in done:
+                    self._inflight[symbol] = future
+                    continue
+                try:
+                    quote = quote_from_history(symbol, names[symbol], future.result(), fetched_at)
+                except Exception:
+                    quote = None
+                if quote is not None:
+                    quotes[symbol] = quote
+            with self._lock:
+                self._quotes.update(quotes)
+                self.refreshes += 1
+                if len(quotes) < len(names):
+                    self.failures += 1
+                if quotes:
+                    self._updated_at = fetched_at
+                    self._updated_mono = time.monotonic()
+            return len(quotes)
+        finally:
+            self._refresh_lock.release()
+
+    def _revalidate(self) -> None:
+        with self._lock:
+            self.revalidations += 1
+            if self._thread is not None and self._thread.is_alive():
+                self._wake.set()
+                return
+            # Not started (e.g. benchmarks): one background round at a time.
+            if self._oneshot is not None and self._oneshot.is_alive():
+                return
+            self._oneshot = threading.Thread(target=self.refresh, name="market-revalidate", daemon=True)
+            self._oneshot.start()
+
+    # ---------------------------------------------------------------- reading
+    def age(self) -> Optional[float]:
+        with self._lock:
+            if self._updated_mono is None:
+                return None
+            return time.monotonic() - self._updated_mono
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Quotes in symbol order, with `last_updated`, `age_seconds` and `stale`."""
+        age = self.age()
+        if age is None:
+            if not self.refresh() and self._refresh_lock.acquire(timeout=self.fetch_timeout):
+                # Another round (usually the background loop's first) was already
+                # fetching: wait for it rather than answer with an empty snapshot.
+                self._refresh_lock.release()
+            age = self.age()
+        elif age > self.stale_after and not self._refresh_lock.locked():
+            self._revalidate()
+
+        with self._lock:
+            quotes: List[Dict[str, Any]] = [
+                dict(self._quotes[symbol]) for symbol in self.symbols if symbol in self._quotes
+            ]
+            updated_at = self._updated_at
+        return {
+            "market_data": quotes,
+            "last_updated": updated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "age_seconds": round(age, 3) if age is not None else None,
+            "stale": age is None or age > self.stale_after,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        age = self.age()
+        with self._lock:
+            return {
+                "provider": self.provider.name,
+                "symbols": len(self.symbols),
+                "tracked": len(self._tracked),
+                "max_tracked": self.max_tracked,
+                "cached": len(self._quotes),
+                "interval_seconds": self.interval,
+                "stale_after_seconds": self.stale_after,
+                "age_seconds": round(age, 3) if age is not None else None,
+                "refreshes": self.refreshes,
+                "partial_failures": self.failures,
+                "revalidations": self.revalidations,
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
@@ -0,0 +1,201 @@
+"""
+Monte Carlo projection of a portfolio's wealth over an investment horizon.
+
+Two return models produce (paths × steps) daily portfolio returns per chunk:
+
+- `BootstrapModel` resamples observed daily returns (the model's
+  `exec_returns`, or an allocation's backtested returns), optionally in
+  blocks of `block` consecutive days to keep short-range autocorrelation;
+- `GaussianModel` is fitted from asset returns: mean vector μ and
+  covariance Σ. The projected portfolio is constant-mix (rebalanced to its
+  weights every day), so its daily return under the multivariate normal is
+  itself normal with mean wᵀμ and variance wᵀΣw, and a path costs one draw
+  per step instead of one per asset.
+
+`simulate` splits the paths into chunks. Each chunk draws from its own
+child of `np.random.SeedSequence(seed)`, so a seed gives identical results
+whether the chunks run in this process or across an `Executor` (e.g. a
+process pool). Only the wealth at the checkpoint steps is kept per path,
+never the full (paths × steps) curve of every chunk.
+
+`process_pool` builds that pool. Its spawned workers start from this module
+rather than re-running the parent's `__main__` (the whole inference server
+when it is run as a script), so a worker costs a numpy import.
+"""
+
+import importlib.util
+import math
+import multiprocessing.context
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+METHODS = ("bootstrap", "multivariate")
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+CHUNK_PATHS = 2000
+# Daily simple returns are floored here so no path crosses zero wealth.
+MIN_RETURN = -0.99
+
+
+class BootstrapModel:
+    def __init__(self, returns: np.ndarray, block: int = 1) -> None:
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[np.isfinite(returns)]
+        if returns.size < 2:
+            raise ValueError("부트스트랩에 사용할 수익률 관측치가 부족합니다.")
+        self.returns = returns
+        self.block = min(max(int(block), 1), returns.size)
+
+    def sample(self, rng: np.random.Generator, paths: int, steps: int) -> np.ndarray:
+        if self.block == 1:
+            return self.returns[rng.integers(0, self.returns.size, size=(paths, steps))]
+        blocks = -(-steps // self.block)
+        starts = rng.integers(0, self.returns.size - self.block + 1, size=(paths, blocks))
+        index = (starts[:, :, None] + np.arange(self.block)).reshape(paths, -1)[:, :steps]
+        return self.returns[index]
+
+
+class GaussianModel:
+    def __init__(self, mean: float, std: float) -> None:
+        self.mean = float(mean)
+        self.std = max(float(std), 0.0)
+
+    @classmethod
+    def fit(cls, asset_returns: np.ndarray, weights: np.ndarray, cash_return: float = 0.0) -> "GaussianModel":
+        """
+        μ and Σ from the (days × assets) returns, folded into the portfolio's
+        daily mean and deviation. Assets with missing data are held as cash.
+        """
+        asset_returns = np.asarray(asset_returns, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        present = np.isfinite(asset_returns)
+        valid = present.mean(axis=0) >= 0.8 if asset_returns.shape[0] else np.zeros(weights.size, bool)
+        returns = asset_returns[:, valid]
+        returns = returns[np.isfinite(returns).all(axis=1)]
+        if returns.shape[0] < 2 or not valid.any():
+            raise ValueError("다변량 모형을 추정할 가격 데이터가 부족합니다.")
+        held = weights[valid]
+        cash = max(1.0 - float(held.sum()), 0.0)
+        mean = returns.mean(axis=0)
+        covariance = np.atleast_2d(np.cov(returns, rowvar=False))
+        return cls(
+            float(held @ mean) + cash * cash_return,
+            math.sqrt(max(float(held @ covariance @ held), 0.0)),
+        )
+
+    def sample(self, rng: np.random.Generator, paths: int, steps: int) -> np.ndarray:
+        return self.mean + self.std * rng.standard_normal((paths, steps))
+
+
+def checkpoint_steps(steps: int, every: int = 21) -> np.ndarray:
+    """1-based step counts at which wealth is recorded: every `every` days and the last day."""
+    marks = np.arange(every, steps, every)
+    return np.append(marks, steps).astype(np.int64)
+
+
+def _simulate_chunk(
+    model: Any, seed: np.random.SeedSequence, paths: int, steps: int, checkpoints: np.ndarray
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = model.sample(rng, paths, steps)
+    np.maximum(returns, MIN_RETURN, out=returns)
+    # Compound in log space: one log1p, one cumsum, and exp only at the checkpoints.
+    np.log1p(returns, out=returns)
+    np.cumsum(returns, axis=1, out=returns)
+    return np.exp(returns[:, checkpoints - 1])
+
+
+def simulate(
+    model: Any,
+    paths: int,
+    steps: int,
+    seed: int,
+    checkpoints: Optional[np.ndarray] = None,
+    chunk_paths: int = CHUNK_PATHS,
+    executor: Optional[Executor] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Growth of 1.0 along `paths` simulated paths, as a (paths × checkpoints)
+    matrix, and the checkpoint steps. Chunks go to `executor` when given.
+    """
+    if paths < 1 or steps < 1:
+        raise ValueError("경로 수와 기간은 1 이상이어야 합니다.")
+    checkpoints = checkpoint_steps(steps) if checkpoints is None else np.asarray(checkpoints, dtype=np.int64)
+    chunk_paths = max(int(chunk_paths), 1)
+    sizes = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if executor is not None and len(sizes) > 1:
+        futures = [
+            executor.submit(_simulate_chunk, model, child, size, steps, checkpoints)
+            for child, size in zip(seeds, sizes)
+        ]
+        chunks = [future.result() for future in futures]
+    else:
+        chunks = [_simulate_chunk(model, child, size, steps, checkpoints) for child, size in zip(seeds, sizes)]
+    return np.concatenate(chunks, axis=0), checkpoints
+
+
+def summarize(
+    growth: np.ndarray,
+    amount: float,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    tail: float = 0.05,
+) -> Dict[str, Any]:
+    """Percentile bands of wealth per checkpoint and terminal-wealth statistics for `amount`."""
+    percentiles = [float(value) for value in percentiles]
+    wealth = growth * float(amount)
+    bands = np.percentile(wealth, percentiles, axis=0)
+    terminal = wealth[:, -1]
+    tail_count = max(int(math.ceil(tail * terminal.size - 1e-9)), 1)
+    worst = np.partition(terminal, tail_count - 1)[:tail_count]
+    return {
+        "percentiles": percentiles,
+        "bands": bands,
+        "terminal": bands[:, -1],
+        "mean_terminal": float(terminal.mean()),
+        "probability_of_loss": float((terminal < amount).mean()),
+        "expected_shortfall": float(worst.mean()),
+    }
+
+
+def percentile_labels(percentiles: Sequence[float]) -> List[str]:
+    return [f"p{value:g}" for value in percentiles]
+
+
+_spawn_lock = threading.Lock()
+
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj: Any) -> Any:
+        # multiprocessing re-initialises the child's __main__ from the parent's
+        # __spec__ (by module name) when it has one, else from its file path.
+        # Naming this module while the child is launched keeps the server out.
+        main = sys.modules["__main__"]
+        with _spawn_lock:
+            saved = getattr(main, "__spec__", None)
+            main.__spec__ = importlib.util.find_spec(__name__)
+            try:
+                return multiprocessing.context.SpawnProcess._Popen(process_obj)
+            finally:
+                main.__spec__ = saved
+
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    Process = _WorkerProcess
+
+
+def _ready() -> bool:
+    return True
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Spawn-based pool for `simulate`; every worker is started right away."""
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=_WorkerContext())
+    # Workers are spawned on submit while none is idle, so one call each starts them all.
+    for _ in range(workers):
+        pool.submit(_ready)
+    return pool
@@ -0,0 +1,50 @@
+"""
+Ranking of the pairs of a symmetric matrix (correlations, attention).
+
+The strictly upper triangle is gathered with one fancy-index over cached
+`np.triu_indices`, non-finite entries are masked out, and with `top_k` only
+the `top_k` strongest pairs are selected by `np.argpartition` before the
+final sort, so a 500-ticker universe (124,750 pairs) never sorts every pair.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=16)
+def _upper_triangle(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    rows, cols = np.triu_indices(n, k=1)
+    rows, cols = rows.astype(np.int32), cols.astype(np.int32)
+    rows.setflags(write=False)
+    cols.setflags(write=False)
+    return rows, cols
+
+
+def top_pairs(matrix: np.ndarray, top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (rows, cols, values) of the upper-triangle pairs of `matrix` by descending
+    |value|, NaN dropped; all of them unless `top_k` is given. Ties keep
+    row-major order.
+    """
+    rows, cols = _upper_triangle(matrix.shape[0])
+    values = matrix[rows, cols]
+    keep = np.isfinite(values)
+    if not keep.all():
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+    strength = -np.abs(values)
+    if top_k is not None and 0 <= top_k < values.size:
+        selected = np.argpartition(strength, top_k)[:top_k] if top_k else np.zeros(0, dtype=np.intp)
+        order = selected[np.argsort(strength[selected], kind="stable")]
+    else:
+        order = np.argsort(strength, kind="stable")
+    return rows[order], cols[order], values[order]
+
+
+def rank_pairs(
+    matrix: np.ndarray, names: Sequence[str], top_k: Optional[int] = None
+) -> List[Tuple[str, str, float]]:
+    """`top_pairs` with the row/column positions replaced by `names`."""
+    rows, cols, values = top_pairs(matrix, top_k)
+    return [(names[row], names[col], value) for row, col, value in zip(rows.tolist(), cols.tolist(), values.tolist())]
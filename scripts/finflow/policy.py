@@ -0,0 +1,325 @@
+"""
+Live IRT policy inference on CPU.
+
+`ObservationBuilder` reproduces the FinRL-style state the policy was trained
+on (see `env_meta.json`): cash balance, last close per asset, shares held per
+asset and each technical indicator per asset, zero-padded to `obs_dim`.
+`TorchPolicy` loads `irt_final.zip` once and maps a batch of observations to
+portfolio weights in a single forward pass.
+
+A Stable-Baselines3 checkpoint (a zip holding `policy.pth`) is not a
+TorchScript archive; `export_sb3_policy` traces its deterministic actor into
+`policy.pt` next to the checkpoint, where `TorchPolicy` picks it up:
+
+    python -m finflow.policy irt_assets/20251016_192706
+
+torch is imported lazily so the replay-only server does not need it.
+"""
+
+import copy
+import io
+import json
+import sys
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finflow.indicators import TECH_INDICATORS, IncrementalIndicators
+
+# Members tried, in order, when the checkpoint is a zip of several files, and
+# file names tried next to the checkpoint.
+SCRIPTED_MEMBERS = ("policy.pt", "policy_scripted.pt", "actor.pt")
+SB3_POLICY_MEMBER = "policy.pth"
+
+
+class PolicyUnavailable(RuntimeError):
+    """Raised when the policy checkpoint cannot be loaded for live inference."""
+
+
+def load_env_meta(bundle_dir: Path) -> Dict[str, Any]:
+    path = Path(bundle_dir) / "env_meta.json"
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+class ObservationBuilder:
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        obs_dim: int,
+        tech_indicators: Sequence[str] = TECH_INDICATORS,
+    ) -> None:
+        self.tickers = list(tickers)
+        self.obs_dim = int(obs_dim)
+        self.tech_indicators = list(tech_indicators)
+        n_assets = len(self.tickers)
+        self.state_dim = 1 + n_assets * (2 + len(self.tech_indicators))
+        if self.state_dim > self.obs_dim:
+            raise ValueError(
+                f"관측 차원이 부족합니다: 필요 {self.state_dim}, env_meta obs_dim {self.obs_dim}"
+            )
+        # Indicator state up to (but excluding) the last seen day, whose bar may
+        # still change intraday, so refreshes only replay from that day on.
+        self._base: Optional[IncrementalIndicators] = None
+        self._last_date: Optional[pd.Timestamp] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env_meta(cls, tickers: Sequence[str], env_meta: Dict[str, Any]) -> "ObservationBuilder":
+        n_assets = len(tickers)
+        tech = env_meta.get("tech_indicators") or list(TECH_INDICATORS)
+        obs_dim = int(env_meta.get("obs_dim") or 1 + n_assets * (2 + len(tech)))
+        return cls(tickers, obs_dim, tech)
+
+    def market_state(self, histories: Dict[str, pd.DataFrame]) -> np.ndarray:
+        """
+        Latest close and indicator values as a (1 + len(tech)) × assets matrix.
+
+        Tickers with no history get zeros, which the policy sees as missing.
+        """
+        frames = {
+            ticker: histories[ticker]
+            for ticker in self.tickers
+            if histories.get(ticker) is not None and not histories[ticker].empty
+        }
+        state = np.zeros((1 + len(self.tech_indicators), len(self.tickers)), dtype=np.float64)
+        if not frames:
+            return state
+        index = pd.DatetimeIndex(sorted(set().union(*(frame.index for frame in frames.values()))))
+        prices = {
+            column: pd.DataFrame(
+                {ticker: frames[ticker][column] for ticker in frames}, index=index, columns=self.tickers
+            ).ffill().to_numpy(dtype=np.float64)
+            for column in ("Close", "High", "Low")
+        }
+
+        with self._lock:
+            start = 0
+            base = None
+            if self._base is not None and self._last_date in index:
+                start = int(index.get_loc(self._last_date))
+                base = copy.deepcopy(self._base)
+            if base is None:
+                base = IncrementalIndicators(len(self.tickers), self.tech_indicators)
+            for row in range(start, len(index)):
+                if row == len(index) - 1:
+                    self._base = copy.deepcopy(base)
+                indicators = base.update(prices["Close"][row], prices["High"][row], prices["Low"][row])
+            self._last_date = index[-1]
+
+        state[0] = np.nan_to_num(prices["Close"][-1])
+        state[1:] = indicators
+        return state
+
+    def build(
+        self,
+        market_state: np.ndarray,
+        balances: np.ndarray,
+        holdings: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """(batch, obs_dim) float32 observations, one per starting cash balance."""
+        balances = np.atleast_1d(np.asarray(balances, dtype=np.float64))
+        batch, n_assets = balances.size, len(self.tickers)
+        if holdings is None:
+            holdings = np.zeros((batch, n_assets), dtype=np.float64)
+        obs = np.zeros((batch, self.obs_dim), dtype=np.float32)
+        obs[:, 0] = balances
+        obs[:, 1 : 1 + n_assets] = market_state[0]
+        obs[:, 1 + n_assets : 1 + 2 * n_assets] = holdings
+        # Indicators are laid out indicator-major, as in FinRL's state vector.
+        obs[:, 1 + 2 * n_assets : self.state_dim] = market_state[1:].reshape(-1)
+        return obs
+
+    def describe(self, index: int) -> Tuple[str, str]:
+        """(feature, asset) labels of observation position `index`, following `build`'s layout."""
+        n_assets = len(self.tickers)
+        if index == 0:
+            return "현금 잔고", "포트폴리오"
+        if 1 <= index <= n_assets:
+            return "종가", self.tickers[index - 1]
+        if n_assets < index <= 2 * n_assets:
+            return "보유 수량", self.tickers[index - 1 - n_assets]
+        if 2 * n_assets < index < self.state_dim:
+            indicator, asset = divmod(index - 1 - 2 * n_assets, n_assets)
+            return self.tech_indicators[indicator], self.tickers[asset]
+        return f"feature_{index}", "-"
+
+
+def actions_to_weights(actions: np.ndarray, n_assets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map raw policy outputs to (weights, cash) rows.
+
+    Outputs with `n_assets + 1` columns carry cash in the last column. Outputs
+    that are not already a simplex are passed through a softmax.
+    """
+    actions = np.asarray(actions, dtype=np.float64)
+    if actions.ndim == 1:
+        actions = actions.reshape(1, -1)
+    if actions.shape[1] not in (n_assets, n_assets + 1):
+        raise ValueError(f"정책 출력 차원이 맞지 않습니다: {actions.shape[1]} (자산 {n_assets}개)")
+
+    is_simplex = (actions >= 0).all(axis=1) & np.isclose(actions.sum(axis=1), 1.0, atol=1e-3)
+    shifted = np.exp(actions - actions.max(axis=1, keepdims=True))
+    softmax = shifted / shifted.sum(axis=1, keepdims=True)
+    weights = np.where(is_simplex[:, None], actions, softmax)
+    if weights.shape[1] == n_assets + 1:
+        return weights[:, :n_assets], weights[:, n_assets]
+    return weights, np.zeros(weights.shape[0])
+
+
+class TorchPolicy:
+    """
+    TorchScript export of the IRT actor, run on CPU in inference mode.
+
+    `irt_final.zip` may itself be a TorchScript archive, or a zip holding one
+    of `SCRIPTED_MEMBERS`; otherwise one of `SCRIPTED_MEMBERS` next to it
+    (as written by `export_sb3_policy`) is used.
+    """
+
+    def __init__(self, path: Path, num_threads: int = 0) -> None:
+        try:
+            import torch
+        except ImportError as exc:
+            raise PolicyUnavailable("torch가 설치되어 있지 않습니다.") from exc
+
+        self.path = Path(path)
+        self._torch = torch
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        self.module = self._load(torch)
+        self.module.eval()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rows = 0
+
+    def _load(self, torch: Any) -> Any:
+        if not self.path.is_file():
+            raise PolicyUnavailable(f"정책 체크포인트를 찾을 수 없습니다: {self.path}")
+        try:
+            return torch.jit.load(str(self.path), map_location="cpu")
+        except Exception:
+            pass
+        names: set = set()
+        try:
+            with zipfile.ZipFile(self.path) as archive:
+                names = set(archive.namelist())
+                for member in SCRIPTED_MEMBERS:
+                    if member in names:
+                        with archive.open(member) as fp:
+                            return torch.jit.load(io.BytesIO(fp.read()), map_location="cpu")
+        except zipfile.BadZipFile:
+            pass
+        for member in SCRIPTED_MEMBERS:
+            exported = self.path.with_name(member)
+            if exported.is_file():
+                return torch.jit.load(str(exported), map_location="cpu")
+        if SB3_POLICY_MEMBER in names:
+            raise PolicyUnavailable(
+                f"Stable-Baselines3 체크포인트입니다. TorchScript로 내보낸 뒤 다시 시도하세요: "
+                f"python -m finflow.policy {self.path.parent}"
+            )
+        raise PolicyUnavailable(
+            f"TorchScript 정책을 찾을 수 없습니다: {self.path} ({', '.join(SCRIPTED_MEMBERS)})"
+        )
+
+    def __call__(self, observations: np.ndarray) -> np.ndarray:
+        torch = self._torch
+        batch = torch.from_numpy(np.ascontiguousarray(observations, dtype=np.float32))
+        # A TorchScript module is not re-entrant across threads for stateful submodules.
+        with self._lock, torch.inference_mode():
+            output = self.module(batch)
+            if isinstance(output, (tuple, list)):
+                output = output[0]
+            actions = output.detach().cpu().numpy()
+            self.calls += 1
+            self.rows += int(batch.shape[0])
+        return actions
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "threads": self._torch.get_num_threads(),
+            "forward_calls": self.calls,
+            "rows": self.rows,
+            "mean_batch": (self.rows / self.calls) if self.calls else 0.0,
+        }
+
+
+
+def export_sb3_policy(checkpoint: Path, obs_dim: int, out_path: Optional[Path] = None) -> Path:
+    """
+    Trace the deterministic actor of a Stable-Baselines3 checkpoint to TorchScript.
+
+    The policy class pickled in the checkpoint must be importable (the training
+    package installed), since SB3 stores only its state_dict. The traced module
+    maps (batch, obs_dim) observations to actions rescaled to the action space,
+    as `BaseAlgorithm.predict(obs, deterministic=True)` does.
+    """
+    import torch
+    from stable_baselines3.common.save_util import load_from_zip_file
+
+    checkpoint = Path(checkpoint)
+    out_path = Path(out_path) if out_path is not None else checkpoint.with_name(SCRIPTED_MEMBERS[0])
+    data, params, _ = load_from_zip_file(checkpoint, device="cpu")
+    if not data or "policy_class" not in data or "policy" not in (params or {}):
+        raise ValueError(f"Stable-Baselines3 정책을 찾을 수 없습니다: {checkpoint}")
+
+    policy = data["policy_class"](
+        data["observation_space"],
+        data["action_space"],
+        lambda _: 0.0,
+        **data.get("policy_kwargs", {}),
+    )
+    policy.load_state_dict(params["policy"])
+    policy.set_training_mode(False)
+
+    class DeterministicActor(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.policy = policy
+            space = data["action_space"]
+            self.register_buffer("low", torch.as_tensor(space.low, dtype=torch.float32))
+            self.register_buffer("high", torch.as_tensor(space.high, dtype=torch.float32))
+
+        def forward(self, obs: Any) -> Any:
+            actions = self.policy._predict(obs, deterministic=True)
+            if self.policy.squash_output:
+                return self.low + 0.5 * (actions + 1.0) * (self.high - self.low)
+            return torch.maximum(torch.minimum(actions, self.high), self.low)
+
+    actor = DeterministicActor().eval()
+    example = torch.zeros((2, int(obs_dim)), dtype=torch.float32)
+    with torch.inference_mode():
+        traced = torch.jit.trace(actor, example)
+        probe = torch.randn((8, int(obs_dim)), dtype=torch.float32)
+        if not torch.allclose(traced(probe), actor(probe), atol=1e-5):
+            raise ValueError(f"TorchScript 변환 결과가 원본 정책과 다릅니다: {checkpoint}")
+    torch.jit.save(traced, str(out_path))
+    return out_path
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("사용법: python -m finflow.policy <번들 디렉터리 또는 irt_final.zip> ...")
+        return 2
+    for arg in args:
+        path = Path(arg)
+        checkpoint = path / "irt_final.zip" if path.is_dir() else path
+        obs_dim = load_env_meta(checkpoint.parent).get("obs_dim")
+        if not obs_dim:
+            print(f"env_meta.json에 obs_dim이 없습니다: {checkpoint.parent}")
+            return 1
+        out_path = export_sb3_policy(checkpoint, int(obs_dim))
+        print(f"TorchScript 정책 생성: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+"""
+Persistent per-ticker OHLCV store.
+
+Each ticker lives in its own directory holding two memory-mappable NumPy
+columns (`dates.npy` as datetime64[D], `ohlcv.npy` as float64 rows) and a
+`meta.json` listing the calendar ranges already fetched. `CachedPriceProvider`
+wraps any `PriceProvider` so a request only goes upstream for the parts of
+its range the store has not covered yet; everything else is served from
+disk, including after a process restart.
+
+Upstream prices are split/dividend adjusted as of the day they are fetched,
+so every gap is fetched together with the stored bar on each side of it. If
+those bars no longer match what was stored, the adjustment basis has moved
+(a new split or dividend) and the whole ticker is fetched again instead of
+stitching two bases together. The same neighbouring bars prove when an
+empty answer really was a non-trading stretch: coverage is only recorded up
+to the last date the upstream is known to have answered for.
+
+Today's bar keeps moving until the close, so it is never written to disk.
+The upstream answer for the open end of a range (today's bar and the days
+after the last proven one) is kept in memory for `edge_ttl` seconds instead,
+so repeated requests that end today are still served from the store.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finflow.prices import (
+    OHLCV_COLUMNS,
+    PriceProvider,
+    empty_ohlcv,
+    normalize_ohlcv,
+    period_to_start,
+)
+
+DateRange = Tuple[pd.Timestamp, pd.Timestamp]
+
+EARLIEST_DATE = pd.Timestamp("1970-01-01")
+ONE_DAY = pd.Timedelta(days=1)
+# Relative close difference on a re-fetched bar that means the adjustment basis changed.
+ADJUSTMENT_TOLERANCE = 1e-4
+# Seconds an upstream answer for the open end of a range is reused.
+EDGE_TTL = 60.0
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._=^-]")
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.today().normalize()
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Sort and merge overlapping or adjacent inclusive date ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def within_ranges(index: pd.DatetimeIndex, ranges: List[DateRange]) -> np.ndarray:
+    """Boolean mask of the `index` dates inside any of the inclusive `ranges`."""
+    mask = np.zeros(len(index), dtype=bool)
+    for start, end in ranges:
+        mask |= (index >= start) & (index <= end)
+    return mask
+
+
+def missing_ranges(coverage: List[DateRange], start: pd.Timestamp, end: pd.Timestamp) -> List[DateRange]:
+    """Parts of the inclusive range [start, end] that `coverage` does not contain."""
+    gaps: List[DateRange] = []
+    cursor = start
+    for cov_start, cov_end in merge_ranges(coverage):
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start - ONE_DAY))
+        cursor = max(cursor, cov_end + ONE_DAY)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceStore:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        return self.root / _UNSAFE_CHARS.sub("_", ticker)
+
+    def read(self, ticker: str) -> Tuple[pd.DataFrame, List[DateRange]]:
+        directory = self._ticker_dir(ticker)
+        meta_path = directory / "meta.json"
+        if not meta_path.exists():
+            return empty_ohlcv(), []
+        try:
+            with meta_path.open("r", encoding="utf-8") as fp:
+                meta = json.load(fp)
+            dates = np.load(directory / "dates.npy", mmap_mode="r")
+            values = np.load(directory / "ohlcv.npy", mmap_mode="r")
+        except Exception as exc:
+            print(f"가격 저장소를 읽을 수 없습니다 ({ticker}): {exc}")
+            return empty_ohlcv(), []
+
+        # A crash between column writes leaves lengths out of sync with the meta.
+        rows = int(meta.get("rows", -1))
+        if dates.shape[0] != rows or values.shape != (rows, len(OHLCV_COLUMNS)):
+            return empty_ohlcv(), []
+
+        frame = pd.DataFrame(
+            np.asarray(values),
+            index=pd.DatetimeIndex(np.asarray(dates).astype("datetime64[ns]"), name="Date"),
+            columns=OHLCV_COLUMNS,
+        )
+        coverage = [
+            (pd.Timestamp(start), pd.Timestamp(end)) for start, end in meta.get("coverage", [])
+        ]
+        return frame, coverage
+
+    def write(self, ticker: str, frame: pd.DataFrame, coverage: List[DateRange]) -> None:
+        directory = self._ticker_dir(ticker)
+        directory.mkdir(parents=True, exist_ok=True)
+        frame = normalize_ohlcv(frame)
+        columns = {
+            "dates.npy": frame.index.values.astype("datetime64[D]"),
+            "ohlcv.npy": frame.to_numpy(dtype=np.float64),
+        }
+        for name, array in columns.items():
+            tmp_path = directory / f".{name}.tmp"
+            with tmp_path.open("wb") as fp:
+                np.save(fp, array)
+            os.replace(tmp_path, directory / name)
+
+        meta = {
+            "ticker": ticker,
+            "rows": int(frame.shape[0]),
+            "coverage": [
+                [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+                for start, end in merge_ranges(coverage)
+            ],
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        tmp_meta = directory / ".meta.json.tmp"
+        with tmp_meta.open("w", encoding="utf-8") as fp:
+            json.dump(meta, fp)
+        os.replace(tmp_meta, directory / "meta.json")
+
+    def tickers(self) -> List[str]:
+        return sorted(
+            path.parent.name for path in self.root.glob("*/meta.json")
+        )
+
+
+class CachedPriceProvider(PriceProvider):
+    """`PriceProvider` that serves covered ranges from a `PriceStore`."""
+
+    def __init__(self, upstream: PriceProvider, store: PriceStore, edge_ttl: float = EDGE_TTL) -> None:
+        self.upstream = upstream
+        self.store = store
+        self.name = f"{upstream.name}+store"
+        self.edge_ttl = float(edge_ttl)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # ticker -> (day, fetched at, [first unproven date, last date asked], bars dated that day)
+        self._edges: Dict[str, Tuple[pd.Timestamp, float, DateRange, pd.DataFrame]] = {}
+        self._stats_lock = threading.Lock()
+        self.disk_hits = 0
+        self.upstream_fetches = 0
+        self.refetches = 0
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(ticker)
+            if lock is None:
+                lock = self._locks[ticker] = threading.Lock()
+            return lock
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def _requested_range(
+        start: Optional[str], end: Optional[str], period: Optional[str], today: pd.Timestamp
+    ) -> DateRange:
+        if period:
+            lower = period_to_start(period, today)
+            return (lower.normalize() + ONE_DAY if lower is not None else EARLIEST_DATE, today)
+        lower = pd.Timestamp(start).normalize() if start else EARLIEST_DATE
+        # `end` is exclusive, matching yfinance.
+        upper = pd.Timestamp(end).normalize() - ONE_DAY if end else today
+        return lower, min(upper, today)
+
+    def _edge(self, ticker: str, today: pd.Timestamp) -> Optional[Tuple[DateRange, pd.DataFrame]]:
+        edge = self._edges.get(ticker)
+        if edge is None or edge[0] != today or time.monotonic() - edge[1] > self.edge_ttl:
+            return None
+        return edge[2], edge[3]
+
+    def history(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        today = _today()
+        lower, upper = self._requested_range(start, end, period, today)
+        if lower > upper:
+            return empty_ohlcv()
+
+        with self._ticker_lock(ticker):
+            frame, coverage = self.store.read(ticker)
+            gaps = missing_ranges(coverage, lower, upper)
+            edge = self._edge(ticker, today)
+            if edge is not None:
+                # The open end was asked for moments ago; what it lacks is not there yet.
+                (edge_start, edge_end), _ = edge
+                gaps = [gap for gap in gaps if gap[0] < edge_start or gap[1] > edge_end]
+            if not gaps:
+                self._count("disk_hits")
+            else:
+                frame, coverage, changed = self._fill_gaps(ticker, frame, coverage, gaps, today)
+                if changed:
+                    self.store.write(ticker, frame, coverage)
+                edge = self._edge(ticker, today)
+
+        # Stores written before today's bar was kept off disk may still hold one.
+        frame = frame.loc[(frame.index >= lower) & (frame.index <= upper) & (frame.index < today)]
+        if upper >= today and edge is not None and not edge[1].empty:
+            frame = pd.concat([frame, edge[1]])
+        return frame
+
+    def _fetch(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """Upstream bars of the inclusive range, or None when the upstream failed."""
+        self._count("upstream_fetches")
+        try:
+            part = self.upstream.history(
+                ticker,
+                start=start.strftime("%Y-%m-%d"),
+                end=(end + ONE_DAY).strftime("%Y-%m-%d"),
+            )
+        except Exception:
+            return None
+        return normalize_ohlcv(part)
+
+    @staticmethod
+    def _same_basis(stored: pd.DataFrame, fetched: pd.DataFrame) -> bool:
+        """Whether `fetched` repeats the closes of `stored` (covered, final bars only)."""
+        dates = stored.index.intersection(fetched.index)
+        if dates.empty:
+            return True
+        old = stored.loc[dates, "Close"].to_numpy(dtype=np.float64)
+        new = fetched.loc[dates, "Close"].to_numpy(dtype=np.float64)
+        return bool(np.allclose(new, old, rtol=ADJUSTMENT_TOLERANCE, atol=0.0, equal_nan=True))
+
+    @staticmethod
+    def _covered_range(
+        part: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp, today: pd.Timestamp
+    ) -> Optional[DateRange]:
+        """
+        The part of [start, end] that `part` proves complete: all of it when the
+        upstream also returned a later bar, otherwise up to its last bar inside.
+        Today's bar is still moving, so it is never covered.
+        """
+        if (part.index > end).any():
+            proven = end
+        else:
+            inside = part.index[(part.index >= start) & (part.index <= end)]
+            if inside.empty:
+                return None
+            proven = inside[-1]
+        proven = min(proven, today - ONE_DAY)
+        return (start, proven) if proven >= start else None
+
+    def _keep(
+        self,
+        ticker: str,
+        part: pd.DataFrame,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        today: pd.Timestamp,
+    ) -> Tuple[pd.DataFrame, Optional[DateRange]]:
+        """
+        Bars of [start, end] to store and the range they prove. When that range
+        stops short of `end`, the rest and today's bar are remembered as the edge.
+        """
+        inside = part.loc[(part.index >= start) & (part.index <= end)]
+        span = self._covered_range(part, start, end, today)
+        if span is None or span[1] < end:
+            unproven = span[1] + ONE_DAY if span is not None else start
+            live = inside.loc[inside.index >= today]
+            self._edges[ticker] = (today, time.monotonic(), (unproven, end), live)
+        return inside.loc[inside.index < today], span
+
+    def _fill_gaps(
+        self,
+        ticker: str,
+        frame: pd.DataFrame,
+        coverage: List[DateRange],
+        gaps: List[DateRange],
+        today: pd.Timestamp,
+    ) -> Tuple[pd.DataFrame, List[DateRange], bool]:
+        stored = frame.index
+        final = frame.loc[within_ranges(stored, coverage)]
+        fetched: List[pd.DataFrame] = []
+        covered: List[DateRange] = []
+        for gap_start, gap_end in gaps:
+            # Reach one stored bar either side of the gap (see module docstring).
+            before = stored[stored < gap_start]
+            after = stored[stored > gap_end]
+            part = self._fetch(
+                ticker,
+                before[-1] if not before.empty else gap_start,
+                after[0] if not after.empty else gap_end,
+            )
+            if part is None:
+                continue
+            if not self._same_basis(final, part):
+                return self._refetch(ticker, frame, coverage, gaps, today)
+            bars, span = self._keep(ticker, part, gap_start, gap_end, today)
+            fetched.append(bars)
+            if span is not None:
+                covered.append(span)
+
+        fetched = [part for part in fetched if not part.empty]
+        if not fetched and not covered:
+            return frame, coverage, False
+        if fetched:
+            frame = normalize_ohlcv(pd.concat([frame, *fetched]))
+        return frame, merge_ranges(coverage + covered), True
+
+    def _refetch(
+        self,
+        ticker: str,
+        frame: pd.DataFrame,
+        coverage: List[DateRange],
+        gaps: List[DateRange],
+        today: pd.Timestamp,
+    ) -> Tuple[pd.DataFrame, List[DateRange], bool]:
+        """Replace everything stored for `ticker` with one fetch on the current adjustment basis."""
+        self._count("refetches")
+        ranges = merge_ranges(coverage + gaps)
+        start, end = ranges[0][0], ranges[-1][1]
+        print(f"{ticker}: 수정주가 기준이 바뀌어 {start.date()}~{end.date()} 구간을 다시 받습니다.")
+        part = self._fetch(ticker, start, end)
+        if part is None or part.empty:
+            # Keep serving the old basis rather than nothing; the gaps stay open.
+            return frame, coverage, False
+        bars, span = self._keep(ticker, part, start, end, today)
+        return bars, [span] if span is not None else [], True
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                "disk_hits": self.disk_hits,
+                "upstream_fetches": self.upstream_fetches,
+                "refetches": self.refetches,
+            }
@@ -0,0 +1,400 @@
+"""
+Price-fetch layer for the FinFlow inference server.
+
+Providers return daily OHLCV frames for one ticker at a time. `PriceFetcher`
+fans ticker requests out over a bounded thread pool and merges identical
+in-flight requests, so concurrent handlers asking for the same
+(ticker, range) share a single upstream round trip.
+"""
+
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+RangeKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+# Array column order of each known `portfolio_data_*` export, keyed by the
+# (alphabetical) ticker list in its filename. The arrays are not stored in
+# filename order, so a bundle whose key is not listed here is rejected.
+_TEN_ASSET_ORDER = ("AAPL", "MSFT", "AMZN", "GOOGL", "{fifth}", "TSLA", "JPM", "JNJ", "PG", "V")
+PORTFOLIO_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {
+    tuple(sorted(order)): order
+    for order in (
+        tuple(ticker.format(fifth=fifth) for ticker in _TEN_ASSET_ORDER) for fifth in ("AMD", "NVDA")
+    )
+}
+# The 2019/2020 four-ticker exports hold the full ten-asset AMD universe.
+PORTFOLIO_LAYOUTS[("AAPL", "AMZN", "GOOGL", "MSFT")] = tuple(
+    ticker.format(fifth="AMD") for ticker in _TEN_ASSET_ORDER
+)
+# Two bundles' closes for one ticker may differ by a dividend-adjustment factor,
+# but that factor must be (nearly) constant over the dates they share.
+MAX_ADJUSTMENT_DRIFT = 0.02
+
+
+def period_to_start(period: str, end: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """Translate a yfinance-style period ("5d", "6mo", "1y", "ytd", "max")."""
+    period = (period or "").strip().lower()
+    if period in {"", "max"}:
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"지원하지 않는 기간 형식입니다: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return end - pd.Timedelta(days=count)
+    if unit == "wk":
+        return end - pd.Timedelta(weeks=count)
+    if unit == "mo":
+        return end - pd.DateOffset(months=count)
+    return end - pd.DateOffset(years=count)
+
+
+def empty_ohlcv() -> pd.DataFrame:
+    return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name="Date"), dtype=np.float64)
+
+
+def normalize_ohlcv(frame: pd.DataFrame) -> pd.DataFrame:
+    """Return a tz-naive, date-sorted frame restricted to the OHLCV columns."""
+    if frame is None or frame.empty:
+        return empty_ohlcv()
+    frame = frame.copy()
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame.columns = frame.columns.get_level_values(0)
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize()
+    frame.index.name = "Date"
+    for column in OHLCV_COLUMNS:
+        if column not in frame:
+            frame[column] = frame["Close"] if column != "Volume" and "Close" in frame else np.nan
+    frame = frame[OHLCV_COLUMNS].astype(np.float64)
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame
+
+
+class PriceProvider:
+    """Source of daily OHLCV history for a single ticker."""
+
+    name = "base"
+
+    def history(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceProvider(PriceProvider):
+    """Live Yahoo Finance provider; each worker thread gets its own HTTP session."""
+
+    name = "yfinance"
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None) -> None:
+        self.session_factory = session_factory
+        self._local = threading.local()
+
+    def _session(self) -> Any:
+        if self.session_factory is None:
+            return None
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.session_factory()
+            self._local.session = session
+        return session
+
+    def history(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        import yfinance as yf
+
+        session = self._session()
+        ticker_obj = yf.Ticker(ticker, session=session) if session else yf.Ticker(ticker)
+        history = (
+            ticker_obj.history(period=period)
+            if period
+            else ticker_obj.history(start=start, end=end)
+        )
+        if history.empty or "Close" not in history:
+            return empty_ohlcv()
+        return normalize_ohlcv(history)
+
+    def download(
+        self,
+        tickers: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Bulk fallback used when every per-ticker request failed."""
+        import yfinance as yf
+
+        data = (
+            yf.download(tickers, period=period, progress=False)
+            if period
+            else yf.download(tickers, start=start, end=end, progress=False)
+        )
+        if data.empty:
+            return pd.DataFrame()
+
+        if isinstance(data.columns, pd.MultiIndex):
+            close = data["Close"].copy()
+        else:
+            close = data["Close"].to_frame()
+            close.columns = tickers
+        close = close.dropna()
+        if not close.empty:
+            try:
+                close.index = close.index.tz_localize(None)
+            except TypeError:
+                pass
+        return close
+
+
+class PickleBundleProvider(PriceProvider):
+    """
+    Offline provider backed by the `scripts/data/*.pkl` bundles.
+
+    Two layouts are understood:
+    - `portfolio_data_<T1>_..._<Tn>_<start>_<end>.pkl`: a `(array, DatetimeIndex)`
+      tuple where `array` is (dates × tickers × features) and the first five
+      features are Open/High/Low/Close/Volume.
+    - `benchmark_data_<A>-<B>_<start>_<end>.pkl`: a `{ticker: close Series}` dict.
+
+    Portfolio arrays are not stored in filename order; their column order comes
+    from `PORTFOLIO_LAYOUTS`, and a bundle with an unknown layout is skipped.
+    Bundles are merged per ticker onto the one that reaches the latest date.
+    Every other bundle must agree with it on the shared dates up to a constant
+    adjustment factor (it is then rescaled by that factor to fill the dates
+    the reference lacks); a bundle that disagrees is dropped for that ticker.
+    """
+
+    name = "offline"
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        self._frames: Optional[Dict[str, pd.DataFrame]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        if self._frames is None:
+            with self._lock:
+                if self._frames is None:
+                    self._frames = self._load_bundles()
+        return self._frames
+
+    @property
+    def tickers(self) -> List[str]:
+        return sorted(self.frames)
+
+    def _load_bundles(self) -> Dict[str, pd.DataFrame]:
+        collected: Dict[str, List[pd.DataFrame]] = {}
+        for path in sorted(self.data_dir.glob("*.pkl")):
+            try:
+                payload = pd.read_pickle(path)
+            except Exception as exc:
+                print(f"오프라인 가격 번들을 읽을 수 없습니다: {path.name} ({exc})")
+                continue
+            for ticker, frame in self._parse_bundle(path.stem, payload).items():
+                collected.setdefault(ticker, []).append(frame)
+
+        return {ticker: self._merge(ticker, parts) for ticker, parts in collected.items()}
+
+    @staticmethod
+    def _merge(ticker: str, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        parts = sorted(parts, key=lambda frame: (frame.index[-1], len(frame)), reverse=True)
+        merged = parts[0]
+        for part in parts[1:]:
+            shared = merged.index.intersection(part.index)
+            if shared.empty:
+                merged = pd.concat([merged, part]).sort_index()
+                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = (merged.loc[shared, "Close"] / part.loc[shared, "Close"]).to_numpy()
+            ratio = ratio[np.isfinite(ratio) & (ratio > 0)]
+            factor = float(np.median(ratio)) if ratio.size else np.nan
+            if not ratio.size or np.abs(ratio / factor - 1.0).max() > MAX_ADJUSTMENT_DRIFT:
+                print(f"오프라인 가격 번들 간 {ticker} 시세가 일치하지 않아 일부 번들을 제외합니다.")
+                continue
+            extra = part.loc[part.index.difference(merged.index)].copy()
+            extra[["Open", "High", "Low", "Close"]] *= factor
+            merged = pd.concat([merged, extra]).sort_index()
+        return merged
+
+    @staticmethod
+    def _parse_bundle(stem: str, payload: Any) -> Dict[str, pd.DataFrame]:
+        # Filenames end with "_<start>_<end>", the ticker list precedes them.
+        parts = stem.split("_")
+        if len(parts) < 5:
+            return {}
+        head = parts[:-2]
+
+        if isinstance(payload, dict):
+            result: Dict[str, pd.DataFrame] = {}
+            for ticker, series in payload.items():
+                if isinstance(series, pd.Series) and not series.empty:
+                    result[str(ticker)] = normalize_ohlcv(series.rename("Close").to_frame())
+            return result
+
+        if isinstance(payload, tuple) and len(payload) == 2 and head[:2] == ["portfolio", "data"]:
+            values, index = payload
+            values = np.asarray(values)
+            tickers = PORTFOLIO_LAYOUTS.get(tuple(sorted(head[2:])))
+            if tickers is None or values.ndim != 3 or values.shape[1] != len(tickers) or values.shape[2] < 5:
+                print(f"열 구성을 확인할 수 없는 오프라인 가격 번들을 건너뜁니다: {stem}")
+                return {}
+            dates = pd.DatetimeIndex(index)
+            return {
+                ticker: normalize_ohlcv(
+                    pd.DataFrame(values[:, pos, :5], index=dates, columns=OHLCV_COLUMNS)
+                )
+                for pos, ticker in enumerate(tickers)
+            }
+        return {}
+
+    def history(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        frame = self.frames.get(ticker)
+        if frame is None or frame.empty:
+            return empty_ohlcv()
+        if period:
+            lower = period_to_start(period, frame.index[-1])
+            return frame if lower is None else frame[frame.index > lower]
+        if start:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end:
+            # yfinance treats `end` as exclusive.
+            frame = frame[frame.index < pd.Timestamp(end)]
+        return frame
+
+
+class PriceFetcher:
+    """Concurrent, de-duplicating front end over a `PriceProvider`."""
+
+    def __init__(self, provider: PriceProvider, max_workers: int = 8) -> None:
+        self.provider = provider
+        self.max_workers = max(int(max_workers), 1)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="price-fetch"
+        )
+        self._inflight: Dict[RangeKey, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def _load(self, key: RangeKey) -> pd.DataFrame:
+        ticker, start, end, period = key
+        try:
+            return self.provider.history(ticker, start=start, end=end, period=period)
+        except Exception:
+            return empty_ohlcv()
+
+    def _release(self, key: RangeKey, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def submit(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> Future:
+        key: RangeKey = (ticker, None, None, period) if period else (ticker, start, end, None)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._pool.submit(self._load, key)
+            self._inflight[key] = future
+        future.add_done_callback(lambda done, key=key: self._release(key, done))
+        return future
+
+    def history_many(
+        self,
+        tickers: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        futures = {
+            ticker: self.submit(ticker, start=start, end=end, period=period)
+            for ticker in dict.fromkeys(tickers)
+        }
+        return {ticker: future.result() for ticker, future in futures.items()}
+
+    def fetch_close(
+        self,
+        tickers: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Close prices for `tickers` as one frame (rows with gaps dropped)."""
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        tickers = [t for t in tickers if t]
+        if not tickers:
+            return pd.DataFrame()
+
+        histories = self.history_many(tickers, start=start, end=end, period=period)
+        frames = {
+            ticker: history["Close"]
+            for ticker, history in histories.items()
+            if not history.empty
+        }
+        if frames:
+            close = pd.DataFrame(frames).dropna()
+            if not close.empty:
+                return close
+
+        download = getattr(self.provider, "download", None)
+        if download is None:
+            return pd.DataFrame()
+        try:
+            return download(tickers, start=start, end=end, period=period)
+        except Exception:
+            return pd.DataFrame()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._inflight)
+        stats: Dict[str, Any] = {
+            "provider": self.provider.name,
+            "workers": self.max_workers,
+            "inflight": inflight,
+            "coalesced": self.coalesced,
+        }
+        provider_stats = getattr(self.provider, "stats", None)
+        if callable(provider_stats):
+            stats.update(provider_stats())
+        return stats
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
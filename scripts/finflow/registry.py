@@ -0,0 +1,170 @@
+"""
+Registry of IRT model bundles under `irt_assets/`.
+
+Every sub-directory accepted by `is_bundle` is a bundle, identified by its
+directory name (the training run timestamp). Bundles are loaded lazily on
+first use, one loader per bundle at a time. The default bundle is swapped by
+replacing a single reference, so requests already holding the previous
+service finish on it. When more than `max_loaded` bundles are resident, or
+the process RSS exceeds `max_rss_mb`, the least recently used non-default
+bundles are dropped: their `close()` is called, if they have one, and memory
+is collected outside the registry lock so other lookups are not held up.
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class UnknownBundleError(KeyError):
+    """Raised when a bundle id does not match any directory in the registry."""
+
+
+def resident_memory_mb() -> Optional[float]:
+    """Current RSS of this process in MB, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fp:
+            pages = int(fp.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        root: Path,
+        loader: Callable[[Path], Any],
+        is_bundle: Callable[[Path], bool],
+        default_id: Optional[str] = None,
+        max_loaded: int = 2,
+        max_rss_mb: Optional[float] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.loader = loader
+        self.is_bundle = is_bundle
+        self.max_loaded = max(int(max_loaded), 1)
+        self.max_rss_mb = max_rss_mb
+        self._paths: Dict[str, Path] = {}
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+        available = self.discover()
+        if default_id is None:
+            if not available:
+                raise FileNotFoundError(f"모델 번들을 찾을 수 없습니다: {self.root}")
+            default_id = available[-1]
+        elif default_id not in self._paths:
+            raise UnknownBundleError(default_id)
+        self._default_id = default_id
+
+    @property
+    def default_id(self) -> str:
+        return self._default_id
+
+    def discover(self) -> List[str]:
+        """Rescan `root`; returns the sorted bundle ids (oldest run first)."""
+        found = {
+            path.name: path
+            for path in (sorted(self.root.iterdir()) if self.root.is_dir() else [])
+            if path.is_dir() and not path.name.startswith(".") and self.is_bundle(path)
+        }
+        with self._lock:
+            self._paths = found
+        return sorted(found)
+
+    def path(self, bundle_id: str) -> Path:
+        with self._lock:
+            path = self._paths.get(bundle_id)
+        if path is None:
+            self.discover()
+            with self._lock:
+                path = self._paths.get(bundle_id)
+        if path is None:
+            raise UnknownBundleError(bundle_id)
+        return path
+
+    def get(self, bundle_id: Optional[str] = None) -> Any:
+        """Service for `bundle_id` (default bundle when None), loading it if needed."""
+        bundle_id = bundle_id or self._default_id
+        service = self._get(bundle_id)
+        self._evict(keep=bundle_id)
+        return service
+
+    def peek(self, bundle_id: Optional[str] = None) -> Optional[Any]:
+        """Service for `bundle_id` if it is already loaded; never loads or reorders."""
+        with self._lock:
+            return self._loaded.get(bundle_id or self._default_id)
+
+    def _get(self, bundle_id: str) -> Any:
+        with self._lock:
+            service = self._loaded.get(bundle_id)
+            if service is not None:
+                self._loaded.move_to_end(bundle_id)
+                return service
+            load_lock = self._load_locks.setdefault(bundle_id, threading.Lock())
+
+        path = self.path(bundle_id)
+        with load_lock:
+            with self._lock:
+                service = self._loaded.get(bundle_id)
+            if service is not None:
+                return service
+            service = self.loader(path)
+            with self._lock:
+                self._loaded[bundle_id] = service
+                self.loads += 1
+        return service
+
+    def set_default(self, bundle_id: str) -> Any:
+        """Load `bundle_id` and make it the default; in-flight requests keep their service."""
+        service = self._get(bundle_id)
+        with self._lock:
+            self._default_id = bundle_id
+        self._evict(keep=bundle_id)
+        return service
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used bundles other than the default and `keep`."""
+        evicted = False
+        while True:
+            with self._lock:
+                candidates = [key for key in self._loaded if key not in (self._default_id, keep)]
+                if not candidates:
+                    break
+                over_count = len(self._loaded) > self.max_loaded
+                rss = resident_memory_mb() if self.max_rss_mb is not None and not over_count else None
+                if not over_count and (rss is None or rss <= self.max_rss_mb):
+                    break
+                service = self._loaded.pop(candidates[0])
+                self.evictions += 1
+            evicted = True
+            close = getattr(service, "close", None)
+            if close is not None:
+                close()
+            del service
+            if not over_count:
+                # Let the dropped arrays go before re-checking RSS.
+                gc.collect()
+        if evicted:
+            gc.collect()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rss = resident_memory_mb()
+            return {
+                "default": self._default_id,
+                "available": sorted(self._paths),
+                "loaded": list(self._loaded),
+                "max_loaded": self.max_loaded,
+                "max_rss_mb": self.max_rss_mb,
+                "rss_mb": round(rss, 1) if rss is not None else None,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
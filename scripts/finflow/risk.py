@@ -0,0 +1,244 @@
+"""
+Portfolio risk analytics for `/risk-metrics`.
+
+Every statistic works on plain float64 arrays of daily simple returns and
+costs a handful of numpy passes:
+
+- `value_at_risk`: historical VaR/CVaR from one sort plus a cumulative sum
+  (the tail mean of every confidence level is a prefix mean), and the
+  Gaussian (parametric) VaR/CVaR from the sample mean and deviation;
+- `rolling_ratios`: rolling Sharpe and Sortino from prefix sums of r, r² and
+  min(r, 0)², so each window is a difference of two rows;
+- `rolling_cvar`: historical CVaR over a sliding window (the training
+  reward's `adaptive_cvar_window`), one `np.partition` over a strided view;
+- `drawdown_stats`: drawdown curve, deepest drawdown with its peak, trough
+  and recovery, and the duration of every underwater episode via run labels;
+- `risk_contributions`: Euler decomposition of the portfolio volatility,
+  w_i (Σw)_i / σ_p, which sums to σ_p.
+
+Losses (VaR, CVaR, drawdowns) are reported as positive fractions;
+volatilities and ratios are annualised with `TRADING_DAYS`.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+TRADING_DAYS = 252
+DEFAULT_LEVELS = (0.95, 0.99)
+DEFAULT_WINDOW = 63
+DEFAULT_CVAR_WINDOW = 40
+
+
+def _tail_size(alpha: float, n: int) -> int:
+    # 0.05 * 40 is 2.0000000000000004 in floating point; do not round that up to 3.
+    return min(max(int(math.ceil(alpha * n - 1e-9)), 1), n)
+
+
+def daily_returns(growth: np.ndarray) -> np.ndarray:
+    """Simple returns of a growth curve that starts from 1.0 (the first day is vs. 1.0)."""
+    growth = np.asarray(growth, dtype=np.float64)
+    if growth.size == 0:
+        return growth
+    previous = np.concatenate(([1.0], growth[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(previous > 0, growth / previous - 1.0, 0.0)
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def value_at_risk(returns: np.ndarray, levels: Sequence[float] = DEFAULT_LEVELS) -> List[Dict[str, float]]:
+    """One-day historical and parametric VaR/CVaR at each confidence level."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.size == 0:
+        return []
+    ordered = np.sort(returns)
+    tail_sums = np.cumsum(ordered)
+    mean = float(returns.mean())
+    std = float(returns.std(ddof=1)) if returns.size > 1 else 0.0
+    normal = NormalDist()
+
+    estimates: List[Dict[str, float]] = []
+    for level in levels:
+        alpha = 1.0 - float(level)
+        # The worst ceil(alpha · n) days form the tail; VaR is its best day.
+        count = _tail_size(alpha, returns.size)
+        z = normal.inv_cdf(alpha)
+        estimates.append(
+            {
+                "level": float(level),
+                "historical_var": float(-ordered[count - 1]),
+                "historical_cvar": float(-tail_sums[count - 1] / count),
+                "parametric_var": -(mean + std * z),
+                "parametric_cvar": -(mean - std * normal.pdf(z) / alpha),
+            }
+        )
+    return estimates
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    return prefix[window:] - prefix[:-window]
+
+
+def rolling_ratios(returns: np.ndarray, window: int = DEFAULT_WINDOW, risk_free: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Annualised rolling Sharpe and Sortino ratios, one value per full window
+    (aligned to the window's last day). `risk_free` is an annual rate.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    window = int(window)
+    if window < 2 or returns.size < window:
+        empty = np.zeros(0, dtype=np.float64)
+        return {"sharpe": empty, "sortino": empty}
+    excess = returns - risk_free / TRADING_DAYS
+    sums = _window_sums(excess, window)
+    squares = _window_sums(excess * excess, window)
+    downside = _window_sums(np.minimum(excess, 0.0) ** 2, window)
+    mean = sums / window
+    variance = np.clip((squares - sums * mean) / (window - 1), 0.0, None)
+    downside_dev = np.sqrt(downside / window)
+    scale = math.sqrt(TRADING_DAYS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(variance > 1e-18, mean / np.sqrt(variance) * scale, 0.0)
+        sortino = np.where(downside_dev > 1e-9, mean / downside_dev * scale, 0.0)
+    return {"sharpe": sharpe, "sortino": sortino}
+
+
+def rolling_cvar(returns: np.ndarray, window: int = DEFAULT_CVAR_WINDOW, level: float = 0.95) -> np.ndarray:
+    """Historical CVaR of each trailing `window` days (aligned to the window's last day)."""
+    returns = np.asarray(returns, dtype=np.float64)
+    window = int(window)
+    if window < 1 or returns.size < window:
+        return np.zeros(0, dtype=np.float64)
+    count = _tail_size(1.0 - level, window)
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window)
+    tail = np.partition(windows, count - 1, axis=1)[:, :count]
+    return -tail.mean(axis=1)
+
+
+def drawdown_stats(growth: np.ndarray) -> Dict[str, Any]:
+    """
+    Drawdowns of a growth curve. Positions (`peak`, `trough`, `recovery`) index
+    `growth`; `recovery` is None while the deepest drawdown is still open.
+    Durations count the days spent below the previous peak.
+    """
+    growth = np.asarray(growth, dtype=np.float64)
+    if growth.size == 0:
+        return {
+            "drawdown": growth,
+            "max_drawdown": 0.0,
+            "peak": None,
+            "trough": None,
+            "recovery": None,
+            "max_duration": 0,
+            "current_duration": 0,
+            "episodes": 0,
+        }
+    peaks = np.maximum.accumulate(np.concatenate(([1.0], growth)))[1:]
+    drawdown = 1.0 - growth / peaks
+    underwater = drawdown > 1e-12
+
+    # Label every underwater run 1, 2, ...; dry days get 0.
+    starts = underwater & ~np.concatenate(([False], underwater[:-1]))
+    labels = np.cumsum(starts) * underwater
+    durations = np.bincount(labels)[1:]
+
+    trough = int(np.argmax(drawdown))
+    max_drawdown = float(drawdown[trough])
+    peak = recovery = None
+    if max_drawdown > 0:
+        run = labels[trough]
+        first = int(np.argmax(labels == run))
+        peak = first - 1 if first > 0 else None
+        after = np.flatnonzero(~underwater[trough:])
+        recovery = trough + int(after[0]) if after.size else None
+    return {
+        "drawdown": drawdown,
+        "max_drawdown": max_drawdown,
+        "peak": peak,
+        "trough": trough if max_drawdown > 0 else None,
+        "recovery": recovery,
+        "max_duration": int(durations.max()) if durations.size else 0,
+        "current_duration": int(durations[-1]) if underwater[-1] else 0,
+        "episodes": int(durations.size),
+    }
+
+
+def risk_contributions(asset_returns: np.ndarray, weights: np.ndarray) -> Dict[str, Any]:
+    """
+    Annualised portfolio volatility of `weights` over the (days × assets)
+    returns and each asset's share of it. Columns with missing data are held
+    at zero weight, like cash; `priced` marks the columns that were used.
+    """
+    asset_returns = np.asarray(asset_returns, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    valid = np.isfinite(asset_returns).all(axis=0)
+    weights = np.where(valid, weights, 0.0)
+    n_assets = weights.size
+    if asset_returns.shape[0] < 2 or not valid.any():
+        zeros = np.zeros(n_assets)
+        return {"volatility": 0.0, "marginal": zeros, "contribution": zeros, "share": zeros, "priced": valid}
+    returns = np.where(valid, asset_returns, 0.0)
+    centered = returns - returns.mean(axis=0)
+    covariance = centered.T @ centered / (returns.shape[0] - 1) * TRADING_DAYS
+    exposure = covariance @ weights
+    volatility = math.sqrt(max(float(weights @ exposure), 0.0))
+    if volatility <= 0:
+        zeros = np.zeros(n_assets)
+        return {"volatility": 0.0, "marginal": zeros, "contribution": zeros, "share": zeros, "priced": valid}
+    marginal = exposure / volatility
+    contribution = weights * marginal
+    return {
+        "volatility": volatility,
+        "marginal": marginal,
+        "contribution": contribution,
+        "share": contribution / volatility,
+        "priced": valid,
+    }
+
+
+def summary_stats(returns: np.ndarray, risk_free: float = 0.0) -> Dict[str, float]:
+    """Whole-window annualised return, volatility, Sharpe and Sortino."""
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.size < 2:
+        return {"annual_return": 0.0, "volatility": 0.0, "sharpe_ratio": 0.0, "sortino_ratio": 0.0}
+    growth = float(np.prod(1.0 + returns))
+    annual_return = growth ** (TRADING_DAYS / returns.size) - 1.0 if growth > 0 else -1.0
+    excess = returns - risk_free / TRADING_DAYS
+    std = float(returns.std(ddof=1))
+    downside = math.sqrt(float(np.mean(np.minimum(excess, 0.0) ** 2)))
+    scale = math.sqrt(TRADING_DAYS)
+    return {
+        "annual_return": annual_return,
+        "volatility": std * scale,
+        "sharpe_ratio": float(excess.mean()) / std * scale if std > 1e-12 else 0.0,
+        "sortino_ratio": float(excess.mean()) / downside * scale if downside > 1e-12 else 0.0,
+    }
+
+
+def risk_report(
+    returns: np.ndarray,
+    asset_returns: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+    levels: Sequence[float] = DEFAULT_LEVELS,
+    window: int = DEFAULT_WINDOW,
+    cvar_window: int = DEFAULT_CVAR_WINDOW,
+    cvar_level: float = 0.95,
+    risk_free: float = 0.0,
+) -> Dict[str, Any]:
+    """All of the above for one window of daily portfolio `returns`."""
+    returns = np.asarray(returns, dtype=np.float64)
+    growth = np.cumprod(1.0 + returns)
+    report: Dict[str, Any] = {
+        "observations": int(returns.size),
+        **summary_stats(returns, risk_free),
+        "value_at_risk": value_at_risk(returns, levels),
+        "rolling": rolling_ratios(returns, window, risk_free),
+        "rolling_cvar": rolling_cvar(returns, cvar_window, cvar_level),
+        "drawdown": drawdown_stats(growth),
+    }
+    if asset_returns is not None and weights is not None:
+        report["contributions"] = risk_contributions(asset_returns, weights)
+    return report
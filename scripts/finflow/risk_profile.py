@@ -0,0 +1,143 @@
+"""
+Vectorised risk-profile transform.
+
+`apply_risk_profile_batch` tilts a whole matrix of weight vectors at once:
+rows are independent portfolios, each with its own risk level and horizon.
+`RiskProfileEngine` binds it to a ticker universe, resolving the defensive
+and growth ticker positions once instead of on every call.
+"""
+
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+RISK_LEVELS = ("conservative", "moderate", "aggressive")
+RISK_CODES = {name: code for code, name in enumerate(RISK_LEVELS)}
+RISK_ALIASES = {
+    "conservative": "conservative",
+    "moderate": "moderate",
+    "aggressive": "aggressive",
+    "low": "conservative",
+    "medium": "moderate",
+    "high": "aggressive",
+}
+
+CONSERVATIVE_CASH_BOOST = 0.18
+DEFENSIVE_TILT = 1.05
+AGGRESSIVE_CASH_CUT = 0.15
+SHORT_HORIZON_MONTHS = 6
+SHORT_HORIZON_BUFFER = 0.1
+LONG_HORIZON_MONTHS = 60
+GROWTH_TILT = 1.08
+LONG_HORIZON_CASH_DECAY = 0.92
+
+
+def normalize_risk(risk: str) -> str:
+    return RISK_ALIASES.get((risk or "moderate").lower(), "moderate")
+
+
+def ticker_mask(tickers: Sequence[str], selected: Sequence[str]) -> np.ndarray:
+    chosen = set(selected)
+    return np.array([ticker in chosen for ticker in tickers], dtype=bool)
+
+
+def apply_risk_profile_batch(
+    weights: np.ndarray,
+    cash: np.ndarray,
+    risk_codes: np.ndarray,
+    horizon_months: np.ndarray,
+    defensive_mask: np.ndarray,
+    growth_mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply the risk/horizon tilt row-wise.
+
+    `weights` is (batch, assets), `cash`, `risk_codes` (see `RISK_CODES`) and
+    `horizon_months` are (batch,). Returns new (weights, cash) arrays.
+    """
+    w = np.clip(np.asarray(weights, dtype=np.float64), 0.0, None)
+    if w.ndim == 1:
+        w = w.reshape(1, -1)
+    batch, n_assets = w.shape
+    c = np.maximum(np.broadcast_to(np.asarray(cash, dtype=np.float64), (batch,)), 0.0)
+    risk = np.broadcast_to(np.asarray(risk_codes), (batch,))
+    months = np.maximum(np.broadcast_to(np.asarray(horizon_months, dtype=np.int64), (batch,)), 1)
+
+    total = w.sum(axis=1) + c
+    positive = total > 0
+    safe_total = np.where(positive, total, 1.0)
+    w = np.where(positive[:, None], w / safe_total[:, None], 1.0 / max(n_assets, 1))
+    c = np.where(positive, c / safe_total, 0.0)
+
+    conservative = risk == RISK_CODES["conservative"]
+    boost = np.where(conservative, np.minimum(CONSERVATIVE_CASH_BOOST, 1.0 - c), 0.0)
+    boosted = boost > 0
+    c = np.where(boosted, c + boost, c)
+    w = np.where(boosted[:, None], w * (1.0 - boost)[:, None], w)
+    if defensive_mask.any():
+        tilt = conservative & (w.sum(axis=1) > 0)
+        w = np.where(tilt[:, None] & defensive_mask[None, :], w * DEFENSIVE_TILT, w)
+
+    aggressive = risk == RISK_CODES["aggressive"]
+    w_sum = w.sum(axis=1)
+    reduction = np.where(aggressive, np.minimum(AGGRESSIVE_CASH_CUT, c), 0.0)
+    reduced = (reduction > 0) & (w_sum > 0)
+    safe_sum = np.where(w_sum > 0, w_sum, 1.0)
+    c = np.where(reduced, c - reduction, c)
+    w = np.where(reduced[:, None], w + (w / safe_sum[:, None]) * reduction[:, None], w)
+
+    short = months <= SHORT_HORIZON_MONTHS
+    buffer = np.where(short, np.minimum(SHORT_HORIZON_BUFFER, 1.0 - c), 0.0)
+    buffered = buffer > 0
+    c = np.where(buffered, c + buffer, c)
+    w = np.where(buffered[:, None], w * (1.0 - buffer)[:, None], w)
+    if growth_mask.any():
+        long = months >= LONG_HORIZON_MONTHS
+        w = np.where(long[:, None] & growth_mask[None, :], w * GROWTH_TILT, w)
+        c = np.where(long, c * LONG_HORIZON_CASH_DECAY, c)
+
+    total = w.sum(axis=1) + c
+    positive = total > 0
+    safe_total = np.where(positive, total, 1.0)
+    w = np.where(positive[:, None], w / safe_total[:, None], w)
+    c = np.where(positive, c / safe_total, c)
+
+    w = np.clip(w, 0.0, None)
+    w_sum = w.sum(axis=1)
+    positive = w_sum > 0
+    w = np.where(positive[:, None], w / np.where(positive, w_sum + c, 1.0)[:, None], w)
+    return w, c
+
+
+class RiskProfileEngine:
+    def __init__(
+        self,
+        tickers: Sequence[str],
+        defensive: Sequence[str],
+        growth: Sequence[str],
+    ) -> None:
+        self.tickers = list(tickers)
+        self.index: Dict[str, int] = {ticker: pos for pos, ticker in enumerate(self.tickers)}
+        self.defensive_mask = ticker_mask(self.tickers, defensive)
+        self.growth_mask = ticker_mask(self.tickers, growth)
+
+    @staticmethod
+    def risk_codes(risks: Union[str, Sequence[str]]) -> np.ndarray:
+        if isinstance(risks, str):
+            risks = [risks]
+        return np.fromiter(
+            (RISK_CODES[normalize_risk(risk)] for risk in risks), dtype=np.int8, count=len(risks)
+        )
+
+    def apply(
+        self,
+        weights: np.ndarray,
+        cash: np.ndarray,
+        risks: Union[str, Sequence[str], np.ndarray],
+        horizon_months: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Tilt (batch, assets) weights; `risks` may be names or `RISK_CODES` values."""
+        codes = risks if isinstance(risks, np.ndarray) and risks.dtype.kind in "iu" else self.risk_codes(risks)
+        return apply_risk_profile_batch(
+            weights, cash, codes, horizon_months, self.defensive_mask, self.growth_mask
+        )
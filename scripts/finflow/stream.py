@@ -0,0 +1,215 @@
+"""
+Server-sent event fan-out for market snapshots and portfolio marks.
+
+One producer task per `StreamHub` reads the shared `MarketSnapshotRefresher`
+every `interval` seconds, so N connected dashboards cost one upstream fetch
+per refresh instead of N polls. Each subscriber has its own bounded queue and
+only receives an event when a value it shows has changed:
+
+- `market`: the market snapshot (same shape as `/market-status`);
+- `portfolio`: the mark of the subscriber's allocation, i.e. today's change
+  of every holding and their weighted sum.
+
+A comment line is sent after `heartbeat` seconds of silence so proxies keep
+the connection open. The producer stops when the last subscriber leaves.
+A subscriber may hold at most `max_symbols` symbols, and the refresher caps
+the symbols tracked across all of them, since each one is fetched upstream
+on every refresh.
+"""
+
+import asyncio
+import json
+import math
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from finflow.market import MarketSnapshotRefresher, TrackingFull
+
+CASH_SYMBOL = "현금"
+QUEUE_SIZE = 16
+
+
+class StreamFull(RuntimeError):
+    """Raised when `max_clients` subscribers are connected or no more symbols can be tracked."""
+
+
+def parse_portfolio(value: Optional[str]) -> Dict[str, float]:
+    """
+    `"AAPL:0.4,MSFT:0.3,현금:0.3"` -> weights; raises ValueError on malformed
+    input and on weights that are negative or not finite.
+    """
+    weights: Dict[str, float] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        symbol, sep, weight = part.rpartition(":")
+        if not sep or not symbol.strip():
+            raise ValueError(f"포트폴리오 형식이 올바르지 않습니다: {part}")
+        try:
+            amount = float(weight)
+        except ValueError:
+            raise ValueError(f"비중이 숫자가 아닙니다: {part}") from None
+        if not math.isfinite(amount) or amount < 0:
+            raise ValueError(f"비중은 0 이상의 유한한 값이어야 합니다: {part}")
+        weights[symbol.strip()] = weights.get(symbol.strip(), 0.0) + amount
+    return weights
+
+
+class Subscriber:
+    def __init__(self, weights: Dict[str, float]) -> None:
+        self.weights = weights
+        self.symbols = [symbol for symbol in weights if symbol != CASH_SYMBOL]
+        self.queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.last_mark: Optional[Dict[str, Any]] = None
+        self.dropped = 0
+
+    def push(self, event: str, payload: Dict[str, Any]) -> None:
+        # A client that cannot keep up loses its oldest pending event, never the newest.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((event, payload))
+
+
+def portfolio_mark(weights: Dict[str, float], quotes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    total = sum(max(weight, 0.0) for weight in weights.values()) or 1.0
+    holdings: List[Dict[str, Any]] = []
+    missing: List[str] = []
+    change = 0.0
+    for symbol, weight in weights.items():
+        weight = max(weight, 0.0) / total
+        if symbol == CASH_SYMBOL:
+            holdings.append({"symbol": symbol, "weight": round(weight, 6), "price": None, "change_percent": 0.0})
+            continue
+        quote = quotes.get(symbol)
+        if quote is None:
+            missing.append(symbol)
+            continue
+        change += weight * quote["change_percent"]
+        holdings.append(
+            {
+                "symbol": symbol,
+                "weight": round(weight, 6),
+                "price": round(quote["price"], 4),
+                "change_percent": round(quote["change_percent"], 4),
+            }
+        )
+    return {"change_percent": round(change, 4), "holdings": holdings, "missing": missing}
+
+
+class StreamHub:
+    def __init__(
+        self,
+        refresher: MarketSnapshotRefresher,
+        interval: float = 5.0,
+        heartbeat: float = 15.0,
+        max_clients: int = 500,
+        max_symbols: int = 20,
+    ) -> None:
+        self.refresher = refresher
+        self.interval = max(float(interval), 0.05)
+        self.heartbeat = max(float(heartbeat), 1.0)
+        self.max_clients = max(int(max_clients), 1)
+        self.max_symbols = max(int(max_symbols), 1)
+        self._subscribers: List[Subscriber] = []
+        self._producer: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._market: Optional[Dict[str, Any]] = None
+        self.ticks = 0
+        self.events = 0
+
+    def subscribe(self, weights: Dict[str, float]) -> Subscriber:
+        if len(self._subscribers) >= self.max_clients:
+            raise StreamFull(f"스트림 연결 수가 한도({self.max_clients})에 도달했습니다.")
+        subscriber = Subscriber(weights)
+        if len(subscriber.symbols) > self.max_symbols:
+            raise ValueError(f"스트림 하나에 최대 {self.max_symbols}개 종목까지 구독할 수 있습니다.")
+        try:
+            self.refresher.track(subscriber.symbols)
+        except TrackingFull as exc:
+            raise StreamFull(str(exc)) from None
+        self._subscribers.append(subscriber)
+        if self._market is not None:
+            subscriber.push("market", self._market)
+
+        loop = asyncio.get_running_loop()
+        if self._producer is None or self._producer.done() or self._producer.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._producer = loop.create_task(self._produce())
+        # Give the new client its portfolio mark without waiting a full interval.
+        self._wake.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            self.refresher.untrack(subscriber.symbols)
+
+    async def _produce(self) -> None:
+        assert self._wake is not None
+        while self._subscribers:
+            # Only a cold start blocks here; afterwards the snapshot is in memory.
+            snapshot = await asyncio.to_thread(self.refresher.snapshot)
+            self.ticks += 1
+            market = {
+                "market_data": [
+                    {key: quote[key] for key in ("symbol", "name", "price", "change", "change_percent")}
+                    for quote in snapshot["market_data"]
+                ],
+                "last_updated": snapshot["last_updated"],
+            }
+            if market["market_data"] != (self._market or {}).get("market_data"):
+                self._market = market
+                self._broadcast("market", market)
+
+            quotes = self.refresher.quotes(
+                list(dict.fromkeys(symbol for sub in self._subscribers for symbol in sub.symbols))
+            )
+            for subscriber in list(self._subscribers):
+                mark = portfolio_mark(subscriber.weights, quotes)
+                if mark != subscriber.last_mark:
+                    subscriber.last_mark = mark
+                    subscriber.push("portfolio", {**mark, "last_updated": snapshot["last_updated"]})
+                    self.events += 1
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _broadcast(self, event: str, payload: Dict[str, Any]) -> None:
+        for subscriber in list(self._subscribers):
+            subscriber.push(event, payload)
+            self.events += 1
+
+    async def events_for(self, subscriber: Subscriber) -> AsyncIterator[str]:
+        """SSE text for one subscriber; unsubscribes when the client goes away."""
+        try:
+            while True:
+                try:
+                    event, payload = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            self.unsubscribe(subscriber)
+        if self._producer is not None and not self._producer.done():
+            self._producer.cancel()
+        self._producer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._subscribers),
+            "max_clients": self.max_clients,
+            "max_symbols": self.max_symbols,
+            "interval_seconds": self.interval,
+            "ticks": self.ticks,
+            "events": self.events,
+            "dropped": sum(subscriber.dropped for subscriber in self._subscribers),
+        }
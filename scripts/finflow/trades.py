@@ -0,0 +1,210 @@
+"""
+Columnar views of the bundle's `trades.csv` and `holdings_timeseries.csv`.
+
+Both files are parsed once into typed arrays (categorical ticker codes,
+float32 quantities and weights, datetime64 dates). At load time the trades
+are grouped by (step, ticker) into cumulative sums of traded notional,
+transaction cost and trade count, so any date-range query is two binary
+searches plus a difference of two rows: no pandas scan per request.
+
+Trades of step `s` are executed on the trading day after the bundle date
+`s` (their own `timestamp` column); holdings row `s` belongs to bundle date
+`s`.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from finflow.dates import DateLike, date_slice, to_datetime64
+
+TRADE_DTYPES = {
+    "timestamp": str,
+    "step": np.int32,
+    "ticker": "category",
+    "qty": np.float32,
+    "price": np.float32,
+    "tx_cost": np.float32,
+    "side": "category",
+}
+TRADING_DAYS = 252
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class TradeLedger:
+    def __init__(
+        self,
+        dates: np.ndarray,
+        steps: np.ndarray,
+        ticker_codes: np.ndarray,
+        tickers: Sequence[str],
+        qty: np.ndarray,
+        price: np.ndarray,
+        tx_cost: np.ndarray,
+        portfolio_values: Optional[np.ndarray] = None,
+    ) -> None:
+        self.tickers = list(tickers)
+        self.dates = _frozen(dates)
+        self.steps = _frozen(steps)
+        self.ticker_codes = _frozen(ticker_codes)
+        self.qty = _frozen(qty)
+        self.price = _frozen(price)
+        self.tx_cost = _frozen(tx_cost)
+
+        # One row per step that traded, in execution-date order.
+        step_ids, first_rows = np.unique(steps, return_index=True)
+        self.step_ids = _frozen(step_ids)
+        self.step_dates = _frozen(dates[first_rows])
+        slot = np.searchsorted(step_ids, steps)
+
+        n_steps, n_tickers = step_ids.size, len(self.tickers)
+        notional = np.abs(qty.astype(np.float64)) * price.astype(np.float64)
+        shape = (n_steps + 1, n_tickers)
+        flat = slot * n_tickers + ticker_codes
+
+        def cumulative(weights: Optional[np.ndarray]) -> np.ndarray:
+            grid = np.zeros(shape, dtype=np.float64)
+            grid[1:] = np.bincount(flat, weights=weights, minlength=n_steps * n_tickers).reshape(
+                n_steps, n_tickers
+            )
+            return _frozen(np.cumsum(grid, axis=0))
+
+        # cum_*[k] = totals over the first k trading steps, per ticker.
+        self.cum_notional = cumulative(notional)
+        self.cum_cost = cumulative(tx_cost.astype(np.float64))
+        self.cum_count = cumulative(None)
+
+        step_notional = np.diff(self.cum_notional.sum(axis=1))
+        if portfolio_values is not None and portfolio_values.size:
+            # Value of the book going into each step (trades of step s follow bundle date s).
+            index = np.clip(step_ids, 0, portfolio_values.size - 1)
+            base = np.asarray(portfolio_values, dtype=np.float64)[index]
+        else:
+            base = np.full(n_steps, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            turnover = np.where(base > 0, step_notional / base, np.nan)
+        self.step_notional = _frozen(step_notional)
+        self.step_turnover = _frozen(turnover)
+        self.cum_turnover = _frozen(np.concatenate(([0.0], np.cumsum(np.nan_to_num(turnover)))))
+
+    def __len__(self) -> int:
+        return int(self.steps.size)
+
+    @classmethod
+    def from_csv(cls, path: Path, portfolio_values: Optional[np.ndarray] = None) -> "TradeLedger":
+        frame = pd.read_csv(path, dtype=TRADE_DTYPES)
+        frame = frame.sort_values(["step", "ticker"], kind="stable")
+        tickers = frame["ticker"].cat.categories
+        return cls(
+            dates=pd.to_datetime(frame["timestamp"]).to_numpy(dtype="datetime64[ns]"),
+            steps=frame["step"].to_numpy(dtype=np.int32),
+            ticker_codes=frame["ticker"].cat.codes.to_numpy(dtype=np.int16),
+            tickers=[str(ticker) for ticker in tickers],
+            qty=frame["qty"].to_numpy(dtype=np.float32),
+            price=frame["price"].to_numpy(dtype=np.float32),
+            tx_cost=frame["tx_cost"].to_numpy(dtype=np.float32),
+            portfolio_values=portfolio_values,
+        )
+
+    def step_range(self, start: DateLike = None, end: DateLike = None) -> slice:
+        """Traded steps (positions in `step_ids`) executed within [start, end]."""
+        return date_slice(self.step_dates, start, end)
+
+    def turnover(self, start: DateLike = None, end: DateLike = None, series: bool = False) -> Dict[str, Any]:
+        window = self.step_range(start, end)
+        lo, hi = window.start, window.stop
+        days = hi - lo
+        notional = float(self.cum_notional[hi].sum() - self.cum_notional[lo].sum())
+        turnover = float(self.cum_turnover[hi] - self.cum_turnover[lo])
+        result: Dict[str, Any] = {
+            "start_date": str(self.step_dates[lo])[:10] if days else None,
+            "end_date": str(self.step_dates[hi - 1])[:10] if days else None,
+            "trading_days": int(days),
+            "trades": int(self.cum_count[hi].sum() - self.cum_count[lo].sum()),
+            "traded_notional": notional,
+            "turnover": turnover,
+            "average_daily_turnover": turnover / days if days else 0.0,
+            "annualized_turnover": turnover / days * TRADING_DAYS if days else 0.0,
+        }
+        if series:
+            result["series"] = {
+                "dates": np.datetime_as_string(self.step_dates[window], unit="D").tolist(),
+                "turnover": np.nan_to_num(self.step_turnover[window]).tolist(),
+                "notional": self.step_notional[window].tolist(),
+            }
+        return result
+
+    def cost_footprint(self, start: DateLike = None, end: DateLike = None) -> List[Dict[str, Any]]:
+        """Transaction cost per ticker within the range, largest first."""
+        window = self.step_range(start, end)
+        cost = self.cum_cost[window.stop] - self.cum_cost[window.start]
+        notional = self.cum_notional[window.stop] - self.cum_notional[window.start]
+        count = self.cum_count[window.stop] - self.cum_count[window.start]
+        total = cost.sum()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bps = np.where(notional > 0, cost / notional * 1e4, 0.0)
+            share = cost / total if total > 0 else np.zeros_like(cost)
+        order = np.argsort(-cost, kind="stable")
+        return [
+            {
+                "ticker": self.tickers[idx],
+                "tx_cost": float(cost[idx]),
+                "traded_notional": float(notional[idx]),
+                "trades": int(count[idx]),
+                "cost_bps": float(bps[idx]),
+                "cost_share": float(share[idx]),
+            }
+            for idx in order
+            if count[idx] > 0
+        ]
+
+
+class HoldingsHistory:
+    """Portfolio weights per bundle date (float32), with cash in its own column."""
+
+    def __init__(self, dates: np.ndarray, tickers: Sequence[str], weights: np.ndarray, cash: np.ndarray) -> None:
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.weights = _frozen(weights)
+        self.cash = _frozen(cash)
+
+    @classmethod
+    def from_csv(cls, path: Path, dates: np.ndarray) -> "HoldingsHistory":
+        """`dates` are the bundle's trading dates; row `step` of the file is `dates[step]`."""
+        frame = pd.read_csv(path).sort_values("step")
+        frame = frame[(frame["step"] >= 0) & (frame["step"] < len(dates))]
+        tickers = [column for column in frame.columns if column not in ("step", "CASH")]
+        cash = (
+            frame["CASH"].to_numpy(dtype=np.float32)
+            if "CASH" in frame
+            else np.zeros(len(frame), dtype=np.float32)
+        )
+        return cls(
+            dates[frame["step"].to_numpy(dtype=np.int64)],
+            tickers,
+            np.ascontiguousarray(frame[tickers].to_numpy(dtype=np.float32)),
+            np.ascontiguousarray(cash),
+        )
+
+    def at(self, date: DateLike) -> Optional[Dict[str, Any]]:
+        """Holdings of the last bundle date on or before `date` (latest when None)."""
+        target = to_datetime64(date)
+        position = len(self.dates) if target is None else int(np.searchsorted(self.dates, target, side="right"))
+        if position == 0:
+            return None
+        row = position - 1
+        weights = self.weights[row]
+        order = np.argsort(-weights, kind="stable")
+        return {
+            "date": str(self.dates[row])[:10],
+            "holdings": [
+                {"symbol": self.tickers[idx], "weight": float(weights[idx])} for idx in order if weights[idx] > 0
+            ],
+            "cash": float(self.cash[row]),
+        }
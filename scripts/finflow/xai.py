@@ -0,0 +1,207 @@
+"""
+Indexed access to the bundle's `xai/` artefacts.
+
+- `xai_feature_attributions.parquet`: top-k integrated-gradient attributions
+  of sampled steps, per explained target (`critic_q`, `log_prob`) and regime;
+- `xai_prototypes_timeseries.csv`: prototype mixture (top-k ids and weights),
+  entropy and crisis level every `xai_log_interval` steps;
+- `xai_summary.json`: run parameters and whole-period aggregates.
+
+`XAIStore` loads them once into arrays ordered by step. Attributions are
+grouped per (target, regime), "all" included for both, into prefix sums over
+the sampled steps of |attribution|, signed attribution and sample counts for
+every observation feature; prototype mixtures become a dense (records ×
+prototypes) matrix with prefix sums as well. A date window is then two binary
+searches and one row difference, followed by an argpartition for the top-k.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finflow.dates import DateLike, date_slice
+
+ALL = "all"
+ATTRIBUTIONS_FILE = "xai_feature_attributions.parquet"
+PROTOTYPES_FILE = "xai_prototypes_timeseries.csv"
+SUMMARY_FILE = "xai_summary.json"
+
+
+class _PrefixIndex:
+    """Prefix sums of per-step rows, sliced by date."""
+
+    def __init__(self, dates: np.ndarray, rows: np.ndarray, columns: Sequence[str] = ()) -> None:
+        self.dates = dates
+        self.columns = list(columns)
+        self.cumulative = np.zeros((rows.shape[0] + 1,) + rows.shape[1:], dtype=np.float64)
+        np.cumsum(rows, axis=0, out=self.cumulative[1:])
+        self.dates.setflags(write=False)
+        self.cumulative.setflags(write=False)
+
+    def window(self, start: DateLike, end: DateLike) -> Tuple[np.ndarray, int]:
+        span = date_slice(self.dates, start, end)
+        return self.cumulative[span.stop] - self.cumulative[span.start], span.stop - span.start
+
+
+def _step_dates(steps: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    return dates[np.clip(steps, 0, len(dates) - 1)]
+
+
+class XAIStore:
+    def __init__(
+        self,
+        summary: Dict[str, Any],
+        attributions: Dict[Tuple[str, str], _PrefixIndex],
+        n_features: int,
+        prototypes: Optional[_PrefixIndex],
+        prototype_stats: Optional[_PrefixIndex],
+        n_prototypes: int,
+    ) -> None:
+        self.summary = summary
+        self.attributions = attributions
+        self.n_features = n_features
+        self.prototypes = prototypes
+        self.prototype_stats = prototype_stats
+        self.n_prototypes = n_prototypes
+
+    @property
+    def targets(self) -> List[str]:
+        return sorted({target for target, _ in self.attributions})
+
+    @property
+    def regimes(self) -> List[str]:
+        return sorted({regime for _, regime in self.attributions})
+
+    @classmethod
+    def load(cls, xai_dir: Path, dates: np.ndarray) -> Optional["XAIStore"]:
+        """Index `xai_dir` against the bundle's trading `dates`; None when it holds nothing usable."""
+        xai_dir = Path(xai_dir)
+        summary: Dict[str, Any] = {}
+        if (xai_dir / SUMMARY_FILE).exists():
+            with (xai_dir / SUMMARY_FILE).open("r", encoding="utf-8") as fp:
+                summary = json.load(fp)
+
+        attributions: Dict[Tuple[str, str], _PrefixIndex] = {}
+        n_features = 0
+        path = xai_dir / ATTRIBUTIONS_FILE
+        if path.exists():
+            try:
+                frame = pd.read_parquet(path, columns=["step", "feature_index", "attribution", "regime", "target"])
+            except Exception as exc:  # parquet engine (pyarrow) missing or unreadable file
+                print(f"XAI 기여도 파일을 읽을 수 없습니다: {path} ({exc})")
+                frame = None
+            if frame is not None and not frame.empty:
+                frame = frame.sort_values("step", kind="stable")
+                n_features = int(frame["feature_index"].max()) + 1
+                for (target, regime), group in cls._groups(frame):
+                    steps, codes = np.unique(group["step"].to_numpy(dtype=np.int64), return_inverse=True)
+                    features = group["feature_index"].to_numpy(dtype=np.int64)
+                    values = group["attribution"].to_numpy(dtype=np.float64)
+                    flat = codes * n_features + features
+                    size = steps.size * n_features
+                    rows = np.stack(
+                        [
+                            np.bincount(flat, weights=np.abs(values), minlength=size),
+                            np.bincount(flat, weights=values, minlength=size),
+                            np.bincount(flat, minlength=size).astype(np.float64),
+                        ],
+                        axis=-1,
+                    ).reshape(steps.size, n_features, 3)
+                    attributions[(target, regime)] = _PrefixIndex(_step_dates(steps, dates), rows)
+
+        prototypes = prototype_stats = None
+        n_prototypes = 0
+        path = xai_dir / PROTOTYPES_FILE
+        if path.exists():
+            frame = pd.read_csv(path).sort_values("step", kind="stable")
+            id_columns = sorted(column for column in frame.columns if column.startswith("topk_") and column.endswith("_id"))
+            if id_columns and not frame.empty:
+                ids = frame[id_columns].to_numpy(dtype=np.int64)
+                weights = frame[[column[: -len("_id")] + "_weight" for column in id_columns]].to_numpy(dtype=np.float64)
+                n_prototypes = int(ids.max()) + 1
+                mixture = np.zeros((len(frame), n_prototypes + 1), dtype=np.float64)
+                np.add.at(mixture, (np.arange(len(frame))[:, None], ids), weights)
+                if "topk_other_weight" in frame:
+                    mixture[:, -1] = frame["topk_other_weight"].to_numpy(dtype=np.float64)
+                record_dates = _step_dates(frame["step"].to_numpy(dtype=np.int64), dates)
+                prototypes = _PrefixIndex(record_dates, mixture)
+                stat_columns = [
+                    column
+                    for column in ("proto_entropy", "crisis_level", "cash_weight", "turnover_executed")
+                    if column in frame
+                ]
+                prototype_stats = _PrefixIndex(
+                    record_dates.copy(), frame[stat_columns].to_numpy(dtype=np.float64), stat_columns
+                )
+
+        if not attributions and prototypes is None:
+            return None
+        return cls(summary, attributions, n_features, prototypes, prototype_stats, n_prototypes)
+
+    @staticmethod
+    def _groups(frame: pd.DataFrame):
+        targets = [ALL] + sorted(frame["target"].unique())
+        regimes = [ALL] + sorted(frame["regime"].unique())
+        for target in targets:
+            by_target = frame if target == ALL else frame[frame["target"] == target]
+            for regime in regimes:
+                group = by_target if regime == ALL else by_target[by_target["regime"] == regime]
+                if not group.empty:
+                    yield (target, regime), group
+
+    def top_features(
+        self,
+        start: DateLike = None,
+        end: DateLike = None,
+        top_k: int = 20,
+        target: str = ALL,
+        regime: str = ALL,
+    ) -> Dict[str, Any]:
+        """
+        Features with the largest summed |attribution| in the window. Each has
+        its share of the window's total |attribution| and its mean signed
+        attribution over the samples in which it was among the top-k.
+        """
+        index = self.attributions.get((target or ALL, regime or ALL))
+        if index is None:
+            return {"samples": 0, "features": []}
+        totals, samples = index.window(start, end)
+        magnitude, signed, counts = totals[:, 0], totals[:, 1], totals[:, 2]
+        grand = magnitude.sum()
+        candidates = np.flatnonzero(magnitude > 0)
+        if top_k < candidates.size:
+            candidates = candidates[np.argpartition(-magnitude[candidates], top_k)[:top_k]]
+        order = candidates[np.argsort(-magnitude[candidates], kind="stable")]
+        return {
+            "samples": int(samples),
+            "features": [
+                {
+                    "feature_index": int(idx),
+                    "share": float(magnitude[idx] / grand),
+                    "total_abs_attribution": float(magnitude[idx]),
+                    "mean_attribution": float(signed[idx] / counts[idx]),
+                }
+                for idx in order
+            ],
+        }
+
+    def prototype_mixture(self, start: DateLike = None, end: DateLike = None, top_k: int = 5) -> Dict[str, Any]:
+        """Mean prototype weights in the window, plus mean entropy / crisis level etc."""
+        if self.prototypes is None:
+            return {"records": 0, "prototypes": [], "other_weight": 0.0, "stats": {}}
+        totals, records = self.prototypes.window(start, end)
+        if records == 0:
+            return {"records": 0, "prototypes": [], "other_weight": 0.0, "stats": {}}
+        means = totals / records
+        weights = means[:-1]
+        order = np.argsort(-weights, kind="stable")[: max(top_k, 0)]
+        stats, _ = self.prototype_stats.window(start, end)
+        return {
+            "records": int(records),
+            "prototypes": [{"index": int(idx), "weight": float(weights[idx])} for idx in order if weights[idx] > 0],
+            "other_weight": float(means[-1]),
+            "stats": {name: float(value / records) for name, value in zip(self.prototype_stats.columns, stats)},
+        }
@@ -8,22 +8,62 @@ Next.js frontend consumes. It reuses the pre-computed evaluation artefacts store
 the behaviour of the trained IRT policy.
 """
 
+import asyncio
 import json
-import math
 import os
+import threading
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import uvicorn
-import yfinance as yf
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
+from finflow.allocation_index import AllocationIndex
+from finflow.analysis_table import AnalysisTable, horizon_indices, table_fingerprint
+from finflow.backtest import backtest, cost_rate_from_env_meta, rebalance_period
+from finflow.batcher import MicroBatcher, Runner
+from finflow.bundle import BUNDLE_DIRNAME, HEADER_NAME, convert_bundle, load_bundle, read_json_bundle
+from finflow.cache import CacheManager
+from finflow.correlation import CorrelationEngine, returns_frame
+from finflow.covariance import METHODS as COVARIANCE_METHODS, CovarianceEstimate
+from finflow.dates import date_slice, freeze_dates, to_datetime64
+from finflow.executors import BlockingExecutor, ExecutorTimeout
+from finflow.market import MarketSnapshotRefresher, StubPriceProvider
+from finflow.montecarlo import (
+    METHODS as MONTE_CARLO_METHODS,
+    BootstrapModel,
+    GaussianModel,
+    percentile_labels,
+    process_pool as monte_carlo_process_pool,
+    simulate,
+    summarize,
+)
+from finflow.pairs import rank_pairs
+from finflow.policy import (
+    ObservationBuilder,
+    PolicyUnavailable,
+    TorchPolicy,
+    actions_to_weights,
+    load_env_meta,
+)
+from finflow.price_store import CachedPriceProvider, PriceStore
+from finflow.prices import PickleBundleProvider, PriceFetcher, PriceProvider, YFinanceProvider
+from finflow.registry import ModelRegistry, UnknownBundleError
+from finflow.risk import DEFAULT_CVAR_WINDOW, daily_returns, risk_report
+from finflow.risk_profile import RiskProfileEngine, normalize_risk
+from finflow.stream import StreamFull, StreamHub, parse_portfolio
+from finflow.trades import HoldingsHistory, TradeLedger
+from finflow.xai import ALL as XAI_ALL, XAIStore
+
 warnings.filterwarnings("ignore")
 
 # ---------------------------------------------------------------------------
@@ -33,9 +73,11 @@ try:
     from curl_cffi import requests  # type: ignore
 
     session = requests.Session(impersonate="chrome")
+    session_factory = lambda: requests.Session(impersonate="chrome")  # noqa: E731
     print("curl_cffi 세션 생성 성공 - Chrome 모방 모드")
 except Exception:
     session = None
+    session_factory = None
     print("curl_cffi 미설치 - 기본 HTTP 세션 사용")
 
 # ---------------------------------------------------------------------------
@@ -43,8 +85,12 @@ except Exception:
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = Path(__file__).resolve().parent
 BASE_DIR = SCRIPT_DIR.parent
-IRT_ASSETS_DIR = SCRIPT_DIR / "irt_assets"
-MODEL_BUNDLE_DIR = IRT_ASSETS_DIR / "20251016_192706"
+IRT_ASSETS_DIR = Path(os.getenv("IRT_ASSETS_DIR", str(SCRIPT_DIR / "irt_assets")))
+# Default bundle id (directory name under IRT_ASSETS_DIR); newest run when unset
+MODEL_BUNDLE_ID = os.getenv("MODEL_BUNDLE_ID", "").strip() or None
+MODEL_REGISTRY_MAX_LOADED = int(os.getenv("MODEL_REGISTRY_MAX_LOADED", "2"))
+MODEL_REGISTRY_MAX_RSS_MB = float(os.getenv("MODEL_REGISTRY_MAX_RSS_MB", "768"))
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN", "")
 
 DEFAULT_DOW_30_TICKERS = [
     "AAPL",
@@ -81,6 +127,134 @@ DEFAULT_DOW_30_TICKERS = [
 DEFAULT_TEST_START = "2021-01-01"
 DEFAULT_TEST_END = "2024-12-31"
 
+# ---------------------------------------------------------------------------
+# Price data provider (live yfinance or offline `scripts/data/*.pkl` bundles)
+# ---------------------------------------------------------------------------
+PRICE_PROVIDER = os.getenv("PRICE_PROVIDER", "yfinance").lower()
+PRICE_FETCH_WORKERS = int(os.getenv("PRICE_FETCH_WORKERS", "8"))
+OFFLINE_PRICE_DIR = Path(os.getenv("OFFLINE_PRICE_DIR", str(SCRIPT_DIR / "data")))
+PRICE_STORE_ENABLED = os.getenv("PRICE_STORE_ENABLED", "1") == "1"
+PRICE_STORE_DIR = Path(os.getenv("PRICE_STORE_DIR", str(SCRIPT_DIR / "price_store")))
+# /market-status snapshot: source (yfinance or stub), refresh cadence, age after
+# which a read triggers revalidation, and per-refresh upstream timeout (seconds)
+MARKET_PROVIDER = os.getenv(
+    "MARKET_PROVIDER", "stub" if PRICE_PROVIDER == "offline" else "yfinance"
+).lower()
+MARKET_REFRESH_INTERVAL = float(os.getenv("MARKET_REFRESH_INTERVAL", "60"))
+MARKET_STALE_AFTER = float(os.getenv("MARKET_STALE_AFTER", str(2 * MARKET_REFRESH_INTERVAL)))
+MARKET_FETCH_TIMEOUT = float(os.getenv("MARKET_FETCH_TIMEOUT", "10"))
+MARKET_MAX_TRACKED = int(os.getenv("MARKET_MAX_TRACKED", "200"))
+# /stream (server-sent events): how often the shared producer checks for
+# changes, keep-alive interval, connection limit and symbols per connection
+STREAM_INTERVAL = float(os.getenv("STREAM_INTERVAL", "5"))
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", "15"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "500"))
+STREAM_MAX_SYMBOLS = int(os.getenv("STREAM_MAX_SYMBOLS", "20"))
+
+
+def build_price_fetcher() -> PriceFetcher:
+    provider: PriceProvider
+    if PRICE_PROVIDER == "offline":
+        provider = PickleBundleProvider(OFFLINE_PRICE_DIR)
+        print(f"오프라인 가격 데이터 사용: {OFFLINE_PRICE_DIR}")
+    else:
+        provider = YFinanceProvider(session_factory)
+        if PRICE_STORE_ENABLED:
+            provider = CachedPriceProvider(provider, PriceStore(PRICE_STORE_DIR))
+            print(f"가격 저장소 사용: {PRICE_STORE_DIR}")
+    return PriceFetcher(provider, max_workers=PRICE_FETCH_WORKERS)
+
+
+def build_market_refresher() -> MarketSnapshotRefresher:
+    provider: PriceProvider
+    if MARKET_PROVIDER == "stub":
+        provider = StubPriceProvider()
+        print("시장 현황에 로컬 스텁 데이터 사용")
+    else:
+        provider = YFinanceProvider(session_factory)
+    return MarketSnapshotRefresher(
+        provider,
+        interval=MARKET_REFRESH_INTERVAL,
+        stale_after=MARKET_STALE_AFTER,
+        fetch_timeout=MARKET_FETCH_TIMEOUT,
+        max_tracked=MARKET_MAX_TRACKED,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cache limits (entries, bytes, TTL in seconds) per namespace
+# ---------------------------------------------------------------------------
+ANALYSIS_CACHE_ENTRIES = int(os.getenv("ANALYSIS_CACHE_ENTRIES", "256"))
+ANALYSIS_CACHE_MAX_MB = int(os.getenv("ANALYSIS_CACHE_MAX_MB", "256"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", str(6 * 60 * 60)))
+MARKET_CACHE_TTL = float(os.getenv("MARKET_CACHE_TTL", str(30 * 60)))
+# Max L1 distance between a submitted allocation and a cached one to reuse its analysis
+ALLOCATION_MATCH_TOLERANCE = float(os.getenv("ALLOCATION_MATCH_TOLERANCE", "1e-3"))
+
+# Precompiled allocation table for every risk profile and horizon 0..N months
+ANALYSIS_TABLE_WARMUP = os.getenv("ANALYSIS_TABLE_WARMUP", "1") == "1"
+ANALYSIS_TABLE_MAX_HORIZON = int(os.getenv("ANALYSIS_TABLE_MAX_HORIZON", "120"))
+PREDICT_BATCH_MAX = int(os.getenv("PREDICT_BATCH_MAX", "10000"))
+# /covariance-analysis universe size limit and number of cached estimates
+COVARIANCE_MAX_TICKERS = int(os.getenv("COVARIANCE_MAX_TICKERS", "1000"))
+COVARIANCE_CACHE_ENTRIES = int(os.getenv("COVARIANCE_CACHE_ENTRIES", "16"))
+# /correlation-analysis tickers per request and number of cached (period, tickers) windows
+CORRELATION_MAX_TICKERS = int(os.getenv("CORRELATION_MAX_TICKERS", "200"))
+CORRELATION_WINDOWS = int(os.getenv("CORRELATION_WINDOWS", "8"))
+# /monte-carlo path limit, paths per chunk and process pool size (0: chunks run in the request thread)
+MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", "100000"))
+MONTE_CARLO_CHUNK_PATHS = int(os.getenv("MONTE_CARLO_CHUNK_PATHS", "2000"))
+MONTE_CARLO_WORKERS = int(os.getenv("MONTE_CARLO_WORKERS", "0"))
+_monte_carlo_pool: Optional[ProcessPoolExecutor] = None
+_monte_carlo_pool_lock = threading.Lock()
+
+
+def monte_carlo_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool for simulation chunks, started at startup when enabled."""
+    global _monte_carlo_pool
+    if MONTE_CARLO_WORKERS <= 1:
+        return None
+    with _monte_carlo_pool_lock:
+        if _monte_carlo_pool is None:
+            # spawn: forking a process that already runs threads is unsafe.
+            _monte_carlo_pool = monte_carlo_process_pool(MONTE_CARLO_WORKERS)
+        return _monte_carlo_pool
+
+# Live policy inference: "replay" serves the evaluation bundle only, "live" runs
+# irt_final.zip on CPU torch for /predict, micro-batching concurrent requests
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "replay").lower()
+POLICY_BATCH_MAX = int(os.getenv("POLICY_BATCH_MAX", "256"))
+POLICY_BATCH_WAIT_MS = float(os.getenv("POLICY_BATCH_WAIT_MS", "5"))
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))
+POLICY_HISTORY_PERIOD = "6mo"  # covers the 60-day SMA plus indicator warm-up
+
+# Memory-mapped binary copy of evaluation_results.json (written on first boot)
+EVALUATION_BUNDLE_MMAP = os.getenv("EVALUATION_BUNDLE_MMAP", "1") == "1"
+
+# ---------------------------------------------------------------------------
+# Blocking work executor (thread pools + per-route timeouts, in seconds)
+# ---------------------------------------------------------------------------
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "16"))
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 4)))
+DEFAULT_ROUTE_TIMEOUTS = {
+    "predict": 30.0,
+    "predict_batch": 60.0,
+    "explain": 60.0,
+    "historical_performance": 30.0,
+    "correlation_analysis": 45.0,
+    "covariance_analysis": 120.0,
+    "trades": 30.0,
+    "risk_return_analysis": 45.0,
+    "risk_metrics": 45.0,
+    "monte_carlo": 60.0,
+    "market_status": 15.0,
+    "models": 300.0,
+}
+ROUTE_TIMEOUTS = {
+    route: float(os.getenv(f"ROUTE_TIMEOUT_{route.upper()}", str(default)))
+    for route, default in DEFAULT_ROUTE_TIMEOUTS.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # Pydantic models (request/response contracts)
@@ -89,6 +263,7 @@ class PredictionRequest(BaseModel):
     investment_amount: float
     risk_tolerance: str = "moderate"
     investment_horizon: int = 12  # months
+    bundle_id: Optional[str] = None  # model bundle; default bundle when omitted
 
 
 class AllocationItem(BaseModel):
@@ -110,6 +285,21 @@ class MetricsResponse(BaseModel):
 class PredictionResponse(BaseModel):
     allocation: List[AllocationItem]
     metrics: MetricsResponse
+    inference_mode: str = "replay"  # "live" or "replay"
+    fallback_reason: Optional[str] = None  # set when live was requested but replay answered
+
+
+class BatchPredictionRequest(BaseModel):
+    profiles: List[PredictionRequest]
+    bundle_id: Optional[str] = None  # applies to every profile
+
+
+class BatchPredictionResponse(BaseModel):
+    symbols: List[str]
+    weights: List[List[float]]  # one row per profile, columns follow `symbols`
+    cash_weights: List[float]
+    cash_amounts: List[float]
+    metrics: MetricsResponse
 
 
 class XAIRequest(BaseModel):
@@ -117,12 +307,20 @@ class XAIRequest(BaseModel):
     risk_tolerance: str = "moderate"
     investment_horizon: int = 12
     method: str = "fast"  # "fast" or "accurate"
+    bundle_id: Optional[str] = None
+    # Accurate mode only: window and selection of the bundle's recorded attributions.
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    top_k: int = 20
+    target: str = "all"  # "all", "critic_q" or "log_prob"
+    regime: str = "all"  # "all", "normal" or "crisis"
 
 
 class FeatureImportance(BaseModel):
     feature_name: str
     importance_score: float
     asset_name: str
+    mean_attribution: Optional[float] = None
 
 
 class AttentionWeight(BaseModel):
@@ -131,16 +329,31 @@ class AttentionWeight(BaseModel):
     weight: float
 
 
+class PrototypeWeight(BaseModel):
+    index: int
+    weight: float
+
+
 class XAIResponse(BaseModel):
     feature_importance: List[FeatureImportance]
     attention_weights: List[AttentionWeight]
     explanation_text: str
+    # "attribution" when served from the bundle's xai/ artefacts, else "heuristic".
+    source: str = "heuristic"
+    samples: int = 0
+    prototypes: List[PrototypeWeight] = []
 
 
 class HistoricalRequest(BaseModel):
     portfolio_allocation: List[AllocationItem]
     start_date: Optional[str] = None
     end_date: Optional[str] = None
+    # "rows" (default), "columnar" (dates/portfolio/spy/qqq arrays) or "stream"
+    response_format: str = "rows"
+    bundle_id: Optional[str] = None
+    # Used when the allocation is not one the model produced: "buy_and_hold",
+    # "daily", "weekly", "monthly" or "quarterly".
+    rebalance: str = "buy_and_hold"
 
 
 class PerformanceHistory(BaseModel):
@@ -169,6 +382,82 @@ class CorrelationResponse(BaseModel):
     correlation_data: List[CorrelationData]
 
 
+class TradeAnalyticsRequest(BaseModel):
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    include_series: bool = False  # per-day turnover and notional (turnover only)
+    bundle_id: Optional[str] = None
+
+
+class TurnoverResponse(BaseModel):
+    start_date: Optional[str]
+    end_date: Optional[str]
+    trading_days: int
+    trades: int
+    traded_notional: float
+    turnover: float  # traded notional / portfolio value, summed over days
+    average_daily_turnover: float
+    annualized_turnover: float
+    series: Optional[Dict[str, List[Any]]] = None
+
+
+class CostFootprint(BaseModel):
+    ticker: str
+    tx_cost: float
+    traded_notional: float
+    trades: int
+    cost_bps: float
+    cost_share: float
+
+
+class CostFootprintResponse(BaseModel):
+    total_tx_cost: float
+    costs: List[CostFootprint]
+
+
+class HoldingsRequest(BaseModel):
+    date: Optional[str] = None  # last bundle date on or before it; latest when omitted
+    bundle_id: Optional[str] = None
+
+
+class HoldingsResponse(BaseModel):
+    date: str
+    holdings: List[AllocationItem]
+    cash: float
+
+
+class CovarianceRequest(BaseModel):
+    tickers: List[str]
+    period: str = "1y"
+    # "ledoit_wolf" (default), "sample" or "ewma"
+    method: str = "ledoit_wolf"
+    window: Optional[int] = None  # trailing trading days; whole period when omitted
+    halflife: float = 30.0  # ewma only, in trading days
+    # "pairs" (top_k strongest |correlation|) or "matrix"
+    output: str = "pairs"
+    # matrix contents: "correlation" or "covariance" (annualised)
+    kind: str = "correlation"
+    top_k: int = 20
+
+
+class CovariancePair(BaseModel):
+    stock1: str
+    stock2: str
+    correlation: float
+    covariance: float
+
+
+class CovarianceResponse(BaseModel):
+    tickers: List[str]
+    method: str
+    observations: int
+    shrinkage: Optional[float] = None
+    excluded: List[str] = []
+    volatility: List[float]
+    matrix: Optional[List[List[float]]] = None
+    pairs: Optional[List[CovariancePair]] = None
+
+
 class RiskReturnRequest(BaseModel):
     portfolio_allocation: List[AllocationItem]
     period: str = "1y"
@@ -185,6 +474,103 @@ class RiskReturnResponse(BaseModel):
     risk_return_data: List[RiskReturnData]
 
 
+class RiskMetricsRequest(BaseModel):
+    # Omitted: the model's own evaluated portfolio (contributions use its mean weights).
+    portfolio_allocation: Optional[List[AllocationItem]] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    rebalance: str = "buy_and_hold"  # as in /historical-performance
+    confidence_levels: List[float] = [0.95, 0.99]
+    window: int = 63  # rolling Sharpe/Sortino, in trading days
+    risk_free_rate: float = 0.0  # annual
+    include_series: bool = False  # daily drawdown and rolling ratios
+    bundle_id: Optional[str] = None
+
+
+class VaREstimate(BaseModel):
+    level: float
+    historical_var: float
+    historical_cvar: float
+    parametric_var: float
+    parametric_cvar: float
+
+
+class DrawdownSummary(BaseModel):
+    max_drawdown: float
+    peak_date: Optional[str]
+    trough_date: Optional[str]
+    recovery_date: Optional[str]  # None while the deepest drawdown is not recovered
+    max_duration_days: int
+    current_duration_days: int
+    episodes: int
+
+
+class RiskContribution(BaseModel):
+    symbol: str
+    weight: float
+    marginal_risk: float
+    risk_contribution: float
+    risk_share: float
+
+
+class RiskMetricsResponse(BaseModel):
+    source: str  # "model" or "allocation"
+    start_date: Optional[str]
+    end_date: Optional[str]
+    observations: int
+    annual_return: float
+    volatility: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    value_at_risk: List[VaREstimate]
+    drawdown: DrawdownSummary
+    portfolio_volatility: float  # of the priced target weights, from the asset covariance
+    risk_contributions: List[RiskContribution]
+    # Holdings without a full price history in the window; left out of the two fields above.
+    missing_symbols: List[str] = []
+    cvar_window: int
+    series: Optional[Dict[str, List[Any]]] = None
+
+
+class MonteCarloRequest(BaseModel):
+    investment_amount: float
+    investment_horizon: int = 12  # months of 21 trading days
+    # Omitted: the model's own evaluated portfolio.
+    portfolio_allocation: Optional[List[AllocationItem]] = None
+    method: str = "bootstrap"  # "bootstrap" or "multivariate"
+    paths: int = 10000
+    block_size: int = 1  # bootstrap: consecutive days drawn together
+    seed: Optional[int] = None  # random when omitted; returned for reproduction
+    percentiles: List[float] = [5, 25, 50, 75, 95]
+    # History the model is fitted on (default: the whole test period).
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    rebalance: str = "buy_and_hold"  # bootstrap of an allocation: as in /historical-performance
+    bundle_id: Optional[str] = None
+
+
+class TerminalWealth(BaseModel):
+    percentile: float
+    value: float
+
+
+class MonteCarloResponse(BaseModel):
+    source: str  # "model" or "allocation"
+    method: str
+    paths: int
+    steps: int
+    seed: int
+    observations: int  # days the model was fitted on
+    daily_mean: float
+    daily_volatility: float
+    terminal_wealth: List[TerminalWealth]
+    mean_terminal_wealth: float
+    probability_of_loss: float
+    expected_shortfall: float  # mean terminal wealth of the worst 5% of paths
+    # "steps" (trading days from now) plus one series per percentile ("p5", "p50", ...)
+    bands: Dict[str, List[float]]
+
+
 class MarketData(BaseModel):
     symbol: str
     name: str
@@ -197,29 +583,94 @@ class MarketData(BaseModel):
 class MarketStatusResponse(BaseModel):
     market_data: List[MarketData]
     last_updated: str
+    age_seconds: Optional[float] = None  # seconds since the snapshot was fetched
+    stale: bool = False  # older than MARKET_STALE_AFTER; a refresh is under way
+
+
+class ModelSwitchRequest(BaseModel):
+    bundle_id: str
 
 
 # ---------------------------------------------------------------------------
 # IRT-backed analysis service
 # ---------------------------------------------------------------------------
+def is_irt_bundle(path: Path) -> bool:
+    return (path / "irt_final.zip").exists() and (
+        (path / "evaluation_results.json").exists() or (path / BUNDLE_DIRNAME / HEADER_NAME).exists()
+    )
+
+
 class IRTBackendService:
-    def __init__(self) -> None:
-        self.model_path = MODEL_BUNDLE_DIR / "irt_final.zip"
+    def __init__(self, bundle_dir: Path, price_fetcher: Optional[PriceFetcher] = None) -> None:
+        self.bundle_id = Path(bundle_dir).name
+        self.model_path = Path(bundle_dir) / "irt_final.zip"
         if not self.model_path.exists():
             raise FileNotFoundError(f"IRT 모델 파일을 찾을 수 없습니다: {self.model_path}")
         self.model_dir = self.model_path.parent
         self.eval_results_path = self.model_dir / "evaluation_results.json"
+        self.binary_bundle_dir = self.model_dir / BUNDLE_DIRNAME
+        self.precomputed_source = self.eval_results_path
 
         self.stock_tickers = list(DEFAULT_DOW_30_TICKERS)
         self.test_start = DEFAULT_TEST_START
         self.test_end = DEFAULT_TEST_END
 
-        self.analysis_cache: Dict[Tuple[float, str, int, str], Dict[str, Any]] = {}
-        self.signature_cache: Dict[str, Dict[str, Any]] = {}
-        self.benchmark_cache: Dict[Tuple[str, str, int], Dict[str, List[float]]] = {}
-        self.last_analysis: Optional[Dict[str, Any]] = None
+        self.cache = CacheManager()
+        self.analysis_cache = self.cache.namespace(
+            "analysis",
+            max_entries=ANALYSIS_CACHE_ENTRIES,
+            ttl_seconds=ANALYSIS_CACHE_TTL,
+            max_bytes=ANALYSIS_CACHE_MAX_MB * 1024 * 1024,
+        )
+        self.benchmark_cache = self.cache.namespace(
+            "benchmark", max_entries=64, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.market_state_cache = self.cache.namespace(
+            "market_state", max_entries=4, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.price_column_cache = self.cache.namespace(
+            "price_column", max_entries=128, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.backtest_cache = self.cache.namespace(
+            "backtest", max_entries=ANALYSIS_CACHE_ENTRIES, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.covariance_cache = self.cache.namespace(
+            "covariance", max_entries=COVARIANCE_CACHE_ENTRIES, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.asset_returns_cache = self.cache.namespace(
+            "asset_returns", max_entries=32, ttl_seconds=MARKET_CACHE_TTL
+        )
+        self.last_request: Optional[Tuple[Tuple[str, int, str], float]] = None
+        self.analysis_table: Optional[AnalysisTable] = None
+        self.analysis_table_path = self.model_dir / "analysis_table.npz"
+        self.trades_path = self.model_dir / "trades.csv"
+        self.holdings_path = self.model_dir / "holdings_timeseries.csv"
+        self._trade_ledger: Optional[TradeLedger] = None
+        self._holdings_history: Optional[HoldingsHistory] = None
+        self._trade_lock = threading.Lock()
+        self.xai_dir = self.model_dir / "xai"
+        self._xai_store: Optional[XAIStore] = None
+        self._xai_loaded = False
+        self._xai_lock = threading.Lock()
+        self.policy: Optional[TorchPolicy] = None
+        self.policy_batcher: Optional[MicroBatcher] = None
+        self.observation_builder: Optional[ObservationBuilder] = None
+        # Why live inference was requested but is not running (replay fallback).
+        self.policy_error: Optional[str] = None
+        self.price_fetcher = price_fetcher or build_price_fetcher()
+        self.env_meta = load_env_meta(self.model_dir)
+        self.cost_rate = cost_rate_from_env_meta(self.env_meta)
 
         self.precomputed = self._load_precomputed()
+        self.allocation_index = AllocationIndex(
+            self.stock_tickers, ALLOCATION_MATCH_TOLERANCE, ANALYSIS_CACHE_ENTRIES
+        )
+        self.correlation_engine = CorrelationEngine(
+            self._load_close,
+            self.stock_tickers,
+            max_age=MARKET_CACHE_TTL,
+            max_windows=CORRELATION_WINDOWS,
+        )
 
         self.growth_tickers = [
             ticker
@@ -231,9 +682,12 @@ class IRTBackendService:
             for ticker in ("JNJ", "PG", "KO", "WMT", "MRK")
             if ticker in self.stock_tickers
         ]
+        self.risk_engine = RiskProfileEngine(
+            self.stock_tickers, self.defensive_tickers, self.growth_tickers
+        )
 
     # ------------------------------------------------------------------ utils
-    def bootstrap(self) -> None:
+    def bootstrap(self, policy_runner: Optional[Runner] = None) -> None:
         if self.model_path.is_file():
             size_mb = self.model_path.stat().st_size / (1024 * 1024)
             print(f"IRT 모델 확인: {self.model_path} ({size_mb:.1f} MB)")
@@ -243,63 +697,133 @@ class IRTBackendService:
         else:
             print(f"IRT 모델 경로를 확인할 수 없습니다: {self.model_path}")
 
+        if ANALYSIS_TABLE_WARMUP:
+            self.analysis_table = self._load_or_build_table()
+        if INFERENCE_MODE == "live":
+            self._load_policy(policy_runner)
+
+    def _load_policy(self, runner: Optional[Runner]) -> None:
+        try:
+            self.policy = TorchPolicy(self.model_path, num_threads=TORCH_NUM_THREADS)
+            self.observation_builder = ObservationBuilder.from_env_meta(
+                self.stock_tickers, self.env_meta
+            )
+        except (PolicyUnavailable, ValueError) as exc:
+            self.policy = None
+            self.policy_error = str(exc)
+            print(f"실시간 추론을 사용할 수 없어 평가 결과 재생 모드로 동작합니다: {exc}")
+            return
+        self.policy_batcher = MicroBatcher(
+            self.policy, max_batch=POLICY_BATCH_MAX, max_wait_ms=POLICY_BATCH_WAIT_MS, runner=runner
+        )
+        print(
+            f"실시간 추론 활성화: 관측 {self.observation_builder.obs_dim}차원, "
+            f"최대 배치 {POLICY_BATCH_MAX}, 대기 {POLICY_BATCH_WAIT_MS:.1f}ms"
+        )
+
+    @property
+    def inference_mode(self) -> str:
+        return "live" if self.policy_batcher is not None else "replay"
+
+    def close(self) -> None:
+        """Release what outlives the service's references: the policy batcher's worker."""
+        if self.policy_batcher is not None:
+            self.policy_batcher.close()
+
+    def _load_or_build_table(self) -> Optional[AnalysisTable]:
+        weights_history = self.precomputed["weights_history"]
+        if weights_history.shape[0] == 0:
+            return None
+
+        fingerprint = table_fingerprint(
+            self.precomputed_source,
+            self.stock_tickers,
+            self.defensive_tickers,
+            self.growth_tickers,
+            ANALYSIS_TABLE_MAX_HORIZON,
+        )
+        table = AnalysisTable.load(self.analysis_table_path, fingerprint)
+        if table is not None:
+            print(f"분석 테이블 로드: {self.analysis_table_path}")
+            return table
+
+        table = AnalysisTable.build(
+            weights_history,
+            self.precomputed["cash_series"],
+            self.risk_engine,
+            self._format_metrics(self.precomputed["metrics"], self.precomputed["exec_returns"]),
+            ANALYSIS_TABLE_MAX_HORIZON,
+            fingerprint,
+        )
+        try:
+            table.save(self.analysis_table_path)
+            print(f"분석 테이블 생성: {self.analysis_table_path} (최대 {table.max_horizon}개월)")
+        except OSError as exc:
+            print(f"분석 테이블을 저장할 수 없습니다: {exc}")
+        return table
+
     @staticmethod
     def _normalize_risk(risk: str) -> str:
-        mapping = {
-            "conservative": "conservative",
-            "moderate": "moderate",
-            "aggressive": "aggressive",
-            "low": "conservative",
-            "medium": "moderate",
-            "high": "aggressive",
-        }
-        return mapping.get((risk or "moderate").lower(), "moderate")
+        return normalize_risk(risk)
 
     @staticmethod
     def _normalize_mode(mode: str) -> str:
         return "accurate" if (mode or "fast").lower() in {"accurate", "full", "deep"} else "fast"
 
     @staticmethod
-    def _analysis_key(
-        amount: float, risk: str, horizon: int, mode: str
-    ) -> Tuple[float, str, int, str]:
-        return (round(float(amount), 2), risk, int(horizon), mode)
+    def _analysis_key(risk: str, horizon: int, mode: str) -> Tuple[str, int, str]:
+        # Nothing but the cash amount depends on the investment amount, so the
+        # cached analysis core is shared by every amount.
+        return (risk, int(horizon), mode)
+
+    def _read_bundle(self) -> Dict[str, Any]:
+        """Raw bundle fields, memory-mapped from `evaluation_bundle/` when possible."""
+        if EVALUATION_BUNDLE_MMAP:
+            raw = load_bundle(self.binary_bundle_dir, source=self.eval_results_path)
+            if raw is not None:
+                print(f"바이너리 평가 번들 로드 (mmap): {self.binary_bundle_dir}")
+                if not self.eval_results_path.exists():
+                    self.precomputed_source = self.binary_bundle_dir / HEADER_NAME
+                return raw
 
-    def _load_precomputed(self) -> Dict[str, Any]:
         if not self.eval_results_path.exists():
             raise FileNotFoundError(
                 f"평가 결과 파일을 찾을 수 없습니다: {self.eval_results_path}"
             )
+        raw = read_json_bundle(self.eval_results_path)
+        if EVALUATION_BUNDLE_MMAP:
+            try:
+                convert_bundle(self.eval_results_path, self.binary_bundle_dir)
+                print(f"바이너리 평가 번들 생성: {self.binary_bundle_dir}")
+            except OSError as exc:
+                print(f"바이너리 평가 번들을 저장할 수 없습니다: {exc}")
+        return raw
 
-        with self.eval_results_path.open("r", encoding="utf-8") as fp:
-            payload = json.load(fp)
-
-        results = payload.get("results", {})
-        metrics = results.get("metrics", {})
-        series = results.get("series", {})
-        irt = results.get("irt", {})
-        test_period = results.get("test_period", {})
+    def _load_precomputed(self) -> Dict[str, Any]:
+        raw = self._read_bundle()
+        metrics = raw["metrics"]
+        test_period = raw["test_period"]
         self.test_start = test_period.get("start", self.test_start)
         self.test_end = test_period.get("end", self.test_end)
 
-        if irt.get("symbols"):
-            self.stock_tickers = list(irt["symbols"])
+        if raw["symbols"]:
+            self.stock_tickers = list(raw["symbols"])
 
-        portfolio_values = np.asarray(series.get("portfolio_values", []), dtype=np.float64)
-        value_returns = np.asarray(series.get("value_returns", []), dtype=np.float64)
+        portfolio_values = np.asarray(raw["portfolio_values"], dtype=np.float64)
+        value_returns = np.asarray(raw["value_returns"], dtype=np.float64)
         if value_returns.size == 0 and portfolio_values.size > 1:
             prev = np.clip(portfolio_values[:-1], 1e-8, None)
             value_returns = (portfolio_values[1:] - portfolio_values[:-1]) / prev
-        exec_returns = np.asarray(series.get("per_step_returns", []), dtype=np.float64)
-        cash_series = np.asarray(series.get("cash_ratio", []), dtype=np.float64)
-        dates = list(series.get("dates", []))
+        exec_returns = np.asarray(raw["exec_returns"], dtype=np.float64)
+        cash_series = np.asarray(raw["cash_series"], dtype=np.float64)
+        dates = raw["dates"].tolist()
 
-        weights_history = np.asarray(irt.get("actual_weights", []), dtype=np.float64)
+        weights_history = np.asarray(raw["weights_history"], dtype=np.float64)
         if weights_history.ndim == 1 and weights_history.size:
             weights_history = weights_history.reshape(1, -1)
 
         avg_crisis = None
-        crisis_levels = np.asarray(irt.get("crisis_levels", []), dtype=np.float64)
+        crisis_levels = np.asarray(raw["crisis_levels"], dtype=np.float64)
         if crisis_levels.size:
             avg_crisis = float(np.clip(np.nanmean(crisis_levels), 0.0, 1.0))
 
@@ -348,14 +872,23 @@ class IRTBackendService:
                         normalized_dates.append(cursor.strftime("%Y-%m-%d"))
                 dates = normalized_dates
 
+        date_index, date_values = freeze_dates(dates)
+
+        # The bundle is shared by reference across every analysis; freeze it so
+        # nothing downstream can mutate it in place.
+        for array in (portfolio_values, cumulative_returns, exec_returns, weights_history, cash_series):
+            array.setflags(write=False)
+
         return {
-            "metrics": dict(metrics),
+            "metrics": MappingProxyType(dict(metrics)),
             "portfolio_values": portfolio_values,
             "portfolio_returns": cumulative_returns,
             "exec_returns": exec_returns,
             "weights_history": weights_history,
             "cash_series": cash_series,
-            "dates": dates,
+            "dates": tuple(dates),
+            "date_index": date_index,
+            "date_values": date_values,
             "avg_crisis": avg_crisis,
         }
 
@@ -388,102 +921,43 @@ class IRTBackendService:
         end: Optional[str] = None,
         period: Optional[str] = None,
     ) -> pd.DataFrame:
-        if isinstance(tickers, str):
-            tickers = [tickers]
-        tickers = [t for t in tickers if t]
-        if not tickers:
-            return pd.DataFrame()
-
-        # Preferred path: curl_cffi-backed session per ticker (rate-limit friendly)
-        if session is not None:
-            frames: Dict[str, pd.Series] = {}
-            for ticker in tickers:
-                try:
-                    ticker_obj = yf.Ticker(ticker, session=session)
-                    history = (
-                        ticker_obj.history(period=period)
-                        if period
-                        else ticker_obj.history(start=start, end=end)
-                    )
-                    if not history.empty and "Close" in history:
-                        close_series = history["Close"]
-                        if hasattr(close_series.index, "tzlocalize") and close_series.index.tz is not None:
-                            close_series = close_series.tz_localize(None)
-                        frames[ticker] = close_series
-                except Exception:
-                    continue
-            if frames:
-                close = pd.DataFrame(frames).dropna()
-                if not close.empty and hasattr(close.index, "tz") and close.index.tz is not None:
-                    close.index = close.index.tz_localize(None)
-                if not close.empty:
-                    return close
-
-        # Fallback: bulk download via yfinance
-        try:
-            data = (
-                yf.download(tickers, period=period, progress=False)
-                if period
-                else yf.download(tickers, start=start, end=end, progress=False)
-            )
-        except Exception:
-            return pd.DataFrame()
+        return self.price_fetcher.fetch_close(tickers, start=start, end=end, period=period)
 
-        if data.empty:
-            return pd.DataFrame()
-
-        if isinstance(data.columns, pd.MultiIndex):
-            close = data["Close"].copy()
-        else:
-            close = data["Close"].to_frame()
-            close.columns = tickers
-        close = close.dropna()
-        if not close.empty:
-            try:
-                close.index = close.index.tz_localize(None)
-            except TypeError:
-                pass
-        return close
-
-    def _prepare_benchmarks(self, dates: List[str]) -> Dict[str, List[float]]:
+    def _prepare_benchmarks(
+        self, dates: Tuple[str, ...], date_index: pd.DatetimeIndex
+    ) -> Dict[str, Any]:
         if not dates:
-            return {"dates": [], "spy": [], "qqq": []}
+            return {"dates": (), "spy": np.zeros(0), "qqq": np.zeros(0)}
 
         start, end = dates[0], dates[-1]
         cache_key = (start, end, len(dates))
         cached = self.benchmark_cache.get(cache_key)
         if cached:
-            return {
-                "dates": list(cached["dates"]),
-                "spy": list(cached["spy"]),
-                "qqq": list(cached["qqq"]),
-            }
+            return cached
 
+        zeros = np.zeros(len(dates))
+        zeros.setflags(write=False)
         close = self._download_prices(["SPY", "QQQ"], start=start, end=end)
         if close.empty:
-            result = {
-                "dates": dates,
-                "spy": [0.0] * len(dates),
-                "qqq": [0.0] * len(dates),
-            }
-            self.benchmark_cache[cache_key] = result
+            result = {"dates": dates, "spy": zeros, "qqq": zeros}
+            self.benchmark_cache.set(cache_key, result)
             return result
 
         daily_returns = close.pct_change().fillna(0)
         cumulative = (1 + daily_returns).cumprod() - 1
-
-        index = pd.to_datetime(dates)
-        aligned = cumulative.reindex(index, method="pad").fillna(method="bfill").fillna(0)
-
-        spy_series = (
-            aligned["SPY"].astype(float).tolist() if "SPY" in aligned else [0.0] * len(dates)
-        )
-        qqq_series = (
-            aligned["QQQ"].astype(float).tolist() if "QQQ" in aligned else [0.0] * len(dates)
-        )
-
-        result = {"dates": dates, "spy": spy_series, "qqq": qqq_series}
-        self.benchmark_cache[cache_key] = result
+        aligned = cumulative.reindex(date_index, method="pad").bfill().fillna(0)
+
+        series: Dict[str, np.ndarray] = {}
+        for symbol in ("SPY", "QQQ"):
+            if symbol in aligned:
+                values = aligned[symbol].to_numpy(dtype=np.float64, copy=True)
+                values.setflags(write=False)
+                series[symbol.lower()] = values
+            else:
+                series[symbol.lower()] = zeros
+
+        result = {"dates": dates, **series}
+        self.benchmark_cache.set(cache_key, result)
         return result
 
     def _apply_risk_profile(
@@ -493,65 +967,15 @@ class IRTBackendService:
         risk: str,
         horizon_months: int,
     ) -> Tuple[np.ndarray, float]:
-        weights = np.clip(weights.astype(np.float64), 0.0, None)
-        cash_weight = float(max(cash_weight, 0.0))
-
-        total = weights.sum() + cash_weight
-        if total > 0:
-            weights /= total
-            cash_weight /= total
-        else:
-            weights = np.full_like(weights, 1.0 / max(len(weights), 1))
-            cash_weight = 0.0
-
-        risk = self._normalize_risk(risk)
-        if risk == "conservative":
-            boost = min(0.18, 1.0 - cash_weight)
-            if boost > 0:
-                cash_weight += boost
-                weights *= 1.0 - boost
-            if self.defensive_tickers and weights.sum() > 0:
-                indices = [
-                    self.stock_tickers.index(t) for t in self.defensive_tickers if t in self.stock_tickers
-                ]
-                for idx in indices:
-                    weights[idx] *= 1.05
-        elif risk == "aggressive":
-            reduction = min(0.15, cash_weight)
-            if reduction > 0 and weights.sum() > 0:
-                cash_weight -= reduction
-                weights += (weights / weights.sum()) * reduction
-
-        months = max(int(horizon_months), 1)
-        if months <= 6:
-            buffer = min(0.1, 1.0 - cash_weight)
-            if buffer > 0:
-                cash_weight += buffer
-                weights *= 1.0 - buffer
-        elif months >= 60 and self.growth_tickers:
-            indices = [
-                self.stock_tickers.index(t) for t in self.growth_tickers if t in self.stock_tickers
-            ]
-            for idx in indices:
-                weights[idx] *= 1.08
-            cash_weight *= 0.92
-
-        total = weights.sum() + cash_weight
-        if total > 0:
-            weights /= total
-            cash_weight /= total
-
-        weights = np.clip(weights, 0.0, None)
-        if weights.sum() > 0:
-            weights /= weights.sum() + cash_weight
-
-        return weights, cash_weight
+        tilted, cash = self.risk_engine.apply(
+            weights.reshape(1, -1), np.array([cash_weight]), risk, np.array([horizon_months])
+        )
+        return tilted[0], float(cash[0])
 
     def _format_allocation(
         self,
         weights: np.ndarray,
         cash_weight: float,
-        amount: float,
     ) -> Tuple[List[Dict[str, float]], float]:
         allocation: List[Dict[str, float]] = []
         for idx, weight in enumerate(weights):
@@ -568,10 +992,10 @@ class IRTBackendService:
                 item["weight"] = float(item["weight"] / total)
 
         allocation.sort(key=lambda x: x["weight"], reverse=True)
-        cash_amount = amount * next(
+        cash_share = next(
             (item["weight"] for item in allocation if item["symbol"] == "현금"), 0.0
         )
-        return allocation, cash_amount
+        return allocation, cash_share
 
     @staticmethod
     def _additional_metrics(exec_returns: np.ndarray) -> Tuple[float, float]:
@@ -646,23 +1070,13 @@ class IRTBackendService:
         if weights_history.shape[0] < 2:
             return []
 
-        df = pd.DataFrame(weights_history, columns=self.stock_tickers)
-        corr = df.corr()
-
-        attention: List[Dict[str, float]] = []
-        for i, sym1 in enumerate(self.stock_tickers):
-            for j in range(i + 1, len(self.stock_tickers)):
-                sym2 = self.stock_tickers[j]
-                if sym1 not in corr.columns or sym2 not in corr.columns:
-                    continue
-                value = corr.loc[sym1, sym2]
-                if not np.isnan(value):
-                    attention.append(
-                        {"from_asset": sym1, "to_asset": sym2, "weight": float(value)}
-                    )
-
-        attention.sort(key=lambda x: abs(x["weight"]), reverse=True)
-        return attention[:40]
+        # Assets whose weight never moves have no correlation (NaN) and are dropped.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.corrcoef(weights_history[:, : len(self.stock_tickers)], rowvar=False)
+        return [
+            {"from_asset": sym1, "to_asset": sym2, "weight": value}
+            for sym1, sym2, value in rank_pairs(corr, self.stock_tickers, top_k=40)
+        ]
 
     def _build_explanation_text(self, analysis: Dict[str, Any]) -> str:
         metrics = analysis["metrics"]
@@ -717,76 +1131,69 @@ class IRTBackendService:
         return "\n".join(lines)
 
     # ---------------------------------------------------------------- eval
-    def _run_evaluation(
-        self,
-        amount: float,
-        mode: str,
-    ) -> Dict[str, Any]:
-        return {
-            "portfolio_values": np.copy(self.precomputed["portfolio_values"]),
-            "portfolio_returns": np.copy(self.precomputed["portfolio_returns"]),
-            "weights_history": np.copy(self.precomputed["weights_history"]),
-            "cash_series": np.copy(self.precomputed["cash_series"]),
-            "exec_returns": np.copy(self.precomputed["exec_returns"]),
-            "metrics": dict(self.precomputed["metrics"]),
-            "dates": list(self.precomputed["dates"]),
-            "avg_crisis": self.precomputed["avg_crisis"],
-        }
+    def _base_allocation(self, risk: str, horizon: int) -> Tuple[np.ndarray, float]:
+        if self.analysis_table is not None:
+            row = self.analysis_table.lookup(risk, horizon)
+            if row is not None:
+                return row
+
+        weights_history = self.precomputed["weights_history"]
+        cash_series = self.precomputed["cash_series"]
+        steps = len(self.precomputed["portfolio_returns"])
+        if steps == 0:
+            return np.full(len(self.stock_tickers), 1.0 / max(len(self.stock_tickers), 1)), 0.0
+
+        target_idx = int(horizon_indices(np.array([horizon]), steps)[0])
+        weights_vec = (
+            weights_history[target_idx] if weights_history.size else np.full(len(self.stock_tickers), 1.0 / len(self.stock_tickers))
+        )
+        cash_weight = float(cash_series[target_idx]) if cash_series.size else 0.0
+        return self._apply_risk_profile(weights_vec, cash_weight, risk, horizon)
+
+    def _run_evaluation(self, mode: str) -> Dict[str, Any]:
+        # Read-only views of the frozen bundle; nothing is copied per analysis.
+        return dict(self.precomputed)
 
     def _create_analysis(
         self,
-        amount: float,
         risk: str,
         horizon: int,
         mode: str,
     ) -> Dict[str, Any]:
-        evaluation = self._run_evaluation(amount, mode)
+        """Build the amount-independent analysis core for (risk, horizon, mode)."""
+        evaluation = self._run_evaluation(mode)
 
         weights_history = evaluation["weights_history"]
         cash_series = evaluation["cash_series"]
         exec_returns = evaluation["exec_returns"]
         metrics_raw = evaluation["metrics"]
         dates = evaluation["dates"]
-        portfolio_returns = evaluation["portfolio_returns"]
         avg_crisis = evaluation.get("avg_crisis")
 
-        steps = len(portfolio_returns)
-        if steps == 0:
-            base_weights = np.full(len(self.stock_tickers), 1.0 / max(len(self.stock_tickers), 1))
-            cash_weight = 0.0
-        else:
-            target_idx = min(max(int(horizon) * 21, 0), steps - 1)
-            weights_vec = (
-                weights_history[target_idx] if weights_history.size else np.full(len(self.stock_tickers), 1.0 / len(self.stock_tickers))
-            )
-            cash_weight = float(cash_series[target_idx]) if cash_series.size else 0.0
-            base_weights, cash_weight = self._apply_risk_profile(
-                weights_vec, cash_weight, risk, horizon
-            )
-
-        allocation, cash_amount = self._format_allocation(base_weights, cash_weight, amount)
+        base_weights, cash_weight = self._base_allocation(risk, horizon)
+        allocation, cash_share = self._format_allocation(base_weights, cash_weight)
         metrics_fmt = self._format_metrics(metrics_raw, exec_returns)
         feature_importance = self._build_feature_importance(weights_history)
         attention_weights = self._build_attention_weights(weights_history)
-        benchmarks = self._prepare_benchmarks(dates)
+        benchmarks = self._prepare_benchmarks(dates, evaluation["date_index"])
 
         analysis = {
             "params": {
-                "investment_amount": float(amount),
                 "risk_tolerance": risk,
                 "investment_horizon": int(horizon),
             },
             "analysis_mode": mode,
             "allocation": allocation,
-            "allocation_signature": self._allocation_signature(allocation),
             "metrics": metrics_fmt,
-            "cash_amount": cash_amount,
-            "portfolio_returns": portfolio_returns.tolist(),
-            "portfolio_values": evaluation["portfolio_values"].tolist(),
+            "cash_share": cash_share,
+            # NumPy arrays shared with the bundle; converted to JSON only when served.
+            "portfolio_returns": evaluation["portfolio_returns"],
+            "portfolio_values": evaluation["portfolio_values"],
             "dates": dates,
+            "date_values": evaluation["date_values"],
             "benchmarks": benchmarks,
-            "cash_series": cash_series.tolist(),
-            "exec_returns": exec_returns.tolist(),
+            "cash_series": cash_series,
+            "exec_returns": exec_returns,
             "feature_importance": feature_importance,
             "attention_weights": attention_weights,
             "avg_crisis_level": avg_crisis,
@@ -794,6 +1201,22 @@ class IRTBackendService:
         analysis["explanation_text"] = self._build_explanation_text(analysis)
         return analysis
 
+    @staticmethod
+    def _project_analysis(core: Dict[str, Any], amount: float) -> Dict[str, Any]:
+        """Attach the amount-specific fields to a shared analysis core (shallow copy)."""
+        analysis = dict(core)
+        analysis["params"] = {**core["params"], "investment_amount": float(amount)}
+        analysis["cash_amount"] = float(amount) * core["cash_share"]
+        return analysis
+
+    def _get_core(self, key: Tuple[str, int, str]) -> Dict[str, Any]:
+        core = self.analysis_cache.get(key)
+        if core is None:
+            core = self._create_analysis(*key)
+            self.analysis_cache.set(key, core)
+            self.allocation_index.add(core["allocation"], key)
+        return core
+
     # ---------------------------------------------------------------- public
     def get_analysis(
         self,
@@ -804,86 +1227,331 @@ class IRTBackendService:
     ) -> Dict[str, Any]:
         risk_norm = self._normalize_risk(risk)
         mode_norm = self._normalize_mode(mode)
-        key = self._analysis_key(amount, risk_norm, horizon, mode_norm)
+        key = self._analysis_key(risk_norm, horizon, mode_norm)
 
-        analysis = self.analysis_cache.get(key)
-        if analysis is None:
-            analysis = self._create_analysis(amount, risk_norm, horizon, mode_norm)
-            self.analysis_cache[key] = analysis
-            self.signature_cache[analysis["allocation_signature"]] = analysis
-
-        self.last_analysis = analysis
+        analysis = self._project_analysis(self._get_core(key), amount)
+        self.last_request = (key, float(amount))
         return analysis
 
+    def get_prediction(self, amount: float, risk: str, horizon: int) -> Dict[str, Any]:
+        """Allocation and metrics for `/predict`, served from the analysis table when possible."""
+        risk_norm = self._normalize_risk(risk)
+        row = self.analysis_table.lookup(risk_norm, horizon) if self.analysis_table else None
+        if row is None:
+            analysis = self.get_analysis(amount, risk_norm, horizon, "fast")
+            return {"allocation": analysis["allocation"], "metrics": analysis["metrics"]}
+
+        allocation, _ = self._format_allocation(*row)
+        key = self._analysis_key(risk_norm, horizon, "fast")
+        # Remember which analysis produced this allocation for /historical-performance.
+        self.allocation_index.add(allocation, key)
+        self.last_request = (key, float(amount))
+        return {"allocation": allocation, "metrics": self.analysis_table.metrics}
+
+    def live_observation(self, amount: float) -> np.ndarray:
+        """Policy input for a fresh portfolio of `amount` cash at the latest close."""
+        builder = self.observation_builder
+        market_state = self.market_state_cache.get_or_create(
+            "latest",
+            lambda: builder.market_state(
+                self.price_fetcher.history_many(self.stock_tickers, period=POLICY_HISTORY_PERIOD)
+            ),
+        )
+        return builder.build(market_state, np.array([amount]))[0]
+
+    def get_live_prediction(
+        self, amount: float, risk: str, horizon: int, action: np.ndarray
+    ) -> Dict[str, Any]:
+        """Allocation for `/predict` from one row of live policy output."""
+        weights, cash = actions_to_weights(action, len(self.stock_tickers))
+        weights, cash = self.risk_engine.apply(
+            weights, cash, self._normalize_risk(risk), np.array([horizon])
+        )
+        allocation, _ = self._format_allocation(weights[0], float(cash[0]))
+        metrics = (
+            self.analysis_table.metrics
+            if self.analysis_table is not None
+            else self._format_metrics(self.precomputed["metrics"], self.precomputed["exec_returns"])
+        )
+        return {"allocation": allocation, "metrics": metrics}
+
+    def predict_batch(
+        self,
+        amounts: np.ndarray,
+        risks: List[str],
+        horizons: np.ndarray,
+    ) -> Dict[str, Any]:
+        """Allocations for many (amount, risk, horizon) profiles in one vectorised pass."""
+        n_assets = len(self.stock_tickers)
+        steps = self.precomputed["weights_history"].shape[0]
+        horizons = np.asarray(horizons, dtype=np.int64)
+        if steps == 0:
+            base_weights = np.full((horizons.size, n_assets), 1.0 / max(n_assets, 1))
+            base_cash = np.zeros(horizons.size)
+        else:
+            rows = horizon_indices(horizons, steps)
+            base_weights = self.precomputed["weights_history"][rows]
+            cash_series = self.precomputed["cash_series"]
+            base_cash = cash_series[rows] if cash_series.size else np.zeros(horizons.size)
+
+        weights, cash = self.risk_engine.apply(base_weights, base_cash, risks, horizons)
+        # Same normalisation as _format_allocation, row-wise.
+        cash = np.where(cash > 0, cash, 0.0)
+        total = weights.sum(axis=1) + cash
+        safe_total = np.where(total > 0, total, 1.0)
+        weights = weights / safe_total[:, None]
+        cash = cash / safe_total
+
+        metrics = (
+            self.analysis_table.metrics
+            if self.analysis_table is not None
+            else self._format_metrics(self.precomputed["metrics"], self.precomputed["exec_returns"])
+        )
+        return {
+            "symbols": list(self.stock_tickers),
+            "weights": weights,
+            "cash_weights": cash,
+            "cash_amounts": np.asarray(amounts, dtype=np.float64) * cash,
+            "metrics": metrics,
+        }
+
     def get_analysis_by_allocation(
         self,
         allocation_payload: List[Dict[str, Any]],
     ) -> Optional[Dict[str, Any]]:
-        normalized = [
-            {"symbol": item["symbol"], "weight": float(item["weight"])}
-            for item in allocation_payload
-            if item.get("symbol")
-        ]
-        signature = self._allocation_signature(normalized)
-        analysis = self.signature_cache.get(signature)
-        if analysis is not None:
-            return analysis
-        if self.last_analysis and self.last_analysis.get("allocation_signature") == signature:
-            return self.last_analysis
-        return None
+        key = self.allocation_index.lookup(allocation_payload)
+        if key is None:
+            return None
+        return self._get_core(key)
+
+    def _price_columns(self, tickers: List[str]) -> Dict[str, np.ndarray]:
+        """Close prices of `tickers` on the bundle's trading dates, cached per ticker."""
+        columns = {ticker: self.price_column_cache.get(ticker) for ticker in tickers}
+        missing = [ticker for ticker, values in columns.items() if values is None]
+        if not missing:
+            return columns
+
+        date_index = self.precomputed["date_index"]
+        dates = self.precomputed["dates"]
+        end = (date_index[-1] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        histories = self.price_fetcher.history_many(missing, start=dates[0], end=end)
+        for ticker in missing:
+            history = histories.get(ticker)
+            if history is None or history.empty:
+                # Cached as well, so an unknown ticker is not refetched per request.
+                values = np.full(len(date_index), np.nan)
+            else:
+                values = (
+                    history["Close"]
+                    .reindex(date_index, method="pad")
+                    .bfill()
+                    .to_numpy(dtype=np.float64, copy=True)
+                )
+            values.setflags(write=False)
+            self.price_column_cache.set(ticker, values)
+            columns[ticker] = values
+        return columns
+
+    def backtest_allocation(
+        self,
+        allocation_payload: List[Dict[str, Any]],
+        rebalance: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        History of an arbitrary allocation over the bundle's test period.
+
+        The result has the same date/return/benchmark fields `history_columns`
+        reads from a model analysis. Tickers without price data are held as
+        cash, and trading costs use the rates from `env_meta.json`.
+        """
+        try:
+            period = rebalance_period(rebalance)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        weights: Dict[str, float] = {}
+        for item in allocation_payload:
+            symbol = item.get("symbol")
+            if symbol:
+                weights[symbol] = weights.get(symbol, 0.0) + max(float(item.get("weight", 0.0)), 0.0)
+        cash = weights.pop("현금", 0.0)
+        if not weights and cash <= 0:
+            raise HTTPException(status_code=400, detail="포트폴리오 비중이 비어 있습니다.")
+
+        dates = self.precomputed["dates"]
+        cache_key = (self._allocation_signature(allocation_payload), period, len(dates))
+        cached = self.backtest_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        tickers = sorted(weights)
+        columns = self._price_columns(tickers)
+        prices = (
+            np.column_stack([columns[ticker] for ticker in tickers])
+            if tickers
+            else np.ones((len(dates), 0))
+        )
+        if tickers and not np.isfinite(prices).all(axis=0).any():
+            raise HTTPException(
+                status_code=503, detail="가격 데이터를 불러올 수 없어 백테스트를 수행할 수 없습니다."
+            )
+
+        result = backtest(
+            prices,
+            np.array([weights[ticker] for ticker in tickers], dtype=np.float64),
+            cash=cash,
+            rebalance_every=period,
+            cost_rate=self.cost_rate,
+        )
+        returns = result["returns"]
+        returns.setflags(write=False)
+        analysis = {
+            "dates": dates,
+            "date_values": self.precomputed["date_values"],
+            "portfolio_returns": returns,
+            "benchmarks": self._prepare_benchmarks(dates, self.precomputed["date_index"]),
+        }
+        self.backtest_cache.set(cache_key, analysis)
+        return analysis
 
-    def build_performance_history(
+    @staticmethod
+    def _check_dates(*values: Optional[str]) -> None:
+        """400 for a date bound that does not parse, instead of treating it as unbounded."""
+        try:
+            for value in values:
+                to_datetime64(value)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    def _history_window(
         self,
         analysis: Dict[str, Any],
         start_date: Optional[str],
         end_date: Optional[str],
-    ) -> List[PerformanceHistory]:
-        dates = analysis.get("dates", [])
-        returns = analysis.get("portfolio_returns", [])
-        benchmarks = analysis.get("benchmarks", {"spy": [], "qqq": []})
-
-        start_dt = self._parse_date(start_date)
-        end_dt = self._parse_date(end_date)
-
-        history: List[PerformanceHistory] = []
-        for idx, date_str in enumerate(dates):
-            dt = self._parse_date(date_str)
-            if start_dt and dt and dt < start_dt:
-                continue
-            if end_dt and dt and dt > end_dt:
-                continue
-            portfolio = float(returns[idx]) if idx < len(returns) else 0.0
-            spy = float(benchmarks.get("spy", [0.0])[idx] if idx < len(benchmarks.get("spy", [])) else 0.0)
-            qqq = float(benchmarks.get("qqq", [0.0])[idx] if idx < len(benchmarks.get("qqq", [])) else 0.0)
-            history.append(PerformanceHistory(date=date_str, portfolio=portfolio, spy=spy, qqq=qqq))
-        return history
+    ) -> slice:
+        """Index range of `analysis["dates"]` within [start_date, end_date] (binary search)."""
+        self._check_dates(start_date, end_date)
+        return date_slice(analysis["date_values"], start_date, end_date)
+
+    def date_range(self, start_date: Optional[str], end_date: Optional[str]) -> slice:
+        """Positions of the bundle's trading dates within [start_date, end_date]."""
+        self._check_dates(start_date, end_date)
+        return date_slice(self.precomputed["date_values"], start_date, end_date)
+
+    def history_columns(
+        self,
+        analysis: Dict[str, Any],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Dict[str, List[Any]]:
+        window = self._history_window(analysis, start_date, end_date)
+        dates = analysis.get("dates", ())[window]
+        benchmarks = analysis.get("benchmarks", {"spy": (), "qqq": ()})
+        size = len(dates)
+
+        def column(values: np.ndarray) -> List[float]:
+            part = np.asarray(values[window], dtype=np.float64).tolist()
+            return part + [0.0] * (size - len(part))
+
+        return {
+            "dates": list(dates),
+            "portfolio": column(analysis.get("portfolio_returns", ())),
+            "spy": column(benchmarks.get("spy", ())),
+            "qqq": column(benchmarks.get("qqq", ())),
+        }
+
+    @staticmethod
+    def build_performance_history(columns: Dict[str, List[Any]]) -> List[PerformanceHistory]:
+        return [
+            PerformanceHistory(date=date_str, portfolio=portfolio, spy=spy, qqq=qqq)
+            for date_str, portfolio, spy, qqq in zip(
+                columns["dates"], columns["portfolio"], columns["spy"], columns["qqq"]
+            )
+        ]
+
+    @staticmethod
+    def iter_performance_history(columns: Dict[str, List[Any]], chunk_rows: int = 256) -> Iterator[str]:
+        """Yield the `HistoricalResponse` JSON document in chunks of `chunk_rows` rows."""
+        yield '{"performance_history":['
+        size = len(columns["dates"])
+        for offset in range(0, size, chunk_rows):
+            rows = [
+                {"date": date_str, "portfolio": portfolio, "spy": spy, "qqq": qqq}
+                for date_str, portfolio, spy, qqq in zip(
+                    columns["dates"][offset : offset + chunk_rows],
+                    columns["portfolio"][offset : offset + chunk_rows],
+                    columns["spy"][offset : offset + chunk_rows],
+                    columns["qqq"][offset : offset + chunk_rows],
+                )
+            ]
+            chunk = json.dumps(rows, ensure_ascii=False)[1:-1]
+            yield ("," if offset else "") + chunk
+        yield "]}"
 
     def calculate_correlation(
         self,
         tickers: List[str],
         period: str,
     ) -> List[CorrelationData]:
-        stock_tickers = [ticker for ticker in tickers if ticker and ticker != "현금"]
+        stock_tickers = list(dict.fromkeys(ticker for ticker in tickers if ticker and ticker != "현금"))
         if len(stock_tickers) < 2:
             return []
+        if len(stock_tickers) > CORRELATION_MAX_TICKERS:
+            raise HTTPException(
+                status_code=400, detail=f"한 번에 최대 {CORRELATION_MAX_TICKERS}개 종목까지 요청할 수 있습니다."
+            )
 
-        close = self._download_prices(stock_tickers, period=period)
-        if close.empty:
-            return []
+        pairs = self.correlation_engine.pairs(stock_tickers, period)
+        return [
+            CorrelationData(stock1=stock1, stock2=stock2, correlation=value)
+            for stock1, stock2, value in pairs
+        ]
 
-        returns = close.pct_change().dropna()
-        corr_matrix = returns.corr()
+    def calculate_covariance(
+        self,
+        tickers: List[str],
+        period: str,
+        method: str,
+        window: Optional[int],
+        halflife: float,
+    ) -> CovarianceEstimate:
+        """Covariance estimate over the requested universe, computed once per universe and window."""
+        universe = tuple(sorted({ticker for ticker in tickers if ticker and ticker != "현금"}))
+        if len(universe) < 2:
+            raise HTTPException(status_code=400, detail="종목을 2개 이상 입력해야 합니다.")
+        if len(universe) > COVARIANCE_MAX_TICKERS:
+            raise HTTPException(
+                status_code=400, detail=f"한 번에 최대 {COVARIANCE_MAX_TICKERS}개 종목까지 요청할 수 있습니다."
+            )
+        if method not in COVARIANCE_METHODS:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 공분산 추정 방식입니다: {method}")
 
-        data: List[CorrelationData] = []
-        for i, stock1 in enumerate(stock_tickers):
-            for j in range(i + 1, len(stock_tickers)):
-                stock2 = stock_tickers[j]
-                value = corr_matrix.loc[stock1, stock2]
-                if not math.isnan(value):
-                    data.append(CorrelationData(stock1=stock1, stock2=stock2, correlation=float(value)))
+        window = int(window) if window and window > 0 else None
+        key = (universe, period, method, window, float(halflife) if method == "ewma" else None)
+        try:
+            return self.covariance_cache.get_or_create(
+                key,
+                lambda: CovarianceEstimate.from_returns(
+                    self._load_returns(list(universe), period), method, window, halflife
+                ),
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
 
-        data.sort(key=lambda item: abs(item.correlation), reverse=True)
-        return data
+    def _load_close(
+        self, tickers: List[str], period: str, start: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        if start is None:
+            histories = self.price_fetcher.history_many(tickers, period=period)
+        else:
+            histories = self.price_fetcher.history_many(tickers, start=start.strftime("%Y-%m-%d"))
+        return pd.DataFrame(
+            {ticker: history["Close"] for ticker, history in histories.items() if not history.empty},
+            columns=tickers,
+        )
+
+    def _load_returns(self, tickers: List[str], period: str) -> pd.DataFrame:
+        return returns_frame(self._load_close(tickers, period))
 
     def calculate_risk_return(
         self,
@@ -921,56 +1589,456 @@ class IRTBackendService:
             )
         return result
 
-    def get_market_status(self) -> MarketStatusResponse:
-        market_symbols = {
-            "^GSPC": "S&P 500",
-            "^IXIC": "NASDAQ",
-            "^VIX": "VIX 변동성 지수",
-            "KRW=X": "USD/KRW 환율",
+    # ------------------------------------------------------------------ risk
+    def _asset_returns(self, tickers: List[str]) -> np.ndarray:
+        """(dates × tickers) daily returns on the bundle dates; row 0 and missing tickers are NaN."""
+
+        def build() -> np.ndarray:
+            columns = self._price_columns(tickers)
+            prices = np.column_stack([columns[ticker] for ticker in tickers])
+            returns = np.full(prices.shape, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns[1:] = prices[1:] / prices[:-1] - 1.0
+            returns.setflags(write=False)
+            return returns
+
+        return self.asset_returns_cache.get_or_create(tuple(tickers), build)
+
+    def _portfolio_profile(
+        self, allocation_payload: Optional[List[Dict[str, Any]]], rebalance: Optional[str]
+    ) -> Tuple[str, Dict[str, float], np.ndarray]:
+        """
+        (source, stock weights as fractions of the whole portfolio, growth curve
+        on the bundle dates) of an allocation, or of the model's own portfolio
+        (its mean weights) when no allocation is given.
+        """
+        if not allocation_payload:
+            weights_history = self.precomputed["weights_history"]
+            mean_weights = weights_history.mean(axis=0) if weights_history.size else np.zeros(0)
+            weights = {
+                symbol: float(weight) for symbol, weight in zip(self.stock_tickers, mean_weights) if weight > 0
+            }
+            return "model", weights, 1.0 + self.precomputed["portfolio_returns"]
+
+        analysis = self.get_analysis_by_allocation(allocation_payload)
+        if analysis is None:
+            analysis = self.backtest_allocation(allocation_payload, rebalance)
+        weights = {}
+        for item in allocation_payload:
+            symbol = item.get("symbol")
+            if symbol:
+                weights[symbol] = weights.get(symbol, 0.0) + max(float(item.get("weight", 0.0)), 0.0)
+        total = sum(weights.values())
+        weights.pop("현금", None)
+        weights = {symbol: weight / total for symbol, weight in weights.items()} if total > 0 else {}
+        return "allocation", weights, 1.0 + np.asarray(analysis["portfolio_returns"], dtype=np.float64)
+
+    def get_risk_metrics(
+        self,
+        allocation_payload: Optional[List[Dict[str, Any]]],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        rebalance: Optional[str] = None,
+        levels: Optional[List[float]] = None,
+        window: int = 63,
+        risk_free: float = 0.0,
+        include_series: bool = False,
+    ) -> Dict[str, Any]:
+        """VaR/CVaR, rolling ratios, drawdowns and risk contributions over [start, end]."""
+        levels = list(levels or (0.95, 0.99))
+        if not all(0.5 <= level < 1.0 for level in levels):
+            raise HTTPException(status_code=400, detail="신뢰수준은 0.5 이상 1 미만이어야 합니다.")
+        if window < 2:
+            raise HTTPException(status_code=400, detail="롤링 윈도는 2일 이상이어야 합니다.")
+        self._check_dates(start, end)
+
+        source, weights, growth = self._portfolio_profile(allocation_payload, rebalance)
+        dates = self.precomputed["dates"]
+        span = date_slice(self.precomputed["date_values"], start, end)
+        returns = daily_returns(growth)[span]
+        if returns.size < 2:
+            raise HTTPException(status_code=400, detail="선택한 기간의 거래일이 2일 미만입니다.")
+
+        tickers = sorted(weights)
+        asset_returns = self._asset_returns(tickers)[max(span.start, 1) : span.stop] if tickers else None
+        cvar_window = int(self.env_meta.get("adaptive_cvar_window") or DEFAULT_CVAR_WINDOW)
+        report = risk_report(
+            returns,
+            asset_returns,
+            np.array([weights[ticker] for ticker in tickers], dtype=np.float64) if tickers else None,
+            levels=levels,
+            window=window,
+            cvar_window=cvar_window,
+            risk_free=risk_free,
+        )
+
+        window_dates = dates[span]
+
+        def date_at(position: Optional[int]) -> Optional[str]:
+            return window_dates[position] if position is not None else None
+
+        drawdown = report["drawdown"]
+        contributions = report.get("contributions")
+        result: Dict[str, Any] = {
+            "source": source,
+            "start_date": window_dates[0],
+            "end_date": window_dates[-1],
+            "observations": report["observations"],
+            "annual_return": report["annual_return"],
+            "volatility": report["volatility"],
+            "sharpe_ratio": report["sharpe_ratio"],
+            "sortino_ratio": report["sortino_ratio"],
+            "value_at_risk": report["value_at_risk"],
+            "drawdown": {
+                "max_drawdown": drawdown["max_drawdown"],
+                "peak_date": date_at(drawdown["peak"]),
+                "trough_date": date_at(drawdown["trough"]),
+                "recovery_date": date_at(drawdown["recovery"]),
+                "max_duration_days": drawdown["max_duration"],
+                "current_duration_days": drawdown["current_duration"],
+                "episodes": drawdown["episodes"],
+            },
+            "portfolio_volatility": contributions["volatility"] if contributions else 0.0,
+            "risk_contributions": (
+                sorted(
+                    (
+                        {
+                            "symbol": ticker,
+                            "weight": weights[ticker],
+                            "marginal_risk": float(contributions["marginal"][idx]),
+                            "risk_contribution": float(contributions["contribution"][idx]),
+                            "risk_share": float(contributions["share"][idx]),
+                        }
+                        for idx, ticker in enumerate(tickers)
+                        if contributions["priced"][idx]
+                    ),
+                    key=lambda item: item["risk_contribution"],
+                    reverse=True,
+                )
+                if contributions
+                else []
+            ),
+            "missing_symbols": (
+                [ticker for idx, ticker in enumerate(tickers) if not contributions["priced"][idx]]
+                if contributions
+                else []
+            ),
+            "cvar_window": cvar_window,
         }
+        if include_series:
+            # Rolling values start once a full window is available.
+            def padded(values: np.ndarray, size: int) -> List[Optional[float]]:
+                return [None] * (size - 1) + values.tolist() if values.size else [None] * len(returns)
+
+            result["series"] = {
+                "dates": list(window_dates),
+                "drawdown": drawdown["drawdown"].tolist(),
+                "rolling_sharpe": padded(report["rolling"]["sharpe"], window),
+                "rolling_sortino": padded(report["rolling"]["sortino"], window),
+                "rolling_cvar": padded(report["rolling_cvar"], cvar_window),
+            }
+        return result
 
-        market_data: List[MarketData] = []
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def get_monte_carlo(
+        self,
+        amount: float,
+        horizon: int,
+        allocation_payload: Optional[List[Dict[str, Any]]],
+        simulation: str = "bootstrap",
+        paths: int = 10000,
+        block: int = 1,
+        seed: Optional[int] = None,
+        percentiles: Optional[List[float]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        rebalance: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Percentile bands of simulated wealth for `amount` over `horizon` months."""
+        method = (simulation or "bootstrap").lower()
+        if method not in MONTE_CARLO_METHODS:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 시뮬레이션 방식입니다: {simulation}")
+        if not 1 <= horizon <= ANALYSIS_TABLE_MAX_HORIZON:
+            raise HTTPException(
+                status_code=400, detail=f"투자 기간은 1~{ANALYSIS_TABLE_MAX_HORIZON}개월이어야 합니다."
+            )
+        if not 1 <= paths <= MONTE_CARLO_MAX_PATHS:
+            raise HTTPException(status_code=400, detail=f"경로 수는 1~{MONTE_CARLO_MAX_PATHS}개여야 합니다.")
+        percentiles = list(percentiles or (5, 25, 50, 75, 95))
+        if not all(0.0 <= value <= 100.0 for value in percentiles):
+            raise HTTPException(status_code=400, detail="백분위수는 0에서 100 사이여야 합니다.")
+        if seed is not None and seed < 0:
+            raise HTTPException(status_code=400, detail="시드는 0 이상의 정수여야 합니다.")
+        self._check_dates(start, end)
+
+        source, weights, growth = self._portfolio_profile(allocation_payload, rebalance)
+        span = date_slice(self.precomputed["date_values"], start, end)
+        try:
+            if method == "bootstrap":
+                # The model's realised daily returns, or the allocation's backtested ones.
+                history = (
+                    daily_returns(growth)[span]
+                    if source == "allocation"
+                    else self.precomputed["exec_returns"][span]
+                )
+                model: Any = BootstrapModel(history, block)
+                observations = int(model.returns.size)
+                daily_mean, daily_volatility = float(model.returns.mean()), float(model.returns.std(ddof=1))
+            else:
+                tickers = sorted(weights)
+                if not tickers:
+                    raise ValueError("다변량 모형에 사용할 종목 비중이 없습니다.")
+                asset_returns = self._asset_returns(tickers)[max(span.start, 1) : span.stop]
+                model = GaussianModel.fit(asset_returns, np.array([weights[ticker] for ticker in tickers]))
+                observations = int(asset_returns.shape[0])
+                daily_mean, daily_volatility = model.mean, model.std
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        steps = int(horizon) * 21
+        growth_paths, checkpoints = simulate(
+            model,
+            int(paths),
+            steps,
+            seed,
+            chunk_paths=MONTE_CARLO_CHUNK_PATHS,
+            executor=monte_carlo_pool(),
+        )
+        summary = summarize(growth_paths, amount, percentiles)
+        bands: Dict[str, List[float]] = {"steps": checkpoints.tolist()}
+        for label, values in zip(percentile_labels(summary["percentiles"]), summary["bands"]):
+            bands[label] = values.tolist()
+        return {
+            "source": source,
+            "method": method,
+            "paths": int(paths),
+            "steps": steps,
+            "seed": int(seed),
+            "observations": observations,
+            "daily_mean": daily_mean,
+            "daily_volatility": daily_volatility,
+            "terminal_wealth": [
+                {"percentile": percentile, "value": float(value)}
+                for percentile, value in zip(summary["percentiles"], summary["terminal"])
+            ],
+            "mean_terminal_wealth": summary["mean_terminal"],
+            "probability_of_loss": summary["probability_of_loss"],
+            "expected_shortfall": summary["expected_shortfall"],
+            "bands": bands,
+        }
 
-        for symbol, name in market_symbols.items():
-            try:
-                ticker = yf.Ticker(symbol, session=session) if session else yf.Ticker(symbol)
-                history = ticker.history(period="2d")
-                if history.empty or "Close" not in history:
-                    continue
-                closes = history["Close"].tolist()
-                price = float(closes[-1])
-                prev = float(closes[-2]) if len(closes) > 1 else price
-                change = price - prev
-                change_pct = (change / prev * 100) if prev else 0.0
-                market_data.append(
-                    MarketData(
-                        symbol=symbol,
-                        name=name,
-                        price=price,
-                        change=change,
-                        change_percent=change_pct,
-                        last_updated=current_time,
+    # ---------------------------------------------------------------- trades
+    def trade_ledger(self) -> TradeLedger:
+        """`trades.csv` as columnar arrays, parsed on first use."""
+        with self._trade_lock:
+            if self._trade_ledger is None:
+                if not self.trades_path.exists():
+                    raise HTTPException(status_code=404, detail="이 번들에는 거래 내역(trades.csv)이 없습니다.")
+                self._trade_ledger = TradeLedger.from_csv(
+                    self.trades_path, self.precomputed["portfolio_values"]
+                )
+                print(f"거래 내역 로드: {self.trades_path} ({len(self._trade_ledger)}건)")
+            return self._trade_ledger
+
+    def holdings_history(self) -> HoldingsHistory:
+        """`holdings_timeseries.csv` aligned to the bundle dates, parsed on first use."""
+        with self._trade_lock:
+            if self._holdings_history is None:
+                if not self.holdings_path.exists():
+                    raise HTTPException(
+                        status_code=404, detail="이 번들에는 보유 비중 내역(holdings_timeseries.csv)이 없습니다."
                     )
+                self._holdings_history = HoldingsHistory.from_csv(
+                    self.holdings_path, self.precomputed["date_values"]
                 )
-            except Exception:
-                continue
+            return self._holdings_history
+
+    def get_turnover(self, start: Optional[str], end: Optional[str], series: bool) -> Dict[str, Any]:
+        self._check_dates(start, end)
+        return self.trade_ledger().turnover(start, end, series=series)
+
+    def get_cost_footprint(self, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+        self._check_dates(start, end)
+        costs = self.trade_ledger().cost_footprint(start, end)
+        return {"total_tx_cost": float(sum(item["tx_cost"] for item in costs)), "costs": costs}
+
+    def get_holdings(self, date: Optional[str]) -> Dict[str, Any]:
+        self._check_dates(date)
+        holdings = self.holdings_history().at(date)
+        if holdings is None:
+            raise HTTPException(status_code=404, detail="해당 날짜의 보유 비중이 없습니다.")
+        return holdings
+
+    # ------------------------------------------------------------------- xai
+    def xai_store(self) -> Optional[XAIStore]:
+        """The bundle's `xai/` artefacts, indexed on first use; None when the bundle has none."""
+        with self._xai_lock:
+            if not self._xai_loaded:
+                if self.xai_dir.is_dir():
+                    self._xai_store = XAIStore.load(self.xai_dir, self.precomputed["date_values"])
+                    if self._xai_store is not None:
+                        print(
+                            f"XAI 기여도 로드: {self.xai_dir} "
+                            f"(대상 {', '.join(self._xai_store.targets)}, 프로토타입 {self._xai_store.n_prototypes}개)"
+                        )
+                self._xai_loaded = True
+            return self._xai_store
+
+    def _feature_labeler(self) -> Callable[[int], Tuple[str, str]]:
+        if self.observation_builder is not None:
+            return self.observation_builder.describe
+        try:
+            return ObservationBuilder.from_env_meta(self.stock_tickers, self.env_meta).describe
+        except ValueError:
+            return lambda index: (f"feature_{index}", "-")
+
+    def get_explanation(
+        self,
+        amount: float,
+        risk: str,
+        horizon: int,
+        mode: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        top_k: int = 20,
+        target: str = XAI_ALL,
+        regime: str = XAI_ALL,
+    ) -> Dict[str, Any]:
+        """
+        `/explain` payload. Accurate mode serves the recorded attributions and
+        prototype mixtures of [start, end] when the bundle has them; otherwise
+        (and in fast mode) the weight-based heuristics of the analysis.
+        """
+        self._check_dates(start, end)
+        analysis = self.get_analysis(amount, risk, horizon, mode)
+        result = {
+            "feature_importance": analysis["feature_importance"],
+            "attention_weights": analysis["attention_weights"],
+            "explanation_text": analysis["explanation_text"],
+            "source": "heuristic",
+            "samples": 0,
+            "prototypes": [],
+        }
+        store = self.xai_store() if analysis["analysis_mode"] == "accurate" else None
+        if store is None:
+            return result
 
-        return MarketStatusResponse(market_data=market_data, last_updated=current_time)
+        if not 1 <= top_k <= 100:
+            raise HTTPException(status_code=400, detail="top_k는 1에서 100 사이여야 합니다.")
+        target = (target or XAI_ALL).lower()
+        regime = (regime or XAI_ALL).lower()
+        if target not in store.targets:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 설명 대상입니다: {target}")
+        known_regimes = set(store.regimes) | set(store.summary.get("regimes", {})) - {"overall"}
+        if regime not in known_regimes:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 시장 국면입니다: {regime}")
+
+        attributions = store.top_features(start, end, top_k=top_k, target=target, regime=regime)
+        mixture = store.prototype_mixture(start, end)
+        describe = self._feature_labeler()
+        features = []
+        for item in attributions["features"]:
+            feature_name, asset_name = describe(item["feature_index"])
+            features.append(
+                {
+                    "feature_name": feature_name,
+                    "asset_name": asset_name,
+                    "importance_score": item["share"],
+                    "mean_attribution": item["mean_attribution"],
+                }
+            )
+
+        lines = [analysis["explanation_text"]]
+        if features:
+            top_text = ", ".join(
+                f"{item['asset_name']} {item['feature_name']} {item['importance_score'] * 100:.1f}%"
+                for item in features[:3]
+            )
+            lines.append(f"기록된 기여도 {attributions['samples']}개 표본 기준 주요 입력: {top_text}.")
+        else:
+            lines.append("선택한 기간에 기록된 기여도 표본이 없습니다.")
+        if mixture["prototypes"]:
+            lead = mixture["prototypes"][0]
+            entropy = mixture["stats"].get("proto_entropy")
+            entropy_text = f" (프로토타입 엔트로피 {entropy:.2f})" if entropy is not None else ""
+            lines.append(
+                f"정책은 프로토타입 #{lead['index']}에 평균 {lead['weight'] * 100:.1f}%의 가중치를 두었습니다{entropy_text}."
+            )
+
+        result.update(
+            feature_importance=features,
+            explanation_text="\n".join(lines),
+            source="attribution",
+            samples=attributions["samples"],
+            prototypes=mixture["prototypes"],
+        )
+        return result
 
     def health_status(self) -> Dict[str, Any]:
         return {
+            "bundle_id": self.bundle_id,
             "model_path": str(self.model_path),
             "cached_runs": len(self.analysis_cache),
-            "last_params": self.last_analysis["params"] if self.last_analysis else None,
+            "last_params": (
+                {
+                    "investment_amount": self.last_request[1],
+                    "risk_tolerance": self.last_request[0][0],
+                    "investment_horizon": self.last_request[0][1],
+                }
+                if self.last_request
+                else None
+            ),
+            "analysis_table_horizon": self.analysis_table.max_horizon if self.analysis_table else None,
             "precomputed_steps": int(self.precomputed["portfolio_returns"].shape[0]),
+            "cache": self.cache.stats(),
+            "allocation_index": self.allocation_index.stats(),
+            "correlation": self.correlation_engine.stats(),
+            "price_fetch": self.price_fetcher.stats(),
+            "inference": {
+                "mode": self.inference_mode,
+                "requested_mode": INFERENCE_MODE,
+                "fallback_reason": self.policy_error,
+                "policy": self.policy.stats() if self.policy is not None else None,
+                "batcher": self.policy_batcher.stats() if self.policy_batcher is not None else None,
+            },
         }
 
 
 # ---------------------------------------------------------------------------
 # FastAPI application setup
 # ---------------------------------------------------------------------------
-service = IRTBackendService()
+price_fetcher = build_price_fetcher()
+market_refresher = build_market_refresher()
+stream_hub = StreamHub(
+    market_refresher,
+    interval=STREAM_INTERVAL,
+    heartbeat=STREAM_HEARTBEAT,
+    max_clients=STREAM_MAX_CLIENTS,
+    max_symbols=STREAM_MAX_SYMBOLS,
+)
+
+
+def load_service(bundle_dir: Path) -> IRTBackendService:
+    print(f"모델 번들 로드: {bundle_dir.name}")
+    loaded = IRTBackendService(bundle_dir, price_fetcher=price_fetcher)
+    loaded.bootstrap(policy_runner=run_policy)
+    return loaded
+
+
+async def run_policy(policy: Any, batch: np.ndarray) -> np.ndarray:
+    return await blocking_executor.run(BlockingExecutor.CPU, policy, batch)
+
+
+registry = ModelRegistry(
+    IRT_ASSETS_DIR,
+    load_service,
+    is_irt_bundle,
+    default_id=MODEL_BUNDLE_ID,
+    max_loaded=MODEL_REGISTRY_MAX_LOADED,
+    max_rss_mb=MODEL_REGISTRY_MAX_RSS_MB if MODEL_REGISTRY_MAX_RSS_MB > 0 else None,
+)
+blocking_executor = BlockingExecutor(io_workers=IO_POOL_SIZE, cpu_workers=CPU_POOL_SIZE)
 
 app = FastAPI(title="FinFlow RL Inference Server", version="2.0.0")
 
@@ -1000,7 +2068,48 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    service.bootstrap()
+    registry.get()
+    market_refresher.start()
+    monte_carlo_pool()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    stream_hub.close()
+    market_refresher.stop()
+    if _monte_carlo_pool is not None:
+        _monte_carlo_pool.shutdown(wait=False, cancel_futures=True)
+    blocking_executor.shutdown()
+    price_fetcher.shutdown()
+
+
+async def run_blocking(route: str, kind: str, func: Any, *args: Any, **kwargs: Any) -> Any:
+    """Run a synchronous service call off the event loop under the route's timeout."""
+    try:
+        return await blocking_executor.run(
+            kind, func, *args, timeout=ROUTE_TIMEOUTS[route], **kwargs
+        )
+    except ExecutorTimeout:
+        print(f"[{route}] 처리 시간 초과 ({ROUTE_TIMEOUTS[route]:.0f}초)")
+        raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다.")
+
+
+def get_service(bundle_id: Optional[str] = None) -> IRTBackendService:
+    """Service for the requested bundle; runs on a worker thread since loading blocks."""
+    try:
+        return registry.get(bundle_id)
+    except UnknownBundleError:
+        raise HTTPException(status_code=404, detail=f"모델 번들을 찾을 수 없습니다: {bundle_id}")
+
+
+def call_service(bundle_id: Optional[str], method: str, *args: Any, **kwargs: Any) -> Any:
+    return getattr(get_service(bundle_id), method)(*args, **kwargs)
+
+
+def activate_bundle(bundle_id: str) -> None:
+    # Load (404 for unknown ids) before the default reference is swapped.
+    get_service(bundle_id)
+    registry.set_default(bundle_id)
 
 
 @app.get("/")
@@ -1010,7 +2119,43 @@ async def root() -> Dict[str, str]:
 
 @app.get("/health")
 async def health() -> Dict[str, Any]:
-    return {"status": "ok", **service.health_status()}
+    # Report only what is resident: loading a bundle here would block the event loop.
+    service = registry.peek()
+    return {
+        "status": "ok",
+        **(
+            service.health_status()
+            if service is not None
+            else {"bundle_id": registry.default_id, "loaded": False}
+        ),
+        "models": registry.stats(),
+        "market": market_refresher.stats(),
+        "stream": stream_hub.stats(),
+        "executor": blocking_executor.stats(),
+    }
+
+
+@app.get("/models")
+async def list_models() -> Dict[str, Any]:
+    await run_blocking("models", BlockingExecutor.IO, registry.discover)
+    return registry.stats()
+
+
+@app.post("/models/default")
+async def switch_default_model(
+    request: ModelSwitchRequest, x_admin_token: Optional[str] = Header(default=None)
+) -> Dict[str, Any]:
+    if MODEL_ADMIN_TOKEN and x_admin_token != MODEL_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="모델 전환 권한이 없습니다.")
+    try:
+        await run_blocking("models", BlockingExecutor.CPU, activate_bundle, request.bundle_id)
+        print(f"기본 모델 번들 전환: {request.bundle_id}")
+        return registry.stats()
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[models] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="모델 번들 전환 중 오류가 발생했습니다.")
 
 
 @app.post("/predict", response_model=PredictionResponse)
@@ -1019,18 +2164,43 @@ async def predict(request: PredictionRequest) -> PredictionResponse:
         raise HTTPException(status_code=400, detail="투자 금액은 0보다 커야 합니다.")
 
     try:
-        analysis = service.get_analysis(
-            amount=request.investment_amount,
-            risk=request.risk_tolerance,
-            horizon=request.investment_horizon,
-            mode="fast",
-        )
+        service = await run_blocking("predict", BlockingExecutor.CPU, get_service, request.bundle_id)
+        if service.policy_batcher is not None:
+            observation = await run_blocking(
+                "predict", BlockingExecutor.IO, service.live_observation, request.investment_amount
+            )
+            try:
+                action = await asyncio.wait_for(
+                    service.policy_batcher.submit(observation), timeout=ROUTE_TIMEOUTS["predict"]
+                )
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다.")
+            analysis = service.get_live_prediction(
+                request.investment_amount,
+                request.risk_tolerance,
+                request.investment_horizon,
+                action,
+            )
+        else:
+            analysis = await run_blocking(
+                "predict",
+                BlockingExecutor.CPU,
+                service.get_prediction,
+                amount=request.investment_amount,
+                risk=request.risk_tolerance,
+                horizon=request.investment_horizon,
+            )
         allocation_models = [
             AllocationItem(symbol=item["symbol"], weight=item["weight"])
             for item in analysis["allocation"]
         ]
         metrics_model = MetricsResponse(**analysis["metrics"])
-        return PredictionResponse(allocation=allocation_models, metrics=metrics_model)
+        return PredictionResponse(
+            allocation=allocation_models,
+            metrics=metrics_model,
+            inference_mode=service.inference_mode,
+            fallback_reason=service.policy_error,
+        )
     except HTTPException:
         raise
     except Exception as exc:
@@ -1040,23 +2210,73 @@ async def predict(request: PredictionRequest) -> PredictionResponse:
         )
 
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
+    profiles = request.profiles
+    if not profiles:
+        raise HTTPException(status_code=400, detail="요청할 투자 프로필이 없습니다.")
+    if len(profiles) > PREDICT_BATCH_MAX:
+        raise HTTPException(
+            status_code=400, detail=f"한 번에 최대 {PREDICT_BATCH_MAX}개 프로필까지 요청할 수 있습니다."
+        )
+    if any(profile.investment_amount <= 0 for profile in profiles):
+        raise HTTPException(status_code=400, detail="투자 금액은 0보다 커야 합니다.")
+
+    try:
+        result = await run_blocking(
+            "predict_batch",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "predict_batch",
+            np.array([profile.investment_amount for profile in profiles], dtype=np.float64),
+            [profile.risk_tolerance for profile in profiles],
+            np.array([profile.investment_horizon for profile in profiles], dtype=np.int64),
+        )
+        return BatchPredictionResponse(
+            symbols=result["symbols"],
+            weights=result["weights"].tolist(),
+            cash_weights=result["cash_weights"].tolist(),
+            cash_amounts=result["cash_amounts"].tolist(),
+            metrics=MetricsResponse(**result["metrics"]),
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[predict-batch] 오류: {exc}")
+        raise HTTPException(
+            status_code=500, detail="일괄 포트폴리오 예측 중 오류가 발생했습니다."
+        )
+
+
 @app.post("/explain", response_model=XAIResponse)
 async def explain(request: XAIRequest) -> XAIResponse:
     if request.investment_amount <= 0:
         raise HTTPException(status_code=400, detail="투자 금액은 0보다 커야 합니다.")
 
     try:
-        analysis = service.get_analysis(
+        analysis = await run_blocking(
+            "explain",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "get_explanation",
             amount=request.investment_amount,
             risk=request.risk_tolerance,
             horizon=request.investment_horizon,
             mode=request.method,
+            start=request.start_date,
+            end=request.end_date,
+            top_k=request.top_k,
+            target=request.target,
+            regime=request.regime,
         )
         feature_models = [
             FeatureImportance(
                 feature_name=item["feature_name"],
                 importance_score=item["importance_score"],
                 asset_name=item["asset_name"],
+                mean_attribution=item.get("mean_attribution"),
             )
             for item in analysis["feature_importance"]
         ]
@@ -1072,6 +2292,9 @@ async def explain(request: XAIRequest) -> XAIResponse:
             feature_importance=feature_models,
             attention_weights=attention_models,
             explanation_text=analysis["explanation_text"],
+            source=analysis["source"],
+            samples=analysis["samples"],
+            prototypes=[PrototypeWeight(**item) for item in analysis["prototypes"]],
         )
     except HTTPException:
         raise
@@ -1083,21 +2306,34 @@ async def explain(request: XAIRequest) -> XAIResponse:
 
 
 @app.post("/historical-performance", response_model=HistoricalResponse)
-async def historical_performance(request: HistoricalRequest) -> HistoricalResponse:
-    try:
+async def historical_performance(
+    request: HistoricalRequest,
+) -> Union[HistoricalResponse, Response]:
+    response_format = (request.response_format or "rows").lower()
+    if response_format not in {"rows", "columnar", "stream"}:
+        raise HTTPException(status_code=400, detail="지원하지 않는 응답 형식입니다.")
+
+    def resolve_history() -> Dict[str, List[Any]]:
+        service = get_service(request.bundle_id)
         allocation_payload = [item.dict() for item in request.portfolio_allocation]
         analysis = service.get_analysis_by_allocation(allocation_payload)
         if analysis is None:
-            analysis = service.last_analysis or service.get_analysis(
-                amount=1_000_000,
-                risk="moderate",
-                horizon=12,
-                mode="fast",
+            analysis = service.backtest_allocation(allocation_payload, request.rebalance)
+        return service.history_columns(analysis, request.start_date, request.end_date)
+
+    try:
+        columns = await run_blocking(
+            "historical_performance", BlockingExecutor.CPU, resolve_history
+        )
+        if response_format == "columnar":
+            return JSONResponse(content=columns)
+        if response_format == "stream":
+            return StreamingResponse(
+                IRTBackendService.iter_performance_history(columns), media_type="application/json"
             )
-        history = service.build_performance_history(
-            analysis, request.start_date, request.end_date
+        return HistoricalResponse(
+            performance_history=IRTBackendService.build_performance_history(columns)
         )
-        return HistoricalResponse(performance_history=history)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1110,7 +2346,15 @@ async def historical_performance(request: HistoricalRequest) -> HistoricalRespon
 @app.post("/correlation-analysis", response_model=CorrelationResponse)
 async def correlation_analysis(request: CorrelationRequest) -> CorrelationResponse:
     try:
-        data = service.calculate_correlation(request.tickers, request.period)
+        data = await run_blocking(
+            "correlation_analysis",
+            BlockingExecutor.IO,
+            call_service,
+            None,
+            "calculate_correlation",
+            request.tickers,
+            request.period,
+        )
         return CorrelationResponse(correlation_data=data)
     except HTTPException:
         raise
@@ -1121,11 +2365,115 @@ async def correlation_analysis(request: CorrelationRequest) -> CorrelationRespon
         )
 
 
+@app.post("/trades/turnover", response_model=TurnoverResponse)
+async def trades_turnover(request: TradeAnalyticsRequest) -> TurnoverResponse:
+    try:
+        data = await run_blocking(
+            "trades",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "get_turnover",
+            request.start_date,
+            request.end_date,
+            request.include_series,
+        )
+        return TurnoverResponse(**data)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[trades/turnover] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="회전율 조회 중 오류가 발생했습니다.")
+
+
+@app.post("/trades/costs", response_model=CostFootprintResponse)
+async def trades_costs(request: TradeAnalyticsRequest) -> CostFootprintResponse:
+    try:
+        data = await run_blocking(
+            "trades",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "get_cost_footprint",
+            request.start_date,
+            request.end_date,
+        )
+        return CostFootprintResponse(**data)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[trades/costs] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="거래 비용 조회 중 오류가 발생했습니다.")
+
+
+@app.post("/holdings", response_model=HoldingsResponse)
+async def holdings(request: HoldingsRequest) -> HoldingsResponse:
+    try:
+        data = await run_blocking(
+            "trades", BlockingExecutor.CPU, call_service, request.bundle_id, "get_holdings", request.date
+        )
+        return HoldingsResponse(**data)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[holdings] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="보유 비중 조회 중 오류가 발생했습니다.")
+
+
+@app.post("/covariance-analysis", response_model=CovarianceResponse)
+async def covariance_analysis(request: CovarianceRequest) -> CovarianceResponse:
+    output = (request.output or "pairs").lower()
+    kind = (request.kind or "correlation").lower()
+    if output not in {"pairs", "matrix"} or kind not in {"correlation", "covariance"}:
+        raise HTTPException(status_code=400, detail="지원하지 않는 출력 형식입니다.")
+
+    def resolve() -> CovarianceResponse:
+        estimate = get_service(None).calculate_covariance(
+            request.tickers,
+            request.period,
+            (request.method or "ledoit_wolf").lower(),
+            request.window,
+            request.halflife,
+        )
+        tickers, block = estimate.subset(request.tickers, kind)
+        response = CovarianceResponse(
+            tickers=tickers,
+            method=estimate.method,
+            observations=estimate.observations,
+            shrinkage=estimate.shrinkage,
+            excluded=[ticker for ticker in estimate.excluded if ticker in set(request.tickers)],
+            volatility=estimate.volatilities(tickers),
+        )
+        if output == "matrix":
+            response.matrix = np.round(block.astype(np.float64), 6).tolist()
+        else:
+            response.pairs = [
+                CovariancePair(**pair) for pair in estimate.top_pairs(tickers, max(request.top_k, 0))
+            ]
+        return response
+
+    try:
+        return await run_blocking("covariance_analysis", BlockingExecutor.IO, resolve)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[covariance-analysis] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="공분산 분석 중 오류가 발생했습니다.")
+
+
 @app.post("/risk-return-analysis", response_model=RiskReturnResponse)
 async def risk_return_analysis(request: RiskReturnRequest) -> RiskReturnResponse:
     try:
         allocation_payload = [item.dict() for item in request.portfolio_allocation]
-        data = service.calculate_risk_return(allocation_payload, request.period)
+        data = await run_blocking(
+            "risk_return_analysis",
+            BlockingExecutor.IO,
+            call_service,
+            None,
+            "calculate_risk_return",
+            allocation_payload,
+            request.period,
+        )
         return RiskReturnResponse(risk_return_data=data)
     except HTTPException:
         raise
@@ -1136,10 +2484,76 @@ async def risk_return_analysis(request: RiskReturnRequest) -> RiskReturnResponse
         )
 
 
+@app.post("/risk-metrics", response_model=RiskMetricsResponse)
+async def risk_metrics(request: RiskMetricsRequest) -> RiskMetricsResponse:
+    try:
+        allocation_payload = (
+            [item.dict() for item in request.portfolio_allocation] if request.portfolio_allocation else None
+        )
+        data = await run_blocking(
+            "risk_metrics",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "get_risk_metrics",
+            allocation_payload,
+            start=request.start_date,
+            end=request.end_date,
+            rebalance=request.rebalance,
+            levels=request.confidence_levels,
+            window=request.window,
+            risk_free=request.risk_free_rate,
+            include_series=request.include_series,
+        )
+        return RiskMetricsResponse(**data)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[risk-metrics] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="리스크 지표 계산 중 오류가 발생했습니다.")
+
+
+@app.post("/monte-carlo", response_model=MonteCarloResponse)
+async def monte_carlo(request: MonteCarloRequest) -> MonteCarloResponse:
+    if request.investment_amount <= 0:
+        raise HTTPException(status_code=400, detail="투자 금액은 0보다 커야 합니다.")
+
+    try:
+        allocation_payload = (
+            [item.dict() for item in request.portfolio_allocation] if request.portfolio_allocation else None
+        )
+        data = await run_blocking(
+            "monte_carlo",
+            BlockingExecutor.CPU,
+            call_service,
+            request.bundle_id,
+            "get_monte_carlo",
+            request.investment_amount,
+            request.investment_horizon,
+            allocation_payload,
+            simulation=request.method,
+            paths=request.paths,
+            block=request.block_size,
+            seed=request.seed,
+            percentiles=request.percentiles,
+            start=request.start_date,
+            end=request.end_date,
+            rebalance=request.rebalance,
+        )
+        return MonteCarloResponse(**data)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        print(f"[monte-carlo] 오류: {exc}")
+        raise HTTPException(status_code=500, detail="몬테카를로 시뮬레이션 중 오류가 발생했습니다.")
+
+
 @app.get("/market-status", response_model=MarketStatusResponse)
 async def market_status() -> MarketStatusResponse:
     try:
-        return service.get_market_status()
+        # Served from the in-memory snapshot; only a cold start waits for upstream.
+        snapshot = await run_blocking("market_status", BlockingExecutor.IO, market_refresher.snapshot)
+        return MarketStatusResponse(**snapshot)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1149,6 +2563,26 @@ async def market_status() -> MarketStatusResponse:
         )
 
 
+@app.get("/stream")
+async def stream(portfolio: Optional[str] = None) -> StreamingResponse:
+    """
+    Server-sent events: `market` when the market snapshot changes and
+    `portfolio` when the mark of `portfolio` ("AAPL:0.4,MSFT:0.3,현금:0.3") does.
+    """
+    try:
+        weights = parse_portfolio(portfolio)
+        subscriber = stream_hub.subscribe(weights)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except StreamFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return StreamingResponse(
+        stream_hub.events_for(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 if __name__ == "__main__":
     # uvicorn은 모듈 경로 문자열 대신 직접 FastAPI 앱 객체를 받아도 된다.
     uvicorn.run(
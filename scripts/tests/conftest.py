@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import `finflow` the way the server does, from the scripts directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
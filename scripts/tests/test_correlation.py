@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finflow import correlation
+from finflow.correlation import CorrelationEngine, returns_frame
+from finflow.prices import period_to_start
+
+TICKERS = ["A", "B", "C", "D", "E"]
+
+
+class FakeCloses:
+    """Close prices over business days, served as `CorrelationEngine`'s loader up to `today`."""
+
+    def __init__(self, today):
+        dates = pd.bdate_range("2024-01-01", "2024-06-28")
+        rng = np.random.default_rng(11)
+        steps = rng.normal(0.0, 0.01, size=(len(dates), len(TICKERS)))
+        self.frame = pd.DataFrame(100.0 * np.exp(np.cumsum(steps, axis=0)), index=dates, columns=TICKERS)
+        self.frame.loc["2024-03-05":"2024-03-07", "C"] = np.nan  # a gap in C inside the window
+        self.today = pd.Timestamp(today)
+        self.calls = []
+
+    def __call__(self, tickers, period, start):
+        self.calls.append((list(tickers), start))
+        if start is None:
+            start = period_to_start(period, self.today).normalize() + pd.Timedelta(days=1)
+        rows = (self.frame.index >= start) & (self.frame.index <= self.today)
+        return self.frame.loc[rows, list(tickers)]
+
+
+@pytest.fixture
+def closes(monkeypatch):
+    closes = FakeCloses("2024-03-15")
+    monkeypatch.setattr(correlation, "_today", lambda: closes.today)
+    return closes
+
+
+def expected_pairs(closes, tickers, period):
+    frame = closes(tickers, period, None)
+    closes.calls.pop()
+    matrix = returns_frame(frame).corr().to_numpy()
+    return correlation.rank_pairs(matrix, tickers)
+
+
+def assert_same_pairs(actual, expected):
+    assert [pair[:2] for pair in actual] == [pair[:2] for pair in expected]
+    np.testing.assert_allclose([pair[2] for pair in actual], [pair[2] for pair in expected], atol=1e-12)
+
+
+def test_subset_loads_only_requested_tickers(closes):
+    engine = CorrelationEngine(closes, TICKERS)
+
+    first = engine.pairs(["A", "B"], "1mo")
+    assert closes.calls == [(["A", "B"], None)]
+
+    second = engine.pairs(["A", "C"], "1mo")
+    assert closes.calls[1][0] == ["C"]
+    assert closes.calls[1][1] is not None
+
+    assert_same_pairs(first, expected_pairs(closes, ["A", "B"], "1mo"))
+    assert_same_pairs(second, expected_pairs(closes, ["A", "C"], "1mo"))
+    assert [window["tickers"] for window in engine.stats()["windows"]] == [3]
+
+
+def test_stale_window_fetches_only_new_days(closes):
+    engine = CorrelationEngine(closes, TICKERS, max_age=-1.0)
+    engine.pairs(TICKERS, "1mo")
+
+    closes.today = pd.Timestamp("2024-03-22")
+    refreshed = engine.pairs(TICKERS, "1mo")
+
+    tickers, start = closes.calls[-1]
+    assert tickers == TICKERS
+    # From the close before the last held day (2024-03-15), not the whole month.
+    assert start == pd.Timestamp("2024-03-14")
+    assert engine.refreshes == 1 and engine.rebuilds == 1
+    assert_same_pairs(refreshed, expected_pairs(closes, TICKERS, "1mo"))
+
+    fresh = CorrelationEngine(closes, TICKERS)
+    fresh.pairs(TICKERS, "1mo")
+    assert engine.stats()["windows"] == fresh.stats()["windows"]
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from sklearn.covariance import ledoit_wolf
+
+from finflow.covariance import estimate_covariance
+
+
+@pytest.mark.parametrize("days, tickers", [(40, 60), (250, 20)])
+def test_ledoit_wolf_matches_sklearn(days, tickers):
+    rng = np.random.default_rng(7)
+    factor = rng.normal(0.0, 0.01, size=(days, 1))
+    returns = (factor + rng.normal(0.0, 0.02, size=(days, tickers))).astype(np.float32)
+
+    covariance, shrinkage = estimate_covariance(returns, "ledoit_wolf")
+    expected, expected_shrinkage = ledoit_wolf(returns.astype(np.float64))
+
+    assert shrinkage == pytest.approx(expected_shrinkage, rel=1e-4)
+    np.testing.assert_allclose(covariance, expected, rtol=1e-4, atol=1e-9)
+
+
+def test_sample_covariance_is_unbiased():
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.0, 0.02, size=(30, 5)).astype(np.float32)
+
+    covariance, shrinkage = estimate_covariance(returns, "sample")
+
+    assert shrinkage is None
+    np.testing.assert_allclose(covariance, np.cov(returns, rowvar=False), rtol=1e-4, atol=1e-9)
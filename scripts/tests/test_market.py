@@ -0,0 +1,42 @@
+import threading
+import time
+
+from finflow.market import MARKET_SYMBOLS, MarketSnapshotRefresher, StubPriceProvider
+
+
+def test_cold_snapshot_waits_for_the_round_in_progress():
+    refresher = MarketSnapshotRefresher(StubPriceProvider(latency=0.3), interval=60, fetch_timeout=5)
+    # The first round is already running elsewhere, as the refresher loop's is on startup.
+    thread = threading.Thread(target=refresher.refresh)
+    thread.start()
+    while not refresher._refresh_lock.locked():
+        time.sleep(0.001)
+    snapshot = refresher.snapshot()
+    thread.join()
+    assert [quote["symbol"] for quote in snapshot["market_data"]] == list(MARKET_SYMBOLS)
+    assert not snapshot["stale"]
+
+
+def test_cold_snapshot_during_background_start():
+    refresher = MarketSnapshotRefresher(StubPriceProvider(latency=0.3), interval=60, fetch_timeout=5)
+    refresher.start()
+    try:
+        snapshot = refresher.snapshot()
+    finally:
+        refresher.stop()
+    assert [quote["symbol"] for quote in snapshot["market_data"]] == list(MARKET_SYMBOLS)
+    assert not snapshot["stale"]
+
+
+def test_revalidations_share_the_refresher_thread():
+    refresher = MarketSnapshotRefresher(StubPriceProvider(), interval=60)
+    refresher.start()
+    try:
+        refresher.snapshot()
+        before = {thread.name for thread in threading.enumerate()}
+        for _ in range(20):
+            refresher.track(["AAPL"])
+            refresher.untrack(["AAPL"])
+        assert "market-revalidate" not in {thread.name for thread in threading.enumerate()} - before
+    finally:
+        refresher.stop()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from finflow.montecarlo import BootstrapModel, GaussianModel, checkpoint_steps, process_pool, simulate
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = process_pool(2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        GaussianModel(0.0004, 0.012),
+        BootstrapModel(np.random.default_rng(9).normal(0.0, 0.01, size=250), block=5),
+    ],
+)
+def test_pool_matches_single_process(pool, model):
+    single, steps = simulate(model, paths=5000, steps=126, seed=42, chunk_paths=1000)
+    pooled, pooled_steps = simulate(model, paths=5000, steps=126, seed=42, chunk_paths=1000, executor=pool)
+
+    np.testing.assert_array_equal(pooled, single)
+    np.testing.assert_array_equal(pooled_steps, steps)
+    assert single.shape == (5000, len(checkpoint_steps(126)))
+
+
+def test_seed_fixes_the_paths():
+    model = GaussianModel(0.0, 0.01)
+    first, _ = simulate(model, paths=300, steps=21, seed=1, chunk_paths=100)
+    again, _ = simulate(model, paths=300, steps=21, seed=1, chunk_paths=100)
+    other, _ = simulate(model, paths=300, steps=21, seed=2, chunk_paths=100)
+
+    np.testing.assert_array_equal(first, again)
+    assert not np.array_equal(first, other)
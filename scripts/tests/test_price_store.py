@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finflow import price_store
+from finflow.price_store import CachedPriceProvider, PriceStore, missing_ranges
+from finflow.prices import PriceProvider
+
+DAYS = pd.bdate_range("2024-01-01", "2024-03-29")
+
+
+class FakeUpstream(PriceProvider):
+    """Business-day bars whose close is 100 + position; `intraday` moves the last bar."""
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.today = DAYS[0]
+        self.factor = 1.0
+        self.intraday = 0.0
+        self.fail = False
+        self.calls = []
+
+    def history(self, ticker, start=None, end=None, period=None):
+        self.calls.append((start, end))
+        if self.fail:
+            raise RuntimeError("upstream down")
+        days = DAYS[(DAYS >= pd.Timestamp(start)) & (DAYS < pd.Timestamp(end)) & (DAYS <= self.today)]
+        close = (100.0 + DAYS.get_indexer(days)) * self.factor
+        close = np.where(days == self.today, close + self.intraday, close)
+        return pd.DataFrame(
+            {"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=days
+        )
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    upstream = FakeUpstream()
+    monkeypatch.setattr(price_store, "_today", lambda: upstream.today)
+    return CachedPriceProvider(upstream, PriceStore(tmp_path)), upstream
+
+
+def test_missing_ranges_skips_covered_parts():
+    day = pd.Timestamp
+    coverage = [(day("2024-01-05"), day("2024-01-10"))]
+    assert missing_ranges(coverage, day("2024-01-01"), day("2024-01-12")) == [
+        (day("2024-01-01"), day("2024-01-04")),
+        (day("2024-01-11"), day("2024-01-12")),
+    ]
+
+
+def test_repeated_requests_ending_today_are_served_from_disk(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-02-14")
+    first = cached.history("X", start="2024-01-01")
+    fetches = len(upstream.calls)
+
+    second = cached.history("X", start="2024-01-01")
+    assert len(upstream.calls) == fetches
+    assert cached.stats()["disk_hits"] == 1
+    assert first.index.equals(second.index)
+    np.testing.assert_array_equal(first.to_numpy(), second.to_numpy())
+    assert first.index[-1] == upstream.today
+
+
+def test_todays_bar_is_not_stored(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-02-14")
+    cached.history("X", start="2024-01-01")
+    frame, coverage = cached.store.read("X")
+    assert frame.index[-1] < upstream.today
+    assert coverage[-1][1] < upstream.today
+
+
+def test_next_day_does_not_refetch_the_window(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-02-14")
+    upstream.intraday = 3.0
+    cached.history("X", start="2024-01-01")
+
+    upstream.today = pd.Timestamp("2024-02-15")
+    upstream.intraday = 0.0
+    calls = len(upstream.calls)
+    frame = cached.history("X", start="2024-01-01")
+    assert cached.stats()["refetches"] == 0
+    # Only the days after the stored ones were asked for.
+    assert upstream.calls[calls:] == [("2024-02-13", "2024-02-16")]
+    assert frame.loc["2024-02-14", "Close"] == 100.0 + DAYS.get_loc(pd.Timestamp("2024-02-14"))
+
+
+def test_adjustment_change_refetches_once(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-02-14")
+    cached.history("X", start="2024-01-01", end="2024-02-01")
+
+    upstream.factor = 0.5
+    frame = cached.history("X", start="2024-01-01", end="2024-03-01")
+    assert cached.stats()["refetches"] == 1
+    expected = (100.0 + DAYS.get_indexer(frame.index)) * 0.5
+    np.testing.assert_allclose(frame["Close"].to_numpy(), expected)
+
+
+def test_failed_fetch_leaves_the_gap_open(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-03-01")
+    cached.history("X", start="2024-01-01", end="2024-02-01")
+
+    upstream.fail = True
+    assert cached.history("X", start="2024-02-01", end="2024-02-10").empty
+    assert cached.store.read("X")[1][-1][1] == pd.Timestamp("2024-01-31")
+
+    upstream.fail = False
+    frame = cached.history("X", start="2024-02-01", end="2024-02-10")
+    assert len(frame) == 7
+
+
+def test_weekend_is_covered_once_a_later_bar_proves_it(provider):
+    cached, upstream = provider
+    upstream.today = pd.Timestamp("2024-02-05")  # Monday
+    cached.history("X", start="2024-01-29", end="2024-02-03")  # through Friday
+    cached.history("X", start="2024-02-03", end="2024-02-05")  # the weekend
+    _, coverage = cached.store.read("X")
+    assert coverage == [(pd.Timestamp("2024-01-29"), pd.Timestamp("2024-02-02"))]
+
+    upstream.today = pd.Timestamp("2024-02-06")
+    cached.history("X", start="2024-01-29", end="2024-02-06")
+    _, coverage = cached.store.read("X")
+    assert coverage == [(pd.Timestamp("2024-01-29"), pd.Timestamp("2024-02-05"))]
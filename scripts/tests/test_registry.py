@@ -0,0 +1,25 @@
+from finflow.registry import ModelRegistry
+
+
+def make_registry(tmp_path, loaded):
+    for name in ("20240101_000000", "20240201_000000"):
+        (tmp_path / name).mkdir()
+
+    def loader(path):
+        loaded.append(path.name)
+        return object()
+
+    return ModelRegistry(tmp_path, loader, lambda path: True)
+
+
+def test_peek_does_not_load(tmp_path):
+    loaded = []
+    registry = make_registry(tmp_path, loaded)
+
+    assert registry.peek() is None
+    assert loaded == []
+
+    service = registry.get()
+    assert registry.peek() is service
+    assert registry.peek("20240101_000000") is None
+    assert loaded == ["20240201_000000"]
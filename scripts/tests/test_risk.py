@@ -0,0 +1,94 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from finflow.risk import TRADING_DAYS, drawdown_stats, rolling_cvar, rolling_ratios, value_at_risk
+
+
+def test_historical_var_on_known_returns():
+    returns = (np.arange(20) - 5) / 100.0  # -5% .. +14%, shuffled below
+    np.random.default_rng(0).shuffle(returns)
+
+    at_95, at_90 = value_at_risk(returns, levels=(0.95, 0.90))
+
+    assert at_95["historical_var"] == pytest.approx(0.05)
+    assert at_95["historical_cvar"] == pytest.approx(0.05)
+    assert at_90["historical_var"] == pytest.approx(0.04)
+    assert at_90["historical_cvar"] == pytest.approx(0.045)
+
+
+def test_tail_size_does_not_round_up_float_noise():
+    # 5% of 40 days is exactly two days.
+    returns = np.concatenate(([-0.10, -0.08, -0.06], np.full(37, 0.01)))
+
+    (estimate,) = value_at_risk(returns, levels=(0.95,))
+
+    assert estimate["historical_var"] == pytest.approx(0.08)
+    assert estimate["historical_cvar"] == pytest.approx(0.09)
+
+
+def test_parametric_var_uses_sample_moments():
+    returns = np.random.default_rng(1).normal(0.001, 0.02, size=500)
+    mean, std = returns.mean(), returns.std(ddof=1)
+    z = NormalDist().inv_cdf(0.01)
+
+    (estimate,) = value_at_risk(returns, levels=(0.99,))
+
+    assert estimate["parametric_var"] == pytest.approx(-(mean + std * z))
+    assert estimate["parametric_cvar"] == pytest.approx(-(mean - std * NormalDist().pdf(z) / 0.01))
+
+
+def test_rolling_ratios_match_window_by_window():
+    returns = np.random.default_rng(2).normal(0.0005, 0.01, size=120)
+    window, risk_free = 20, 0.03
+
+    ratios = rolling_ratios(returns, window, risk_free)
+
+    excess = returns - risk_free / TRADING_DAYS
+    windows = np.lib.stride_tricks.sliding_window_view(excess, window)
+    sharpe = windows.mean(axis=1) / windows.std(axis=1, ddof=1) * math.sqrt(TRADING_DAYS)
+    downside = np.sqrt((np.minimum(windows, 0.0) ** 2).mean(axis=1))
+    sortino = windows.mean(axis=1) / downside * math.sqrt(TRADING_DAYS)
+    np.testing.assert_allclose(ratios["sharpe"], sharpe, rtol=1e-8)
+    np.testing.assert_allclose(ratios["sortino"], sortino, rtol=1e-8)
+
+
+def test_rolling_ratios_need_a_full_window():
+    ratios = rolling_ratios(np.full(10, 0.01), window=20)
+    assert ratios["sharpe"].size == 0 and ratios["sortino"].size == 0
+
+
+def test_rolling_cvar_matches_window_by_window():
+    returns = np.random.default_rng(3).normal(0.0, 0.01, size=100)
+
+    cvar = rolling_cvar(returns, window=40, level=0.95)
+
+    expected = [-np.sort(returns[end - 40 : end])[:2].mean() for end in range(40, 101)]
+    np.testing.assert_allclose(cvar, expected)
+
+
+def test_drawdown_of_known_curve():
+    stats = drawdown_stats(np.array([1.1, 1.0, 0.88, 1.2, 1.1]))
+
+    np.testing.assert_allclose(stats["drawdown"], [0.0, 1 - 1.0 / 1.1, 0.2, 0.0, 1 - 1.1 / 1.2])
+    assert stats["max_drawdown"] == pytest.approx(0.2)
+    assert (stats["peak"], stats["trough"], stats["recovery"]) == (0, 2, 3)
+    assert (stats["max_duration"], stats["current_duration"], stats["episodes"]) == (2, 1, 2)
+
+
+def test_drawdown_from_the_start_stays_open():
+    stats = drawdown_stats(np.array([0.9, 0.85, 0.95]))
+
+    assert stats["max_drawdown"] == pytest.approx(0.15)
+    assert (stats["peak"], stats["trough"], stats["recovery"]) == (None, 1, None)
+    assert (stats["max_duration"], stats["current_duration"], stats["episodes"]) == (3, 3, 1)
+
+
+def test_drawdown_of_rising_curve():
+    stats = drawdown_stats(np.array([1.01, 1.02, 1.03]))
+
+    assert stats["max_drawdown"] == 0.0
+    assert (stats["peak"], stats["trough"], stats["recovery"]) == (None, None, None)
+    assert stats["episodes"] == 0
@@ -0,0 +1,105 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from finflow.risk_profile import RiskProfileEngine, normalize_risk
+
+TICKERS = ["AAPL", "MSFT", "JNJ", "PG", "KO", "NVDA"]
+DEFENSIVE = ["JNJ", "PG", "KO"]
+GROWTH = ["AAPL", "MSFT", "NVDA"]
+
+
+def scalar_risk_profile(weights, cash_weight, risk, horizon_months):
+    """The per-request tilt the vectorised engine replaced, kept verbatim as the reference."""
+    weights = np.clip(weights.astype(np.float64), 0.0, None)
+    cash_weight = float(max(cash_weight, 0.0))
+
+    total = weights.sum() + cash_weight
+    if total > 0:
+        weights /= total
+        cash_weight /= total
+    else:
+        weights = np.full_like(weights, 1.0 / max(len(weights), 1))
+        cash_weight = 0.0
+
+    risk = normalize_risk(risk)
+    if risk == "conservative":
+        boost = min(0.18, 1.0 - cash_weight)
+        if boost > 0:
+            cash_weight += boost
+            weights *= 1.0 - boost
+        if DEFENSIVE and weights.sum() > 0:
+            for idx in [TICKERS.index(t) for t in DEFENSIVE if t in TICKERS]:
+                weights[idx] *= 1.05
+    elif risk == "aggressive":
+        reduction = min(0.15, cash_weight)
+        if reduction > 0 and weights.sum() > 0:
+            cash_weight -= reduction
+            weights += (weights / weights.sum()) * reduction
+
+    months = max(int(horizon_months), 1)
+    if months <= 6:
+        buffer = min(0.1, 1.0 - cash_weight)
+        if buffer > 0:
+            cash_weight += buffer
+            weights *= 1.0 - buffer
+    elif months >= 60 and GROWTH:
+        for idx in [TICKERS.index(t) for t in GROWTH if t in TICKERS]:
+            weights[idx] *= 1.08
+        cash_weight *= 0.92
+
+    total = weights.sum() + cash_weight
+    if total > 0:
+        weights /= total
+        cash_weight /= total
+
+    weights = np.clip(weights, 0.0, None)
+    if weights.sum() > 0:
+        weights /= weights.sum() + cash_weight
+
+    return weights, cash_weight
+
+
+def portfolios():
+    rng = np.random.default_rng(5)
+    rows = [(rng.dirichlet(np.ones(len(TICKERS))) * 0.8, 0.2) for _ in range(4)]
+    rows.append((rng.dirichlet(np.ones(len(TICKERS))), 0.0))  # fully invested
+    rows.append((rng.dirichlet(np.ones(len(TICKERS))) * 0.05, 0.95))  # mostly cash
+    rows.append((np.zeros(len(TICKERS)), 0.0))  # nothing allocated
+    rows.append((np.array([0.3, -0.1, 0.2, 0.0, 0.4, 0.1]), 0.1))  # a negative weight
+    return rows
+
+
+CASES = list(
+    itertools.product(
+        range(len(portfolios())),
+        ["conservative", "moderate", "aggressive", "high", "unknown"],
+        [1, 6, 7, 12, 59, 60, 120],
+    )
+)
+
+
+def test_batch_matches_scalar_code():
+    engine = RiskProfileEngine(TICKERS, DEFENSIVE, GROWTH)
+    rows = portfolios()
+    weights = np.stack([rows[row][0] for row, _, _ in CASES])
+    cash = np.array([rows[row][1] for row, _, _ in CASES])
+    risks = [risk for _, risk, _ in CASES]
+    months = np.array([horizon for _, _, horizon in CASES])
+
+    batch_weights, batch_cash = engine.apply(weights, cash, risks, months)
+
+    for position, (row, risk, horizon) in enumerate(CASES):
+        expected_weights, expected_cash = scalar_risk_profile(rows[row][0], rows[row][1], risk, horizon)
+        np.testing.assert_allclose(batch_weights[position], expected_weights, rtol=1e-12, atol=1e-15)
+        assert batch_cash[position] == pytest.approx(expected_cash, rel=1e-12, abs=1e-15)
+
+
+def test_risk_codes_are_accepted_directly():
+    engine = RiskProfileEngine(TICKERS, DEFENSIVE, GROWTH)
+    weights, cash = portfolios()[0]
+    by_name = engine.apply(weights[None, :], np.array([cash]), ["aggressive"], np.array([24]))
+    by_code = engine.apply(weights[None, :], np.array([cash]), engine.risk_codes("aggressive"), np.array([24]))
+    np.testing.assert_array_equal(by_name[0], by_code[0])
+    np.testing.assert_array_equal(by_name[1], by_code[1])